@@ -16,7 +16,7 @@ from langchain.callbacks.manager import CallbackManager
 from langchain.globals import set_debug
 from datetime import datetime
 from dotenv import load_dotenv
-from langgraph_agent.db import StateManager
+from langgraph_agent.db import StateManager, PlanStore, StepHistoryStore
 from langgraph_agent.sub_agents import TaskAgent
 
 # Load environment variables
@@ -34,9 +34,15 @@ client = Client()
 tracer = LangChainTracer(project_name="basic_agent_demo")
 callback_manager = CallbackManager([tracer])
 
-# Initialize state manager and task agent
+# Initialize state manager, plan store, step history and task agent
 state_manager = StateManager()
-task_agent = TaskAgent(callback_manager=callback_manager)
+plan_store = PlanStore()
+step_history = StepHistoryStore()
+task_agent = TaskAgent(
+    callback_manager=callback_manager,
+    plan_store=plan_store,
+    step_history=step_history
+)
 
 # Define our state
 class AgentState(TypedDict):
@@ -125,6 +131,8 @@ def agent_node(state: AgentState) -> Dict:
 Plan:
 {task_result['plan']}
 
+Critical path: {task_result['critical_path_hours']:g}h ({' -> '.join(task_result['critical_path'])}), {task_result['total_hours']:g}h if done sequentially
+
 Estimates:
 {task_result['estimates']}
 
@@ -228,13 +236,17 @@ def run_agent(username: str, password: str, message: str) -> Dict:
                 "client_info": "web"
             },
             "error": None,
-            "task_state": None  # Initialize task state as None
+            "task_state": state_manager.get_task_state(username)  # Restore the last task, if any
         }
 
         # Create and run the agent
         agent = create_agent_graph()
         result = agent.invoke(initial_state)
 
+        # Persist task state so the next run picks it up
+        if result.get("task_state"):
+            state_manager.save_task_state(username, result["task_state"])
+
         # End session if there was an error
         if result.get("error"):
             state_manager.end_session()
@@ -262,6 +274,14 @@ def get_session_info() -> Dict:
         "username": state_manager.get_username()
     }
 
+def get_plan_cache_metrics() -> Dict:
+    """Get hit-rate metrics of the persistent task plan cache."""
+    return plan_store.get_metrics()
+
+def get_task_benchmark_report() -> Dict:
+    """Get latency, token cost and escalation rate per TaskAgent stage."""
+    return task_agent.benchmark_report()
+
 def format_message(msg: BaseMessage) -> str:
     """Format a message for display.
 
@@ -306,6 +326,11 @@ if __name__ == "__main__":
             print(f"Status: {task_state['status']}")
             print(f"Created: {task_state['created_at']}")
 
+        # Print per-stage model usage
+        print("\nTask Agent Stages:")
+        print("=" * 50)
+        print(get_task_benchmark_report()["table"])
+
         # Print conversation
         print("\nConversation:")
         print("=" * 50)
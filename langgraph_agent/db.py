@@ -1,6 +1,8 @@
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
+import hashlib
 import json
+import re
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -41,6 +43,34 @@ def init_db():
             conversation_count INTEGER DEFAULT 0,
             preferences TEXT
         );
+
+        CREATE TABLE IF NOT EXISTS tasks (
+            fingerprint TEXT NOT NULL,
+            model_version TEXT NOT NULL,
+            task TEXT NOT NULL,
+            plan TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            last_accessed TIMESTAMP NOT NULL,
+            hit_count INTEGER DEFAULT 0,
+            PRIMARY KEY (fingerprint, model_version)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_tasks_last_accessed ON tasks (last_accessed);
+
+        CREATE TABLE IF NOT EXISTS task_step_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            category TEXT NOT NULL,
+            description TEXT NOT NULL,
+            estimate_hours REAL,
+            actual_hours REAL NOT NULL,
+            completed_at TIMESTAMP NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS task_state (
+            username TEXT PRIMARY KEY,
+            state TEXT NOT NULL,
+            updated_at TIMESTAMP NOT NULL
+        );
     """)
 
     conn.commit()
@@ -241,6 +271,42 @@ class StateManager:
         finally:
             conn.close()
 
+    def save_task_state(self, username: str, task_state: Optional[Dict]) -> None:
+        """Persist the latest task state of a user so it survives across runs."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            if task_state is None:
+                cursor.execute("DELETE FROM task_state WHERE username = ?", (username,))
+            else:
+                cursor.execute("""
+                    INSERT INTO task_state (username, state, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(username) DO UPDATE SET
+                        state = excluded.state,
+                        updated_at = excluded.updated_at
+                """, (username, json.dumps(task_state), datetime.now()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_task_state(self, username: str) -> Optional[Dict]:
+        """Get the last persisted task state of a user."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT state
+                FROM task_state
+                WHERE username = ?
+            """, (username,))
+            row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+        finally:
+            conn.close()
+
     def get_username(self) -> Optional[str]:
         """Get the username for the current session."""
         if not self.current_session_id:
@@ -259,3 +325,177 @@ class StateManager:
             return row[0] if row else None
         finally:
             conn.close()
+
+def task_fingerprint(task_description: str) -> str:
+    """Fingerprint a task description so trivially different phrasings collide.
+
+    Case, punctuation and whitespace are ignored.
+    """
+    normalized = re.sub(r"[^a-z0-9]+", " ", task_description.lower()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class PlanStore:
+    """Persistent cache of task plans keyed by description fingerprint and model version.
+
+    Entries expire after ``ttl_seconds`` and the least recently used entries
+    are evicted once the store holds more than ``max_entries`` plans.
+    """
+
+    def __init__(self, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 1000):
+        """Initialize the plan store and ensure database exists.
+
+        Args:
+            ttl_seconds: How long a cached plan stays valid
+            max_entries: Maximum number of cached plans
+        """
+        init_db()
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _get_connection(self):
+        """Get a database connection."""
+        return sqlite3.connect(DB_PATH)
+
+    def get(self, task_description: str, model_version: str) -> Optional[Dict]:
+        """Get a cached plan, or None if there is no fresh entry."""
+        fingerprint = task_fingerprint(task_description)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT plan
+                FROM tasks
+                WHERE fingerprint = ? AND model_version = ? AND created_at >= ?
+            """, (fingerprint, model_version, datetime.now() - self.ttl))
+            row = cursor.fetchone()
+
+            if not row:
+                self.misses += 1
+                return None
+
+            cursor.execute("""
+                UPDATE tasks
+                SET last_accessed = ?, hit_count = hit_count + 1
+                WHERE fingerprint = ? AND model_version = ?
+            """, (datetime.now(), fingerprint, model_version))
+            conn.commit()
+
+            self.hits += 1
+            return json.loads(row[0])
+        finally:
+            conn.close()
+
+    def put(self, task_description: str, model_version: str, task_plan: Dict) -> None:
+        """Cache a plan, evicting expired and least recently used entries."""
+        fingerprint = task_fingerprint(task_description)
+        now = datetime.now()
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                INSERT INTO tasks (fingerprint, model_version, task, plan, created_at, last_accessed)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(fingerprint, model_version) DO UPDATE SET
+                    task = excluded.task,
+                    plan = excluded.plan,
+                    created_at = excluded.created_at,
+                    last_accessed = excluded.last_accessed,
+                    hit_count = 0
+            """, (fingerprint, model_version, task_description, json.dumps(task_plan), now, now))
+
+            cursor.execute("DELETE FROM tasks WHERE created_at < ?", (now - self.ttl,))
+            self.evictions += cursor.rowcount
+
+            cursor.execute("""
+                DELETE FROM tasks
+                WHERE rowid IN (
+                    SELECT rowid FROM tasks
+                    ORDER BY last_accessed DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.evictions += cursor.rowcount
+
+            conn.commit()
+        finally:
+            conn.close()
+
+    def invalidate(self, task_description: str, model_version: Optional[str] = None) -> None:
+        """Drop the cached plan(s) for a task description."""
+        fingerprint = task_fingerprint(task_description)
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            if model_version is None:
+                cursor.execute("DELETE FROM tasks WHERE fingerprint = ?", (fingerprint,))
+            else:
+                cursor.execute("""
+                    DELETE FROM tasks
+                    WHERE fingerprint = ? AND model_version = ?
+                """, (fingerprint, model_version))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_metrics(self) -> Dict:
+        """Get hit/miss counters for this store instance."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+class StepHistoryStore:
+    """Actual durations of completed task steps, used to estimate new ones."""
+
+    def __init__(self):
+        """Initialize the history store and ensure database exists."""
+        init_db()
+
+    def _get_connection(self):
+        """Get a database connection."""
+        return sqlite3.connect(DB_PATH)
+
+    def record(
+        self,
+        category: str,
+        description: str,
+        actual_hours: float,
+        estimate_hours: Optional[float] = None
+    ) -> None:
+        """Record a completed step and how long it actually took."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                INSERT INTO task_step_history (category, description, estimate_hours, actual_hours, completed_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (category, description, estimate_hours, actual_hours, datetime.now()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_durations(self, limit: int = 100000) -> List[tuple]:
+        """Get (category, actual hours) of the most recently completed steps."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("""
+                SELECT category, actual_hours
+                FROM task_step_history
+                ORDER BY completed_at DESC
+                LIMIT ?
+            """, (limit,))
+            return cursor.fetchall()
+        finally:
+            conn.close()
@@ -1,5 +1,7 @@
 """Sub-agents for the LangGraph agent system."""
 
 from .task_agent import TaskAgent
+from .task_plan import TaskPlan, TaskStep, PlanScheduler
+from .estimator import HistoricalEstimator
 
-__all__ = ['TaskAgent']
\ No newline at end of file
+__all__ = ['TaskAgent', 'TaskPlan', 'TaskStep', 'PlanScheduler', 'HistoricalEstimator']
\ No newline at end of file
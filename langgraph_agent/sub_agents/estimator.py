@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+def normalize_category(category: Optional[str]) -> Optional[str]:
+    """Normalize a step category so "Back-end " and "back end" match."""
+    if not category:
+        return None
+    return " ".join(category.lower().replace("-", " ").replace("_", " ").split())
+
+@dataclass
+class CategoryEstimate:
+    """Duration statistics of the completed steps of one category, in hours."""
+    category: str
+    samples: int
+    median: float
+    p25: float
+    p75: float
+    p90: float
+
+    @property
+    def spread(self) -> float:
+        """Interquartile range relative to the median."""
+        return (self.p75 - self.p25) / self.median if self.median > 0 else float("inf")
+
+class HistoricalEstimator:
+    """Estimate step durations from the actual durations of completed steps.
+
+    Statistics are computed per category in one vectorized pass, so
+    ``estimate`` is a dictionary lookup.
+    """
+
+    def __init__(self, min_samples: int = 5, max_spread: float = 1.0):
+        """Initialize the estimator.
+
+        Args:
+            min_samples: Minimum number of completed steps for a confident estimate
+            max_spread: Maximum interquartile range relative to the median for
+                a confident estimate
+        """
+        self.min_samples = min_samples
+        self.max_spread = max_spread
+        self.stats: Dict[str, CategoryEstimate] = {}
+
+    def fit(self, history: Iterable[Tuple[str, float]]) -> "HistoricalEstimator":
+        """Rebuild the per-category statistics.
+
+        Args:
+            history: (category, actual hours) pairs of completed steps
+
+        Returns:
+            The estimator itself
+        """
+        pairs = [
+            (normalize_category(category), hours)
+            for category, hours in history
+            if normalize_category(category) and hours is not None and hours >= 0
+        ]
+        if not pairs:
+            self.stats = {}
+            return self
+
+        names, codes = np.unique([category for category, _ in pairs], return_inverse=True)
+        durations = np.asarray([hours for _, hours in pairs], dtype=np.float64)
+
+        # Sort by category, then duration, so each category is a sorted slice
+        order = np.lexsort((durations, codes))
+        durations = durations[order]
+        counts = np.bincount(codes, minlength=len(names))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        def quantile(q: float) -> np.ndarray:
+            # Linear interpolation between the closest ranks, for all categories at once
+            position = starts + q * (counts - 1)
+            lower = np.floor(position).astype(np.int64)
+            upper = np.minimum(lower + 1, starts + counts - 1)
+            weight = position - lower
+            return durations[lower] * (1 - weight) + durations[upper] * weight
+
+        p25, median, p75, p90 = (quantile(q) for q in (0.25, 0.5, 0.75, 0.9))
+        self.stats = {
+            str(name): CategoryEstimate(
+                category=str(name),
+                samples=int(counts[i]),
+                median=float(median[i]),
+                p25=float(p25[i]),
+                p75=float(p75[i]),
+                p90=float(p90[i])
+            )
+            for i, name in enumerate(names)
+        }
+        return self
+
+    def estimate(self, category: Optional[str]) -> Optional[CategoryEstimate]:
+        """Get the statistics of a category if they are confident enough."""
+        stats = self.stats.get(normalize_category(category))
+        if stats is None or stats.samples < self.min_samples or stats.spread > self.max_spread:
+            return None
+        return stats
+
+    def estimate_steps(self, steps: List[Dict]) -> Optional[Dict[str, CategoryEstimate]]:
+        """Estimate every step of a plan, or return None if any step is not confident."""
+        if not steps:
+            return None
+        estimates = {}
+        for step in steps:
+            stats = self.estimate(step.get("category"))
+            if stats is None:
+                return None
+            estimates[step["id"]] = stats
+        return estimates
@@ -0,0 +1,198 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_openai import ChatOpenAI
+from langchain.callbacks.manager import CallbackManager
+
+# Models tried per TaskAgent stage, cheapest first. A stage escalates to the
+# next model when the previous one's response fails validation.
+DEFAULT_STAGE_MODELS = {
+    "plan": ["gpt-3.5-turbo", "gpt-4o"],
+    "estimate": ["gpt-3.5-turbo", "gpt-4o-mini"],
+    "status": ["gpt-3.5-turbo"],
+    "execute": ["gpt-3.5-turbo"],
+}
+
+# USD per 1K (input, output) tokens, used for the cost column of the benchmark report
+MODEL_PRICING = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4": (0.03, 0.06),
+}
+
+Validator = Callable[[str], Any]
+
+@dataclass
+class ModelMetrics:
+    """Running totals for one model within a stage."""
+    calls: int = 0
+    validation_failures: int = 0
+    latency_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+@dataclass
+class StageMetrics:
+    """Running totals for one stage across all of its models."""
+    requests: int = 0
+    escalations: int = 0
+    failures: int = 0
+    models: Dict[str, ModelMetrics] = field(default_factory=dict)
+
+class ModelCascade:
+    """Call a list of models in order until one produces a valid response."""
+
+    def __init__(self, stage: str, models: Sequence[str], callback_manager: CallbackManager = None):
+        """Initialize the cascade.
+
+        Args:
+            stage: Name of the stage, used in the benchmark report
+            models: Model names to try, cheapest first
+            callback_manager: Optional callback manager for tracing
+        """
+        if not models:
+            raise ValueError(f"No models configured for stage {stage}")
+        self.stage = stage
+        self.models = list(models)
+        self.clients = [
+            ChatOpenAI(
+                temperature=0,
+                model=model,
+                callback_manager=callback_manager,
+                streaming=True,
+                stream_usage=True
+            )
+            for model in self.models
+        ]
+        self.metrics = StageMetrics(models={model: ModelMetrics() for model in self.models})
+
+    def _record(self, model: str, response: AIMessage, elapsed: float) -> None:
+        metrics = self.metrics.models[model]
+        usage = getattr(response, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+
+        metrics.calls += 1
+        metrics.latency_seconds += elapsed
+        metrics.input_tokens += input_tokens
+        metrics.output_tokens += output_tokens
+        metrics.cost_usd += (input_tokens * input_price + output_tokens * output_price) / 1000
+
+    def _check(
+        self,
+        index: int,
+        response: AIMessage,
+        validate: Optional[Validator],
+        fallback: Optional[Validator]
+    ) -> Tuple[bool, Any]:
+        """Validate a response; returns (done, parsed value or error)."""
+        if validate is None:
+            return True, response.content
+        try:
+            return True, validate(response.content)
+        except ValueError as e:
+            self.metrics.models[self.models[index]].validation_failures += 1
+            if index + 1 < len(self.models):
+                self.metrics.escalations += 1
+                return False, e
+
+            self.metrics.failures += 1
+            if fallback is None:
+                raise
+            return True, fallback(response.content)
+
+    def invoke(
+        self,
+        messages: List[BaseMessage],
+        validate: Validator = None,
+        fallback: Validator = None
+    ) -> Tuple[AIMessage, Any]:
+        """Invoke the cascade.
+
+        Args:
+            messages: Messages to send
+            validate: Optional function parsing the response content; it raises
+                ValueError to reject the response and escalate to the next model
+            fallback: Optional function parsing the last model's response when
+                it fails validation too
+
+        Returns:
+            Tuple of (accepted response, parsed value)
+
+        Raises:
+            ValueError: If no model produced a valid response and there is no fallback
+        """
+        self.metrics.requests += 1
+        for index, (model, client) in enumerate(zip(self.models, self.clients)):
+            start = time.perf_counter()
+            response = client.invoke(messages)
+            self._record(model, response, time.perf_counter() - start)
+
+            done, value = self._check(index, response, validate, fallback)
+            if done:
+                return response, value
+
+    async def ainvoke(
+        self,
+        messages: List[BaseMessage],
+        validate: Validator = None,
+        fallback: Validator = None
+    ) -> Tuple[AIMessage, Any]:
+        """Async version of invoke."""
+        self.metrics.requests += 1
+        for index, (model, client) in enumerate(zip(self.models, self.clients)):
+            start = time.perf_counter()
+            response = await client.ainvoke(messages)
+            self._record(model, response, time.perf_counter() - start)
+
+            done, value = self._check(index, response, validate, fallback)
+            if done:
+                return response, value
+
+    def report(self) -> Dict:
+        """Summarize latency, token cost and escalation rate for this stage."""
+        metrics = self.metrics
+        calls = sum(m.calls for m in metrics.models.values())
+        latency = sum(m.latency_seconds for m in metrics.models.values())
+        return {
+            "stage": self.stage,
+            "models": self.models,
+            "requests": metrics.requests,
+            "calls": calls,
+            "escalation_rate": metrics.escalations / metrics.requests if metrics.requests else 0.0,
+            "failures": metrics.failures,
+            "avg_latency_seconds": latency / metrics.requests if metrics.requests else 0.0,
+            "input_tokens": sum(m.input_tokens for m in metrics.models.values()),
+            "output_tokens": sum(m.output_tokens for m in metrics.models.values()),
+            "cost_usd": sum(m.cost_usd for m in metrics.models.values()),
+            "per_model": {
+                model: {
+                    "calls": m.calls,
+                    "validation_failures": m.validation_failures,
+                    "avg_latency_seconds": m.latency_seconds / m.calls if m.calls else 0.0,
+                    "input_tokens": m.input_tokens,
+                    "output_tokens": m.output_tokens,
+                    "cost_usd": m.cost_usd
+                }
+                for model, m in metrics.models.items()
+            }
+        }
+
+def format_benchmark_report(reports: List[Dict]) -> str:
+    """Render stage reports as a fixed-width table."""
+    lines = [
+        f"{'stage':<10}{'requests':>10}{'escalation':>12}{'avg latency':>13}{'tokens':>10}{'cost $':>10}",
+        "-" * 65
+    ]
+    for report in reports:
+        lines.append(
+            f"{report['stage']:<10}{report['requests']:>10}"
+            f"{report['escalation_rate']:>11.0%} {report['avg_latency_seconds']:>11.2f}s "
+            f"{report['input_tokens'] + report['output_tokens']:>9}{report['cost_usd']:>10.4f}"
+        )
+    return "\n".join(lines)
@@ -1,24 +1,46 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
 from langchain.callbacks.manager import CallbackManager
 from datetime import datetime
 
+from .task_plan import TaskPlan, TaskStep, PlanScheduler, StepRunner, StatusCallback, DONE, extract_json
+from .model_cascade import ModelCascade, DEFAULT_STAGE_MODELS, format_benchmark_report
+from .estimator import HistoricalEstimator
+
 class TaskAgent:
     """A simple task-specific sub-agent."""
 
-    def __init__(self, callback_manager: CallbackManager = None):
+    def __init__(
+        self,
+        callback_manager: CallbackManager = None,
+        plan_store=None,
+        stage_models: Dict[str, List[str]] = None,
+        step_history=None,
+        estimator: HistoricalEstimator = None
+    ):
         """Initialize the task agent.
 
         Args:
             callback_manager: Optional callback manager for tracing
+            plan_store: Optional PlanStore used to reuse plans and estimates
+                for recurring task descriptions
+            stage_models: Optional per-stage model cascades ("plan", "estimate",
+                "status", "execute"), cheapest model first; stages that are
+                not given use DEFAULT_STAGE_MODELS
+            step_history: Optional StepHistoryStore with the actual durations
+                of completed steps
+            estimator: Optional HistoricalEstimator answering estimates from
+                step_history before the LLM is asked
         """
-        self.chat = ChatOpenAI(
-            temperature=0,
-            model="gpt-3.5-turbo",
-            callback_manager=callback_manager,
-            streaming=True
-        )
+        self.plan_store = plan_store
+        self.step_history = step_history
+        self.estimator = estimator or HistoricalEstimator()
+        self._estimator_stale = True
+        self.stage_models = {**DEFAULT_STAGE_MODELS, **(stage_models or {})}
+        self.cascades = {
+            stage: ModelCascade(stage, models, callback_manager=callback_manager)
+            for stage, models in self.stage_models.items()
+        }
 
         self.system_prompt = """You are a task-specific agent that helps with:
 1. Task planning and breakdown
@@ -33,6 +55,23 @@ When given a task:
 4. Provide clear status updates
 """
 
+        self.plan_format = """Respond with a JSON object only, in this format:
+{"steps": [{"id": "1", "description": "...", "category": "backend", "depends_on": [], "estimate_hours": 4}]}
+category is a short lowercase label for the kind of work (design, backend,
+frontend, testing, deployment, ...). Each step id must be unique and
+depends_on must list the ids of the steps
+that have to be finished before the step can start. Steps that do not depend
+on each other can run in parallel."""
+
+        self.estimate_format = """Respond with a JSON object only, in this format:
+{"estimates": [{"id": "1", "hours": 4, "resources": "..."}]}
+Give exactly one estimate for every step id of the plan."""
+
+    @property
+    def model_version(self) -> str:
+        """Identify the models whose output ends up in a cached plan."""
+        return "|".join(self.stage_models["plan"] + self.stage_models["estimate"])
+
     def plan_task(self, task_description: str) -> Dict:
         """Plan a task by breaking it down into steps.
 
@@ -40,18 +79,28 @@ When given a task:
             task_description: Description of the task to plan
 
         Returns:
-            Dict containing task plan and metadata
+            Dict containing task plan and metadata. "plan" holds the readable
+            plan, "steps" the dependency DAG and "critical_path" the longest
+            chain of estimated steps.
+
+        Raises:
+            ValueError: If the planned dependencies are unknown or cyclic
         """
         messages = [
             SystemMessage(content=self.system_prompt),
-            HumanMessage(content=f"Plan this task: {task_description}")
+            HumanMessage(content=f"Plan this task: {task_description}\n\n{self.plan_format}")
         ]
 
-        response = self.chat.invoke(messages)
+        # Cheaper models escalate when they do not return a well-formed step list
+        _, plan = self.cascades["plan"].invoke(
+            messages,
+            validate=lambda content: TaskPlan.parse(task_description, content, strict=True),
+            fallback=lambda content: TaskPlan.parse(task_description, content)
+        )
 
         return {
-            "task": task_description,
-            "plan": response.content,
+            **plan.to_dict(),
+            "plan": plan.render(),
             "created_at": datetime.now().isoformat(),
             "status": "planned"
         }
@@ -65,24 +114,124 @@ When given a task:
         Returns:
             Dict containing estimates
         """
+        # Answer from the durations of similar completed steps when confident
+        history_estimates = self._estimate_from_history(task_plan)
+        if history_estimates is not None:
+            self._apply_estimates(task_plan, history_estimates)
+            task_plan.update({
+                "estimate_source": "history",
+                "estimated_at": datetime.now().isoformat(),
+                "status": "estimated"
+            })
+            return task_plan
+
         messages = [
             SystemMessage(content=self.system_prompt),
             HumanMessage(content=f"""
                 Provide time and resource estimates for this task plan:
                 {task_plan['plan']}
+
+                {self.estimate_format}
             """)
         ]
 
-        response = self.chat.invoke(messages)
+        step_ids = [step["id"] for step in task_plan.get("steps", [])]
+        # Cheaper models escalate when an estimate is missing for any step
+        response, estimates = self.cascades["estimate"].invoke(
+            messages,
+            validate=lambda content: _parse_estimates(content, step_ids),
+            fallback=lambda content: None
+        )
+
+        if estimates is None:
+            task_plan.update({"estimates": response.content})
+        else:
+            self._apply_estimates(task_plan, estimates)
 
         task_plan.update({
-            "estimates": response.content,
+            "estimate_source": "llm",
             "estimated_at": datetime.now().isoformat(),
             "status": "estimated"
         })
 
         return task_plan
 
+    def _apply_estimates(self, task_plan: Dict, estimates: Dict[str, Dict]) -> None:
+        """Write per-step estimates into a task plan and refresh its critical path."""
+        steps = [
+            {**step, "estimate_hours": estimates[step["id"]]["hours"]}
+            for step in task_plan.get("steps", [])
+        ]
+        plan = TaskPlan.from_dict({**task_plan, "steps": steps})
+        task_plan.update({
+            **plan.to_dict(),
+            "plan": plan.render(),
+            "estimates": _render_estimates(plan, estimates)
+        })
+
+    def _estimate_from_history(self, task_plan: Dict) -> Optional[Dict[str, Dict]]:
+        """Estimate every step from completed-step history, or None if not confident."""
+        if self.step_history is None:
+            return None
+
+        if self._estimator_stale:
+            self.estimator.fit(self.step_history.get_durations())
+            self._estimator_stale = False
+
+        stats = self.estimator.estimate_steps(task_plan.get("steps", []))
+        if stats is None:
+            return None
+        return {
+            step_id: {
+                "hours": estimate.median,
+                "resources": f"median of {estimate.samples} similar steps, p90 {estimate.p90:g}h"
+            }
+            for step_id, estimate in stats.items()
+        }
+
+    def complete_step(self, task_plan: Dict, step_id: str, actual_hours: float) -> Dict:
+        """Mark a step as done and record how long it actually took.
+
+        Args:
+            task_plan: The task plan containing the step
+            step_id: Id of the completed step
+            actual_hours: Actual duration of the step in hours
+
+        Returns:
+            Dict containing the updated task plan
+        """
+        steps = task_plan.get("steps", [])
+        step = next((step for step in steps if step["id"] == step_id), None)
+        if step is None:
+            raise ValueError(f"Unknown step id: {step_id}")
+
+        step.update({
+            "status": DONE,
+            "actual_hours": actual_hours,
+            "finished_at": datetime.now().isoformat()
+        })
+        self._record_duration(step.get("category"), step["description"], actual_hours, step.get("estimate_hours"))
+
+        return task_plan
+
+    def _record_duration(
+        self,
+        category: Optional[str],
+        description: str,
+        actual_hours: float,
+        estimate_hours: Optional[float]
+    ) -> None:
+        """Add a completed step to the history estimates are answered from."""
+        if self.step_history is None or not category:
+            return
+        self.step_history.record(
+            category=category,
+            description=description,
+            actual_hours=actual_hours,
+            estimate_hours=estimate_hours
+        )
+        self._estimator_stale = True
+
     def get_status(self, task_plan: Dict) -> Dict:
         """Get status report for a task plan.
 
@@ -102,7 +251,7 @@ When given a task:
             """)
         ]
 
-        response = self.chat.invoke(messages)
+        response, _ = self.cascades["status"].invoke(messages)
 
         return {
             **task_plan,
@@ -119,13 +268,128 @@ When given a task:
         Returns:
             Dict containing complete task execution details
         """
-        # Step 1: Plan the task
-        task_plan = self.plan_task(task_description)
+        model_version = self.model_version
+        cached_plan = None
+        if self.plan_store:
+            cached_plan = self.plan_store.get(task_description, model_version)
 
-        # Step 2: Estimate the task
-        task_plan = self.estimate_task(task_plan)
+        if cached_plan:
+            # Plan and estimates are reused, only the status report is refreshed
+            task_plan = {**cached_plan, "cached": True}
+        else:
+            # Step 1: Plan the task
+            task_plan = self.plan_task(task_description)
+
+            # Step 2: Estimate the task
+            task_plan = self.estimate_task(task_plan)
+
+            if self.plan_store:
+                self.plan_store.put(task_description, model_version, task_plan)
+            task_plan["cached"] = False
 
         # Step 3: Get status report
         task_result = self.get_status(task_plan)
 
-        return task_result
\ No newline at end of file
+        return task_result
+
+    async def _run_step(self, step: TaskStep) -> str:
+        """Default step runner: ask the LLM to carry out a single step."""
+        messages = [
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(content=f"""
+                Carry out this step and summarize the outcome:
+                Step: {step.description}
+            """)
+        ]
+
+        response, _ = await self.cascades["execute"].ainvoke(messages)
+        return response.content
+
+    async def run_plan(
+        self,
+        task_plan: Dict,
+        step_runner: StepRunner = None,
+        max_concurrency: int = 4,
+        on_status: StatusCallback = None
+    ) -> Dict:
+        """Execute the steps of a task plan, running independent steps concurrently.
+
+        Each step a given step_runner completes is recorded in the step
+        history with its actual hours, as complete_step does. Steps of the
+        default runner are not: how long the LLM takes to describe a step
+        says nothing about how long the step takes.
+
+        Args:
+            task_plan: A task plan as returned by plan_task
+            step_runner: Optional coroutine function doing the work for one step;
+                defaults to asking the LLM to carry out the step
+            max_concurrency: Maximum number of steps running at the same time
+            on_status: Optional callback invoked whenever a step changes status
+
+        Returns:
+            Dict containing the task plan with per-step status and results
+        """
+        def step_status(step: TaskStep) -> None:
+            if step.status == DONE and step_runner is not None:
+                self._record_duration(step.category, step.description, step.actual_hours, step.estimate_hours)
+            if on_status:
+                on_status(step)
+
+        plan = TaskPlan.from_dict(task_plan)
+        scheduler = PlanScheduler(max_concurrency=max_concurrency, on_status=step_status)
+        await scheduler.run(plan, step_runner or self._run_step)
+
+        completed = all(step.status == DONE for step in plan.steps.values())
+        return {
+            **task_plan,
+            **plan.to_dict(),
+            "executed_at": datetime.now().isoformat(),
+            "status": "completed" if completed else "failed"
+        }
+
+    def benchmark_report(self) -> Dict:
+        """Report latency, token cost and escalation rate per stage.
+
+        Returns:
+            Dict with a per-stage breakdown and a formatted table
+        """
+        reports = [cascade.report() for cascade in self.cascades.values()]
+        return {
+            "stages": {report["stage"]: report for report in reports},
+            "table": format_benchmark_report(reports)
+        }
+
+def _parse_estimates(content: str, step_ids: List[str]) -> Dict[str, Dict]:
+    """Parse per-step estimates, rejecting responses that miss a step."""
+    data = extract_json(content)
+    if not isinstance(data, dict) or not isinstance(data.get("estimates"), list):
+        raise ValueError("Response does not contain a JSON estimate list")
+
+    estimates = {}
+    for entry in data["estimates"]:
+        try:
+            estimates[str(entry["id"])] = {
+                "hours": float(entry["hours"]),
+                "resources": entry.get("resources", "")
+            }
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    missing = [step_id for step_id in step_ids if step_id not in estimates]
+    if missing:
+        raise ValueError(f"Missing estimates for steps: {missing}")
+    return estimates
+
+def _render_estimates(plan: TaskPlan, estimates: Dict[str, Dict]) -> str:
+    """Render per-step estimates with totals as readable text."""
+    lines = []
+    for step_id in plan.topological_order():
+        estimate = estimates[step_id]
+        line = f"- [{step_id}] {plan.steps[step_id].description}: {estimate['hours']:g}h"
+        if estimate["resources"]:
+            line += f" ({estimate['resources']})"
+        lines.append(line)
+
+    duration, _ = plan.critical_path()
+    lines.append(f"Total effort: {plan.total_hours():g}h, critical path: {duration:g}h")
+    return "\n".join(lines)
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Step lifecycle values, in the order a step moves through them
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+@dataclass
+class TaskStep:
+    """A single step of a task plan."""
+    id: str
+    description: str
+    depends_on: List[str] = field(default_factory=list)
+    estimate_hours: Optional[float] = None
+    actual_hours: Optional[float] = None
+    category: Optional[str] = None
+    status: str = PENDING
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TaskStep":
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        known["id"] = str(known["id"])
+        known["depends_on"] = [str(dep) for dep in known.get("depends_on") or []]
+        if known.get("estimate_hours") is not None:
+            known["estimate_hours"] = float(known["estimate_hours"])
+        return cls(**known)
+
+class TaskPlan:
+    """A task plan as a DAG of steps keyed by step id."""
+
+    def __init__(self, task: str, steps: List[TaskStep]):
+        self.task = task
+        self.steps: Dict[str, TaskStep] = {}
+        for step in steps:
+            if step.id in self.steps:
+                raise ValueError(f"Duplicate step id: {step.id}")
+            self.steps[step.id] = step
+        self._validate()
+
+    def _validate(self) -> None:
+        """Ensure every dependency exists and the graph has no cycles."""
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"Step {step.id} depends on unknown step {dep}")
+        self.topological_order()
+
+    def topological_order(self) -> List[str]:
+        """Return step ids so that every step comes after its dependencies."""
+        remaining = {step_id: len(step.depends_on) for step_id, step in self.steps.items()}
+        dependents = self.dependents()
+        ready = [step_id for step_id, count in remaining.items() if count == 0]
+        order = []
+
+        while ready:
+            step_id = ready.pop(0)
+            order.append(step_id)
+            for child in dependents[step_id]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self.steps):
+            cyclic = sorted(set(self.steps) - set(order))
+            raise ValueError(f"Task plan has a dependency cycle between steps: {cyclic}")
+        return order
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """Map each step id to the ids of the steps that depend on it."""
+        dependents = {step_id: [] for step_id in self.steps}
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                dependents[dep].append(step.id)
+        return dependents
+
+    def critical_path(self) -> Tuple[float, List[str]]:
+        """Compute the longest estimated path through the plan.
+
+        Steps without an estimate count as zero hours.
+
+        Returns:
+            Tuple of (duration in hours, step ids along the critical path)
+        """
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+
+        for step_id in self.topological_order():
+            step = self.steps[step_id]
+            start, via = 0.0, None
+            for dep in step.depends_on:
+                if finish[dep] > start or via is None:
+                    start, via = finish[dep], dep
+            finish[step_id] = start + (step.estimate_hours or 0.0)
+            previous[step_id] = via
+
+        if not finish:
+            return 0.0, []
+
+        last = max(finish, key=finish.get)
+        path = []
+        while last is not None:
+            path.append(last)
+            last = previous[last]
+        path.reverse()
+        return finish[path[-1]], path
+
+    def total_hours(self) -> float:
+        """Sum of all step estimates, i.e. the fully sequential duration."""
+        return sum(step.estimate_hours or 0.0 for step in self.steps.values())
+
+    def render(self) -> str:
+        """Render the plan as readable text."""
+        lines = []
+        for index, step_id in enumerate(self.topological_order(), 1):
+            step = self.steps[step_id]
+            line = f"{index}. [{step.id}] {step.description}"
+            if step.estimate_hours is not None:
+                line += f" ({step.estimate_hours:g}h)"
+            if step.depends_on:
+                line += f" - after {', '.join(step.depends_on)}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict:
+        duration, path = self.critical_path()
+        return {
+            "task": self.task,
+            "steps": [self.steps[step_id].to_dict() for step_id in self.topological_order()],
+            "critical_path": path,
+            "critical_path_hours": duration,
+            "total_hours": self.total_hours()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TaskPlan":
+        return cls(data["task"], [TaskStep.from_dict(step) for step in data.get("steps", [])])
+
+    @classmethod
+    def parse(cls, task: str, text: str, strict: bool = False) -> "TaskPlan":
+        """Parse an LLM response into a task plan.
+
+        The response is expected to hold a JSON object with a "steps" list
+        (optionally inside a markdown code fence). If no JSON can be found,
+        numbered lines are taken as a sequential chain of steps instead.
+
+        Args:
+            task: Description of the task being planned
+            text: Raw LLM response
+            strict: Raise ValueError instead of falling back when the
+                response holds no JSON step list
+
+        Returns:
+            Parsed TaskPlan
+        """
+        data = extract_json(text)
+        if isinstance(data, dict) and isinstance(data.get("steps"), list):
+            return cls(task, [TaskStep.from_dict(step) for step in data["steps"]])
+        if isinstance(data, list):
+            return cls(task, [TaskStep.from_dict(step) for step in data])
+        if strict:
+            raise ValueError("Response does not contain a JSON step list")
+
+        steps = []
+        for match in re.finditer(r"^\s*(\d+)[.)]\s+(.+)$", text, re.MULTILINE):
+            steps.append(TaskStep(
+                id=str(len(steps) + 1),
+                description=match.group(2).strip(),
+                depends_on=[steps[-1].id] if steps else []
+            ))
+        if not steps:
+            steps = [TaskStep(id="1", description=text.strip() or task)]
+        return cls(task, steps)
+
+def extract_json(text: str) -> Any:
+    """Pull the first JSON document out of a (possibly fenced) LLM response."""
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    candidates = [fenced.group(1)] if fenced else []
+    candidates.append(text)
+
+    for candidate in candidates:
+        candidate = candidate.strip()
+        for opener, closer in (("{", "}"), ("[", "]")):
+            start, end = candidate.find(opener), candidate.rfind(closer)
+            if start == -1 or end <= start:
+                continue
+            try:
+                return json.loads(candidate[start:end + 1])
+            except json.JSONDecodeError:
+                continue
+    return None
+
+StepRunner = Callable[[TaskStep], Awaitable[Any]]
+StatusCallback = Callable[[TaskStep], None]
+
+class PlanScheduler:
+    """Execute a TaskPlan, running independent steps concurrently.
+
+    A step starts as soon as all of its dependencies are done, so the plan
+    finishes in critical-path time rather than the sum of all steps. At most
+    ``max_concurrency`` steps run at once.
+    """
+
+    def __init__(self, max_concurrency: int = 4, on_status: StatusCallback = None):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum number of steps running at the same time
+            on_status: Optional callback invoked whenever a step changes status
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.on_status = on_status
+
+    def _set_status(self, step: TaskStep, status: str) -> None:
+        step.status = status
+        if status == RUNNING:
+            step.started_at = datetime.now().isoformat()
+        elif status in (DONE, FAILED):
+            finished = datetime.now()
+            step.finished_at = finished.isoformat()
+            # Runners that know the step's real duration set actual_hours themselves
+            if status == DONE and step.actual_hours is None:
+                started = datetime.fromisoformat(step.started_at)
+                step.actual_hours = (finished - started).total_seconds() / 3600
+        if self.on_status:
+            self.on_status(step)
+
+    async def run(self, plan: TaskPlan, step_runner: StepRunner) -> TaskPlan:
+        """Run every step of the plan.
+
+        A failed step marks all of its transitive dependents as skipped;
+        unrelated branches keep running. A step that finishes gets its
+        wall-clock duration as actual_hours, unless the runner set them.
+
+        Args:
+            plan: The plan to execute (step statuses are updated in place)
+            step_runner: Coroutine function doing the work for one step
+
+        Returns:
+            The same plan with updated step statuses and results
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        dependents = plan.dependents()
+        for step in plan.steps.values():
+            if step.status != DONE:
+                step.status, step.error, step.actual_hours = PENDING, None, None
+        waiting = {
+            step_id: sum(1 for dep in step.depends_on if plan.steps[dep].status != DONE)
+            for step_id, step in plan.steps.items()
+            if step.status != DONE
+        }
+        running = set()
+
+        def skip_dependents(step_id: str) -> None:
+            for child in dependents[step_id]:
+                if child in waiting:
+                    del waiting[child]
+                    self._set_status(plan.steps[child], SKIPPED)
+                    skip_dependents(child)
+
+        def launch_ready() -> None:
+            for step_id in [s for s, count in waiting.items() if count == 0]:
+                del waiting[step_id]
+                running.add(asyncio.ensure_future(run_step(plan.steps[step_id])))
+
+        async def run_step(step: TaskStep) -> None:
+            async with semaphore:
+                self._set_status(step, RUNNING)
+                try:
+                    result = await step_runner(step)
+                    step.result = None if result is None else str(result)
+                    self._set_status(step, DONE)
+                except Exception as e:
+                    step.error = str(e)
+                    self._set_status(step, FAILED)
+
+            # Release dependents as soon as this step settles
+            if step.status == DONE:
+                for child in dependents[step.id]:
+                    if child in waiting:
+                        waiting[child] -= 1
+            else:
+                skip_dependents(step.id)
+            launch_ready()
+
+        launch_ready()
+        while running:
+            finished, _ = await asyncio.wait(set(running))
+            running.difference_update(finished)
+
+        return plan
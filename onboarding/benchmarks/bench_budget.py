@@ -0,0 +1,126 @@
+"""Query-building LLM calls counted against the run's token budget.
+
+Runs onboarding with a stand-in for the GPT-4 client buildQuery translates
+with, which reports the tokens of every call: a sequential run building its
+query in query_node, a user turn whose tool call is buildQuery, and a
+fan-out workspace with and without a token budget too small for all of its
+queries. Checks that the run summary counts the translation tokens and that
+the small budget stops query building; exits non-zero when either fails:
+    python -m benchmarks.bench_budget
+"""
+import asyncio
+import sys
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from benchmarks.common import FakeOrchestratorModel, print_table
+
+import graph as onboarding_graph
+import query_builder
+from translation_cache import TranslationCache
+
+INPUT_TOKENS = 900
+OUTPUT_TOKENS = 40
+STEP_COUNT = 2
+QUESTIONS_PER_STEP = 4
+
+class FakeSOQLModel:
+    """Stands in for the GPT-4 client buildQuery translates with, reporting fixed token usage."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return AIMessage(
+            content="SELECT Id, Name, Type FROM Account WHERE Type = 'Customer'",
+            usage_metadata={
+                "input_tokens": INPUT_TOKENS,
+                "output_tokens": OUTPUT_TOKENS,
+                "total_tokens": INPUT_TOKENS + OUTPUT_TOKENS
+            }
+        )
+
+def fresh_query_builder() -> FakeSOQLModel:
+    """Send every description to the stand-in: no cached translations, no synthesized queries."""
+    query_builder.cfg.SOQL_LLM = FakeSOQLModel()
+    query_builder.translation_cache = TranslationCache(None, query_builder.SALESFORCE_SCHEMA)
+    query_builder.synthesizer.threshold = float("inf")
+    return query_builder.cfg.SOQL_LLM
+
+async def sequential_run(max_tokens: int):
+    agent = onboarding_graph.OnboardingAgent()
+    agent.model = FakeOrchestratorModel(latency=0)
+    final_state = await agent.graph.ainvoke(
+        agent.initial_state, {"recursion_limit": 50, "configurable": {"max_tokens": max_tokens}}
+    )
+    return agent.model.calls, final_state
+
+async def tool_call_turn(max_tokens: int):
+    agent = onboarding_graph.OnboardingAgent()
+    agent.model = FakeOrchestratorModel(latency=0, tool_calls=[[{
+        "name": "buildQuery",
+        "args": {"query_description": "Which customer accounts do we have?"},
+        "id": "call_query"
+    }]])
+    turn = agent.initial_state.model_copy(update={"messages": [HumanMessage(content="Show me our customer accounts")]})
+    final_state = await agent.graph.ainvoke(
+        turn, {"recursion_limit": 50, "configurable": {"max_tokens": max_tokens}}
+    )
+    return agent.model.calls, final_state
+
+async def fanout_workspace(max_tokens: int):
+    # One query in flight at a time, so each branch sees what the earlier ones spent
+    agent = onboarding_graph.OnboardingAgent(fan_out=True, max_llm_calls=1)
+    agent.model = FakeOrchestratorModel(latency=0)
+
+    async def load_step_questions(step_id, workspace_id=None):
+        return [
+            {"id": f"{step_id}_q{i}", "description": f"Which customer accounts matter for {step_id} item {i}?", "step": {"id": step_id}}
+            for i in range(QUESTIONS_PER_STEP)
+        ]
+
+    agent._load_step_questions = load_step_questions
+    steps = [{"id": f"step_{i + 1}", "order": i + 1} for i in range(STEP_COUNT)]
+    final_state = await agent.graph.ainvoke(
+        {"messages": agent.initial_state.messages, "steps": steps, "current_step": "step_1"},
+        {"recursion_limit": 50, "configurable": {"max_tokens": max_tokens}}
+    )
+    return agent.model.calls, final_state
+
+async def main():
+    per_query = INPUT_TOKENS + OUTPUT_TOKENS
+    questions = STEP_COUNT * QUESTIONS_PER_STEP
+    scenarios = [
+        ("sequential", sequential_run, 60_000),
+        ("buildQuery tool call", tool_call_turn, 60_000),
+        ("fan-out", fanout_workspace, 60_000),
+        ("fan-out", fanout_workspace, 3 * per_query),
+    ]
+
+    rows = []
+    failures = []
+    for label, scenario, max_tokens in scenarios:
+        soql_model = fresh_query_builder()
+        orchestrator_calls, final_state = await scenario(max_tokens)
+        summary = final_state["run_summary"]
+        tokens = summary["input_tokens"] + summary["output_tokens"]
+        rows.append([
+            label, max_tokens, soql_model.calls, summary["llm_calls"], tokens, summary["stopped_by"] or "-"
+        ])
+        if summary["llm_calls"] != orchestrator_calls + soql_model.calls or tokens != soql_model.calls * per_query:
+            failures.append(f"{label}: the run summary misses query-building calls")
+        if tokens > max_tokens + per_query:
+            failures.append(f"{label}: query building went past the {max_tokens} token budget")
+        if max_tokens < questions * per_query and soql_model.calls >= questions:
+            failures.append(f"{label}: every query was built despite the {max_tokens} token budget")
+
+    print(f"Query-building LLM calls of {per_query} tokens each, {questions} questions in the fan-out workspace")
+    print_table(["run", "max tokens", "query llm calls", "counted llm calls", "counted tokens", "stopped by"], rows)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
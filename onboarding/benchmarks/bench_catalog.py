@@ -0,0 +1,129 @@
+"""Step and question lookups: linear scans versus the indexed catalog.
+
+Builds catalogs of 10,000 questions split over several workspaces, saves
+them as JSON and as SQLite, and compares the tools' former list scans
+(over one flat list, filtered by workspace) with the catalog's indexes for
+getStepById, getQuestionById and getQuestionsByStep. Then times loading
+each source, the cost of the periodic change check on lookups, and how
+long a worker takes to serve a catalog rewritten under it:
+    python -m benchmarks.bench_catalog [questions] [workspaces]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import print_table
+
+from catalog import Catalog, save_catalog
+
+STEPS_PER_WORKSPACE = 25
+LOOKUPS = 20_000
+
+def synthetic_catalog(questions: int, workspaces: int, seed: int = 7):
+    rng = random.Random(seed)
+    catalog = {}
+    per_workspace = questions // workspaces
+    for w in range(workspaces):
+        steps = [
+            {"id": f"step_{s + 1}", "name": f"Step {s + 1}", "description": f"Step {s + 1} of workspace {w}",
+             "is_completed": False, "order": s + 1}
+            for s in range(STEPS_PER_WORKSPACE)
+        ]
+        catalog[f"workspace_{w}"] = {
+            "steps": steps,
+            "questions": [
+                {"id": f"question_{q + 1}", "name": f"Question {q + 1}", "description": f"Question {q + 1} of workspace {w}",
+                 "is_answered": False, "step": {"id": rng.choice(steps)["id"]},
+                 "preview": {"enabled": True, "data_type": "text"}}
+                for q in range(per_workspace)
+            ]
+        }
+    return catalog
+
+def timed_lookups(lookup, keys):
+    start = time.perf_counter()
+    for key in keys:
+        lookup(*key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+def scans(workspaces):
+    """The tools' former lookups, over flat lists of every workspace's steps and questions."""
+    steps = [{**step, "workspace": name} for name, w in workspaces.items() for step in w["steps"]]
+    questions = [{**question, "workspace": name} for name, w in workspaces.items() for question in w["questions"]]
+    return {
+        "getStepById": lambda workspace, step_id: next(
+            (s for s in steps if s["workspace"] == workspace and s["id"] == step_id), {}),
+        "getQuestionById": lambda workspace, question_id: next(
+            (q for q in questions if q["workspace"] == workspace and q["id"] == question_id), {}),
+        "getQuestionsByStep": lambda workspace, step_id: [
+            q for q in questions if q["workspace"] == workspace and q["step"]["id"] == step_id],
+    }
+
+def indexed(catalog: Catalog):
+    return {
+        "getStepById": lambda workspace, step_id: catalog.step(step_id, workspace),
+        "getQuestionById": lambda workspace, question_id: catalog.question(question_id, workspace),
+        "getQuestionsByStep": lambda workspace, step_id: catalog.questions_by_step(step_id, workspace),
+    }
+
+def wait_for_reload(catalog: Catalog, marker: str, timeout: float = 10.0) -> float:
+    """Seconds until lookups serve the rewritten catalog's marker step."""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if catalog.step(marker, "workspace_0"):
+            return time.perf_counter() - start
+        time.sleep(0.01)
+    raise TimeoutError("The catalog was not reloaded")
+
+def main(questions: int = 10_000, workspaces: int = 20):
+    data = synthetic_catalog(questions, workspaces)
+    rng = random.Random(1)
+    names = list(data)
+    keys = {
+        "getStepById": [(w, f"step_{rng.randint(1, STEPS_PER_WORKSPACE)}") for w in rng.choices(names, k=LOOKUPS)],
+        "getQuestionById": [(w, f"question_{rng.randint(1, questions // workspaces)}") for w in rng.choices(names, k=LOOKUPS)],
+        "getQuestionsByStep": [(w, f"step_{rng.randint(1, STEPS_PER_WORKSPACE)}") for w in rng.choices(names, k=LOOKUPS)],
+    }
+    print(f"{questions:,} questions and {STEPS_PER_WORKSPACE * workspaces} steps over {workspaces} workspaces")
+
+    with tempfile.TemporaryDirectory() as directory:
+        sources = {"JSON": Path(directory) / "catalog.json", "SQLite": Path(directory) / "catalog.db"}
+        for path in sources.values():
+            save_catalog(data, path)
+
+        scan = scans(data)
+        catalog = Catalog(sources["JSON"], reload_interval=-1)
+        rows = []
+        for tool in keys:
+            # The scans are slow enough that a tenth of the lookups gives a stable mean
+            scan_us = timed_lookups(scan[tool], keys[tool][:LOOKUPS // 10])
+            index_us = timed_lookups(indexed(catalog)[tool], keys[tool])
+            rows.append([tool, f"{scan_us:,.1f}", f"{index_us:,.2f}", f"{scan_us / index_us:,.0f}x"])
+        print_table(["lookup", "scan us", "indexed us", "speedup"], rows)
+        print()
+
+        rows = []
+        for label, path in sources.items():
+            for interval in (-1, 0, 2.0):
+                catalog = Catalog(path, reload_interval=interval)
+                lookup_us = timed_lookups(indexed(catalog)["getQuestionById"], keys["getQuestionById"])
+
+                rewritten = {**data, "workspace_0": {**data["workspace_0"], "steps": [
+                    *data["workspace_0"]["steps"], {"id": "step_new", "name": "New step", "order": 99}]}}
+                save_catalog(rewritten, path)
+                reload_seconds = wait_for_reload(catalog, "step_new") if interval >= 0 else None
+                save_catalog(data, path)
+                metrics = catalog.get_metrics()
+                rows.append([
+                    label,
+                    "never" if interval < 0 else f"{interval:g} s",
+                    f"{metrics['mean_load_ms']:,.0f}",
+                    f"{lookup_us:,.2f}",
+                    "-" if reload_seconds is None else f"{reload_seconds:.2f} s",
+                ])
+        print_table(["source", "change check", "load ms", "getQuestionById us", "rewrite served after"], rows)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,145 @@
+"""Checkpoint write cost per hop as the message history grows.
+
+Replays an onboarding conversation hop by hop into SqliteDeltaSaver, once
+storing full copies of every changed channel and once storing message
+history deltas, then resumes the thread and checks the restored state.
+Then times the end-of-turn prune of one thread in a store shared with many
+others, against pruning the whole store, and checks that reads of one
+session go through while another session lists its history. Exits non-zero
+when they time out; a read that blocks the event loop hangs instead, so gate
+with a timeout:
+    python -m benchmarks.bench_checkpoint
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+
+from benchmarks.common import print_table
+
+from checkpoint import SqliteDeltaSaver
+
+REPORT_AT = (10, 50, 100, 200)
+
+def hop_messages(hop: int):
+    return [
+        HumanMessage(content=f"Answer for question {hop}: we track renewals per account owner."),
+        AIMessage(content=f"Noted. Building the SOQL query for question {hop + 1} of the onboarding. " * 3)
+    ]
+
+def replay(delta: bool, hops: int, saver: SqliteDeltaSaver = None, thread_id: str = "bench"):
+    """Write one checkpoint per hop; returns per-hop (put seconds, bytes) and the saver."""
+    path = os.path.join(tempfile.mkdtemp(), "checkpoints.db")
+    saver = saver or SqliteDeltaSaver(path, delta=delta)
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    checkpoint = empty_checkpoint()
+    messages = []
+    samples = []
+
+    for hop in range(1, hops + 1):
+        messages = [*messages, *hop_messages(hop)]
+        checkpoint = {
+            **checkpoint,
+            "id": f"{hop:08d}",
+            "channel_values": {"messages": messages, "current_step": f"step_{hop % 5}", "last_node": "query_node"},
+            "channel_versions": {"messages": hop, "current_step": hop, "last_node": hop}
+        }
+        new_versions = {"messages": hop, "current_step": hop, "last_node": hop}
+
+        written = saver.bytes_written
+        start = time.perf_counter()
+        config = saver.put(config, checkpoint, {"step": hop}, new_versions)
+        samples.append((time.perf_counter() - start, saver.bytes_written - written))
+
+    return samples, saver, messages, saver.path
+
+def shared_store_prune(threads: int, hops: int):
+    """Seconds to prune one thread of a shared store, then the whole store."""
+    saver = SqliteDeltaSaver(os.path.join(tempfile.mkdtemp(), "checkpoints.db"))
+    histories = {}
+    for index in range(threads):
+        thread_id = f"thread_{index}"
+        histories[thread_id] = replay(True, hops, saver, thread_id)[2]
+
+    start = time.perf_counter()
+    thread_deleted = saver.prune_checkpoints(keep_last=10, thread_id="thread_0")
+    thread_seconds = time.perf_counter() - start
+    assert thread_deleted == hops - 10
+
+    start = time.perf_counter()
+    saver.prune_checkpoints(keep_last=10)
+    store_seconds = time.perf_counter() - start
+
+    restored = SqliteDeltaSaver(saver.path)
+    for thread_id, messages in histories.items():
+        checkpoint = restored.get_tuple({"configurable": {"thread_id": thread_id}}).checkpoint
+        assert checkpoint["channel_values"]["messages"] == messages
+    return thread_seconds, store_seconds
+
+async def read_while_listing(timeout: float = 10.0) -> bool:
+    """Whether aget_tuple of one thread completes inside an alist iteration of another."""
+    saver = SqliteDeltaSaver(os.path.join(tempfile.mkdtemp(), "checkpoints.db"))
+    for thread_id in ("listed", "read"):
+        replay(True, 20, saver, thread_id)
+
+    async def list_and_read():
+        async for _ in saver.alist({"configurable": {"thread_id": "listed"}}):
+            await saver.aget_tuple({"configurable": {"thread_id": "read"}})
+
+    try:
+        await asyncio.wait_for(list_and_read(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    return True
+
+def main(hops: int = max(REPORT_AT)):
+    results = {delta: replay(delta, hops) for delta in (False, True)}
+
+    rows = []
+    for hop in REPORT_AT:
+        row = [hop, hop * 2]
+        for delta in (False, True):
+            seconds, size = results[delta][0][hop - 1]
+            row += [f"{seconds * 1000:.2f} ms", f"{size / 1024:.1f} KB"]
+        rows.append(row)
+    print(f"Checkpoint write per hop, {hops} hops")
+    print_table(["hop", "messages", "full put", "full bytes", "delta put", "delta bytes"], rows)
+
+    for delta in (False, True):
+        _, saver, messages, path = results[delta]
+        total = sum(size for _, size in results[delta][0])
+
+        # Resume with a fresh saver so nothing comes from the in-memory cache
+        start = time.perf_counter()
+        restored = SqliteDeltaSaver(path).get_tuple({"configurable": {"thread_id": "bench"}})
+        resume_ms = (time.perf_counter() - start) * 1000
+        assert restored.checkpoint["channel_values"]["messages"] == messages
+
+        deleted = saver.prune_checkpoints(keep_last=10)
+        after_prune = SqliteDeltaSaver(path).get_tuple({"configurable": {"thread_id": "bench"}})
+        assert after_prune.checkpoint["channel_values"]["messages"] == messages
+        print(
+            f"{'delta' if delta else 'full'}: {total / 1024 / 1024:.1f} MB written, "
+            f"resume {resume_ms:.1f} ms, pruned {deleted} checkpoints, "
+            f"db {os.path.getsize(path) / 1024 / 1024:.1f} MB"
+        )
+
+    threads = 50
+    thread_seconds, store_seconds = shared_store_prune(threads, 50)
+    print(
+        f"end-of-turn prune with {threads} threads stored: "
+        f"this thread {thread_seconds * 1000:.1f} ms, whole store {store_seconds * 1000:.1f} ms"
+    )
+
+    if not asyncio.run(read_while_listing()):
+        print("FAIL: reading a checkpoint while another thread's history is listed hangs")
+        return 1
+    print("reads while listing another thread's history: OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
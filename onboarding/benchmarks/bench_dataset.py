@@ -0,0 +1,96 @@
+"""Loading Salesforce datasets: generation, JSON records and columnar files.
+
+Generates synthetic datasets of growing size, writes them as a JSON records
+file and as columnar .npy files, and loads them back the three ways
+load_database can: parsing the JSON records, reading the columnar files,
+and memory-mapping them. Reports time, Python heap allocated by the load
+(tracemalloc; mapped pages are not counted) and the time of the first
+queries, which is when mapped pages are actually read:
+    python -m benchmarks.bench_dataset [rows ...]
+"""
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_soql_engine import records
+from benchmarks.common import print_table
+
+import dataset
+from dataset import load_database, save_columnar, synthetic_database
+from soql import parse
+
+# Above this many rows per object the JSON records file takes minutes to parse
+JSON_MAX_ROWS = 100_000
+
+QUERIES = [
+    parse("SELECT StageName, SUM(Amount) FROM Opportunity GROUP BY StageName"),
+    parse("SELECT Id, Name FROM Account WHERE Industry = 'Energy' AND BillingState = 'TX' LIMIT 100"),
+]
+
+def measured(run):
+    """(seconds, MB allocated at the peak, result) of a call.
+
+    Tracing allocations slows Python code severalfold, so the call is
+    timed untraced and run a second time for the memory figure.
+    """
+    start = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 1e6, result
+
+def first_queries(database) -> float:
+    start = time.perf_counter()
+    for query in QUERIES:
+        database.execute(query)
+    return time.perf_counter() - start
+
+def disk_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+
+def main(sizes=(10_000, 100_000, 1_000_000)):
+    results = []
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            generate_seconds, generate_mb, database = measured(lambda: synthetic_database(rows))
+            results.append([f"{rows:,}", "generate", f"{generate_seconds:.2f}", f"{generate_mb:,.0f}", "-", "-"])
+
+            columnar = Path(directory) / "columnar"
+            start = time.perf_counter()
+            save_columnar(database, columnar)
+            save_seconds = time.perf_counter() - start
+
+            loads = [("columnar, read", columnar, False), ("columnar, mmap", columnar, True)]
+            if rows <= JSON_MAX_ROWS:
+                records_file = Path(directory) / "records.json"
+                with open(records_file, "w") as f:
+                    json.dump({name: records(table) for name, table in database.tables.items()}, f)
+                loads.insert(0, ("JSON records", records_file, False))
+            del database
+
+            for label, path, mmap in loads:
+                # Records files are cached once read; every measured load parses the file again
+                seconds, mb, loaded = measured(
+                    lambda: dataset._read_records.cache_clear() or load_database(path, mmap=mmap)
+                )
+                results.append([
+                    f"{rows:,}",
+                    f"load {label}",
+                    f"{seconds:.2f}",
+                    f"{mb:,.0f}",
+                    f"{disk_size(path) / 1e6:,.0f}",
+                    f"{first_queries(loaded) * 1000:,.1f}",
+                ])
+            results[-len(loads) - 1][4] = f"saved in {save_seconds:.2f}s"
+    print_table(["rows per object", "step", "seconds", "heap MB", "disk MB", "first queries ms"], results)
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (10_000, 100_000, 1_000_000))
@@ -0,0 +1,99 @@
+"""Bytes sent to the frontend by the onboarding tools' state emits.
+
+Replays the tool calls of an onboarding run against a growing state and
+compares what the emitter sent with what the old behaviour (every emit a
+full snapshot) would have sent. Then checks that two runs without a thread
+id never get patches against each other's state, and that finished runs
+leave no session behind; exits non-zero when they do:
+    python -m benchmarks.bench_emitter
+"""
+import asyncio
+import sys
+
+from benchmarks.common import FakeOrchestratorModel, fake_query_execute, print_table
+
+import emitter
+import graph as onboarding_graph
+from emitter import state_emitter
+from query_builder import getQueryData
+from tools.questions import getQuestionById, getQuestions
+from tools.steps import getStepById, getSteps
+
+QUERIES = [
+    "SELECT Id, Name FROM Account WHERE Type = 'Customer'",
+    "SELECT Id, Name, Title FROM Contact",
+    "SELECT Id, Name, Amount FROM Opportunity WHERE IsClosed = false",
+]
+
+async def replay(diff: bool, rounds: int):
+    state_emitter.diff = diff
+    config = {"configurable": {"thread_id": f"bench-{diff}"}}
+    state_emitter.start_run(config)
+
+    state = {"steps": [], "questions": [], "current_step": None, "query_results": None}
+    for _ in range(rounds):
+        state["steps"] = await getSteps.ainvoke({"state": dict(state)}, config)
+        await getStepById.ainvoke({"stepId": "step_1", "state": dict(state)}, config)
+        state["questions"] = (await getQuestions.ainvoke({"state": dict(state)}, config))["result"]
+        await getQuestionById.ainvoke({"questionId": "question_1", "state": dict(state)}, config)
+        for query in QUERIES:
+            _, state["query_results"] = await getQueryData.ainvoke({"soql_query": query, "state": dict(state)}, config)
+
+    return state_emitter.finish_run(config)
+
+async def unthreaded_payloads():
+    """Payloads sent for two interleaved runs whose configs have no thread id."""
+    sent = []
+
+    async def record(config, payload):
+        sent.append(payload)
+
+    send = emitter.copilotkit_emit_state
+    emitter.copilotkit_emit_state = record
+    try:
+        for step_id in ("step_1", "step_2", "step_1", "step_2"):
+            state = {"steps": [], "questions": [], "current_step": step_id, "query_results": None}
+            await getStepById.ainvoke({"stepId": step_id, "state": state}, {})
+    finally:
+        emitter.copilotkit_emit_state = send
+    return sent
+
+async def sessions_after_runs(runs: int):
+    """Sessions the emitter still holds after full onboarding runs, each on its own thread."""
+    for index in range(runs):
+        agent = onboarding_graph.OnboardingAgent()
+        agent.model = FakeOrchestratorModel(latency=0)
+        agent.query_builder.execute = fake_query_execute
+        config = {"recursion_limit": 50, "configurable": {"thread_id": f"bench-run-{index}"}}
+        await agent.graph.ainvoke(agent.initial_state, config)
+    return len(state_emitter.sessions)
+
+async def main(rounds: int = 5):
+    rows = []
+    for diff in (False, True):
+        stats = await replay(diff, rounds)
+        rows.append([
+            "diff" if diff else "snapshot",
+            stats["requested"],
+            stats["coalesced"],
+            stats["skipped"],
+            stats["sent"],
+            f"{stats['bytes_full'] / 1024:.1f} KB",
+            f"{stats['bytes_sent'] / 1024:.1f} KB"
+        ])
+    print(f"Emits of {rounds} rounds of onboarding tool calls")
+    print_table(["mode", "requested", "coalesced", "skipped", "sent", "bytes before", "bytes sent"], rows)
+
+    payloads = await unthreaded_payloads()
+    patches = sum(1 for payload in payloads if "patch" in payload)
+    left = await sessions_after_runs(3)
+    print()
+    print(f"runs without a thread id: {len(payloads)} emits sent, {patches} of them patches")
+    print(f"sessions left after 3 finished runs: {left}")
+    if patches or left:
+        print("FAIL: runs share a diff baseline or keep their sessions")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,146 @@
+"""Event-loop lag while many onboarding sessions build their queries at once.
+
+Runs concurrent fan-out sessions whose query descriptions all need the
+GPT-4 translation, with a ticker on the same loop measuring how late it
+wakes up. With the non-blocking ainvoke every session overlaps; a client
+that blocks the loop (as the synchronous invoke did) stalls every other
+session for the whole call, so every call it makes shows up as a lag of
+at least QUERY_LATENCY. The non-blocking run is repeated and its lags
+pooled; exits non-zero when their p95 reaches half of QUERY_LATENCY, so it
+can gate a change. The worst ticks are no gate: a garbage collection or a
+burst of graph work can hold the loop for as long as a call:
+    python -m benchmarks.bench_event_loop_lag [sessions]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+from langchain_core.messages import AIMessage
+
+from benchmarks.common import FakeOrchestratorModel, print_table
+
+import graph as onboarding_graph
+import query_builder
+from translation_cache import TranslationCache
+
+STEP_COUNT = 2
+QUESTIONS_PER_STEP = 2
+QUERY_LATENCY = 0.2
+TICK = 0.001
+# Non-blocking runs whose lags are pooled, for enough ticks that the p95 is not a few outliers
+ROUNDS = 3
+# p95 lag allowed for the non-blocking run; an LLM call blocking the loop costs QUERY_LATENCY
+MAX_P95_LAG = QUERY_LATENCY / 2
+
+class FakeSOQLModel:
+    """Stands in for the shared GPT-4 client buildQuery translates with."""
+
+    def __init__(self, blocking: bool):
+        """
+        Args:
+            blocking: Sleep on the event loop thread, as a synchronous invoke inside a coroutine does
+        """
+        self.blocking = blocking
+        self.calls = 0
+
+    async def ainvoke(self, prompt):
+        self.calls += 1
+        if self.blocking:
+            time.sleep(QUERY_LATENCY)
+        else:
+            await asyncio.sleep(QUERY_LATENCY)
+        return AIMessage(content="SELECT Id, Name, Type FROM Account WHERE Type = 'Customer'")
+
+async def monitor(lags, stop: asyncio.Event):
+    """Record how much later than scheduled each tick wakes up."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - start - TICK)
+
+def make_agent(index: int):
+    agent = onboarding_graph.OnboardingAgent(fan_out=True, max_llm_calls=QUESTIONS_PER_STEP * STEP_COUNT)
+    agent.model = FakeOrchestratorModel(latency=0.05)
+
+    async def load_step_questions(step_id, workspace_id=None):
+        # Worded per session so neither the synthesizer nor the translation cache answers them
+        return [
+            {"id": f"{step_id}_q{i}", "description": f"Which renewals did tenant {index} escalate in review {step_id} round {i}?", "step": {"id": step_id}}
+            for i in range(QUESTIONS_PER_STEP)
+        ]
+
+    agent._load_step_questions = load_step_questions
+    return agent
+
+async def session(agent):
+    steps = [{"id": f"step_{i + 1}", "order": i + 1} for i in range(STEP_COUNT)]
+    final_state = await agent.graph.ainvoke(
+        {"messages": agent.initial_state.messages, "steps": steps, "current_step": "step_1"},
+        {"recursion_limit": 50}
+    )
+    return final_state["query_results_by_question"]
+
+async def run(sessions: int, blocking: bool):
+    query_builder.cfg.SOQL_LLM = FakeSOQLModel(blocking)
+    # Every run translates from scratch; compiling the graphs is setup, not session work
+    query_builder.translation_cache = TranslationCache(None, query_builder.SALESFORCE_SCHEMA)
+    agents = [make_agent(index) for index in range(sessions)]
+    lags, stop = [], asyncio.Event()
+    ticker = asyncio.create_task(monitor(lags, stop))
+    start = time.perf_counter()
+    results = await asyncio.gather(*(session(agent) for agent in agents))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    failed = sum(1 for by_question in results for result in by_question.values() if "error" in result)
+    return {
+        "calls": query_builder.cfg.SOQL_LLM.calls,
+        "failed": failed,
+        "lags": lags,
+        "elapsed": elapsed,
+    }
+
+def pooled(outcomes):
+    """Calls, failures and lag percentiles of one or more runs together."""
+    lags = sorted(lag for outcome in outcomes for lag in outcome["lags"])
+    return {
+        "calls": sum(outcome["calls"] for outcome in outcomes),
+        "failed": sum(outcome["failed"] for outcome in outcomes),
+        "ticks": len(lags),
+        "p50": statistics.median(lags),
+        "p99": lags[int(len(lags) * 0.99)],
+        "p95": lags[int(len(lags) * 0.95)],
+        "max": lags[-1],
+        "elapsed": statistics.median(outcome["elapsed"] for outcome in outcomes),
+    }
+
+async def main(sessions: int = 20):
+    rows = []
+    outcomes = {}
+    # The blocking run takes sessions x queries x QUERY_LATENCY, so it runs once
+    for blocking, rounds in ((True, 1), (False, ROUNDS)):
+        outcome = outcomes[blocking] = pooled([await run(sessions, blocking) for _ in range(rounds)])
+        rows.append([
+            "blocking invoke" if blocking else f"ainvoke x {rounds}",
+            outcome["calls"],
+            outcome["failed"],
+            outcome["ticks"],
+            f"{outcome['p50'] * 1000:.1f} ms",
+            f"{outcome['p95'] * 1000:.1f} ms",
+            f"{outcome['p99'] * 1000:.1f} ms",
+            f"{outcome['max'] * 1000:.1f} ms",
+            f"{outcome['elapsed']:.2f} s",
+        ])
+    print(f"{sessions} sessions x {STEP_COUNT * QUESTIONS_PER_STEP} queries, simulated GPT-4 latency {QUERY_LATENCY * 1000:.0f} ms")
+    print_table(["client", "gpt-4 calls", "failed", "ticks", "lag p50", "lag p95", "lag p99", "lag max", "wall time"], rows)
+
+    outcome = outcomes[False]
+    if outcome["failed"] or outcome["p95"] >= MAX_P95_LAG:
+        print(f"FAIL: p95 event-loop lag {outcome['p95'] * 1000:.1f} ms (bound {MAX_P95_LAG * 1000:.0f} ms), {outcome['failed']} failed queries")
+        return 1
+    print(f"OK: p95 event-loop lag {outcome['p95'] * 1000:.1f} ms within {MAX_P95_LAG * 1000:.0f} ms")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)))
@@ -0,0 +1,81 @@
+"""Prepare a whole onboarding workspace sequentially versus with fan-out.
+
+Sequentially, every step and every question costs one orchestrator round
+trip. In fan-out mode the questions of all steps load in parallel branches,
+then all queries build in parallel with a bounded number of LLM calls:
+    python -m benchmarks.bench_fanout
+"""
+import asyncio
+import time
+
+from benchmarks.common import FakeOrchestratorModel, print_table
+
+import graph as onboarding_graph
+
+STEP_COUNT = 5
+QUESTIONS_PER_STEP = 4
+LOAD_LATENCY = 0.01
+ORCHESTRATOR_LATENCY = 0.3
+QUERY_LATENCY = 0.5
+
+def make_agent(fan_out: bool, max_llm_calls: int):
+    agent = onboarding_graph.OnboardingAgent(fan_out=fan_out, max_llm_calls=max_llm_calls)
+    agent.model = FakeOrchestratorModel(latency=ORCHESTRATOR_LATENCY)
+    in_flight = {"now": 0, "max": 0}
+
+    async def load_step_questions(step_id, workspace_id=None):
+        await asyncio.sleep(LOAD_LATENCY)
+        return [
+            {"id": f"{step_id}_q{i}", "description": f"Question {i} of {step_id}", "step": {"id": step_id}}
+            for i in range(QUESTIONS_PER_STEP)
+        ]
+
+    async def execute(query_description, state=None):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(QUERY_LATENCY)
+        in_flight["now"] -= 1
+        return state, {"query": f"-- {query_description}", "results": [{"Id": "001"}]}
+
+    agent._load_step_questions = load_step_questions
+    agent.query_builder.execute = execute
+    return agent, in_flight
+
+async def sequential_workspace():
+    """One orchestrator round trip per step and per question."""
+    agent, in_flight = make_agent(fan_out=False, max_llm_calls=1)
+    start = time.perf_counter()
+    for step_index in range(STEP_COUNT):
+        await agent.model.ainvoke([])
+        questions = await agent._load_step_questions(f"step_{step_index + 1}")
+        for question in questions:
+            await agent.model.ainvoke([])
+            await agent.query_builder.execute(question["description"])
+    return time.perf_counter() - start, agent.model.calls, in_flight["max"]
+
+async def fanout_workspace(max_llm_calls: int):
+    agent, in_flight = make_agent(fan_out=True, max_llm_calls=max_llm_calls)
+    steps = [{"id": f"step_{i + 1}", "order": i + 1} for i in range(STEP_COUNT)]
+    start = time.perf_counter()
+    final_state = await agent.graph.ainvoke(
+        {"messages": agent.initial_state.messages, "steps": steps, "current_step": "step_1"},
+        {"recursion_limit": 50}
+    )
+    elapsed = time.perf_counter() - start
+    assert len(final_state["query_results_by_question"]) == STEP_COUNT * QUESTIONS_PER_STEP
+    return elapsed, agent.model.calls, in_flight["max"]
+
+async def main():
+    rows = []
+    elapsed, calls, peak = await sequential_workspace()
+    rows.append(["sequential", "-", calls, peak, f"{elapsed * 1000:.0f} ms"])
+    for max_llm_calls in (2, 4, 8):
+        elapsed, calls, peak = await fanout_workspace(max_llm_calls)
+        rows.append(["fan-out", max_llm_calls, calls, peak, f"{elapsed * 1000:.0f} ms"])
+
+    print(f"{STEP_COUNT} steps x {QUESTIONS_PER_STEP} questions, "
+          f"orchestrator {ORCHESTRATOR_LATENCY * 1000:.0f} ms, query LLM {QUERY_LATENCY * 1000:.0f} ms")
+    print_table(["mode", "llm bound", "orchestrator calls", "peak in-flight", "wall time"], rows)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""Orchestrator round trips for a multi-intent turn, one tool per response versus all at once.
+
+"Show me the steps and the questions" needs getSteps and getQuestions. With
+one tool call per LLM response that is a round trip per tool; with parallel
+tool calls both run after a single response. Either way the LLM reads the
+results in one more round trip; that is measured with LLM-only routing
+and with the default fast path, which must not skip it:
+    python -m benchmarks.bench_parallel_tools
+"""
+import asyncio
+import time
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.common import FakeOrchestratorModel, fake_query_execute, print_table
+
+import graph as onboarding_graph
+
+TOOL_CALLS = [
+    {"name": "getSteps", "args": {}, "id": "call_steps"},
+    {"name": "getQuestions", "args": {}, "id": "call_questions"},
+    {"name": "getStepById", "args": {"stepId": "step_1"}, "id": "call_step_1"},
+]
+
+async def run_turn(parallel: bool, fast_path: bool, latency: float):
+    agent = onboarding_graph.OnboardingAgent(fast_path=fast_path)
+    # One response carrying every call, or one response per call as with parallel_tool_calls=False
+    responses = [TOOL_CALLS] if parallel else [[tool_call] for tool_call in TOOL_CALLS]
+    agent.model = FakeOrchestratorModel(latency=latency, tool_calls=responses)
+    agent.query_builder.execute = fake_query_execute
+
+    turn = agent.initial_state.model_copy(update={
+        "messages": [HumanMessage(content="Show me the steps, the questions and the first step's details")],
+        # Nothing left for the fixed sequence once the tools have answered
+        "query_results": {"query": "", "results": []}
+    })
+    start = time.perf_counter()
+    final_state = await agent.graph.ainvoke(turn, {"recursion_limit": 50})
+    elapsed = time.perf_counter() - start
+
+    summary = agent.get_metrics()
+    tool_ms = {
+        name.split(".", 1)[1]: f"{timing['mean_ms']:.1f}"
+        for name, timing in summary["timings"].items()
+        if name.startswith("tool.")
+    }
+    tool_messages = sum(1 for message in final_state["messages"] if message.type == "tool")
+    return [
+        "parallel" if parallel else "one per response",
+        "on" if fast_path else "off",
+        agent.model.calls,
+        tool_messages,
+        len(final_state["steps"]),
+        len(final_state["questions"]),
+        ", ".join(f"{name} {ms} ms" for name, ms in sorted(tool_ms.items())),
+        f"{elapsed * 1000:.0f} ms"
+    ]
+
+async def main(latency: float = 0.5):
+    rows = [
+        await run_turn(parallel, fast_path, latency)
+        for fast_path in (False, True)
+        for parallel in (False, True)
+    ]
+    print(f"Multi-intent turn, simulated GPT-4 latency {latency * 1000:.0f} ms")
+    print_table(["tool calls", "fast path", "gpt-4 calls", "tool messages", "steps", "questions", "mean tool latency", "wall time"], rows)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+"""Speculative prefetching of steps and questions during the orchestrator's LLM call.
+
+Runs the onboarding flow with and without prefetching, with a simulated
+latency on the data tools, and reports how many prefetches were used or
+wasted. With LLM routing every hop can prefetch; with the default fast
+path only hops the LLM decides do, here an open-ended first user turn.
+Exits non-zero when a prefetch fails:
+    python -m benchmarks.bench_prefetch
+"""
+import asyncio
+import sys
+import time
+
+from langchain_core.messages import HumanMessage
+
+from benchmarks.common import FakeOrchestratorModel, fake_query_execute, print_table
+
+import graph as onboarding_graph
+
+class SlowTool:
+    """Delegates to a tool after a fixed delay, standing in for a remote data source."""
+
+    def __init__(self, tool, latency: float):
+        self.tool = tool
+        self.latency = latency
+
+    async def ainvoke(self, tool_input, config=None):
+        await asyncio.sleep(self.latency)
+        return await self.tool.ainvoke(tool_input, config)
+
+async def run_onboarding(prefetch: bool, fast_path: bool, llm_latency: float, data_latency: float):
+    agent = onboarding_graph.OnboardingAgent(fast_path=fast_path)
+    agent.model = FakeOrchestratorModel(latency=llm_latency)
+    agent.query_builder.execute = fake_query_execute
+    if not prefetch:
+        agent._launch_prefetches = lambda state, config: None
+
+    # The nodes look the tools up on the graph module, after the agent has bound them
+    real_tools = onboarding_graph.getSteps, onboarding_graph.getQuestionsByStep
+    onboarding_graph.getSteps = SlowTool(real_tools[0], data_latency)
+    onboarding_graph.getQuestionsByStep = SlowTool(real_tools[1], data_latency)
+    try:
+        start = time.perf_counter()
+        turn = agent.initial_state.model_copy(update={
+            "messages": [HumanMessage(content="What will I need to prepare for this onboarding?")]
+        })
+        await agent.graph.ainvoke(turn, {"recursion_limit": 50})
+        elapsed = time.perf_counter() - start
+    finally:
+        onboarding_graph.getSteps, onboarding_graph.getQuestionsByStep = real_tools
+
+    counters = agent.get_metrics()["counters"]
+    return [
+        "fast path" if fast_path else "llm",
+        "on" if prefetch else "off",
+        counters.get("prefetch.launched", 0),
+        counters.get("prefetch.used", 0),
+        counters.get("prefetch.wasted", 0),
+        counters.get("prefetch.failed", 0),
+        f"{elapsed * 1000:.0f} ms"
+    ]
+
+async def main(llm_latency: float = 0.5, data_latency: float = 0.2):
+    rows = [
+        await run_onboarding(prefetch, fast_path, llm_latency, data_latency)
+        for fast_path in (False, True)
+        for prefetch in (False, True)
+    ]
+
+    print(f"Onboarding run, LLM latency {llm_latency * 1000:.0f} ms, data latency {data_latency * 1000:.0f} ms")
+    print_table(["routing", "prefetch", "launched", "used", "wasted", "failed", "wall time"], rows)
+    if any(row[5] for row in rows):
+        print("FAIL: prefetches failed")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,84 @@
+"""Paged query results against returning every record at once.
+
+Runs queries of growing result size over synthetic tables and compares
+building the whole result list (what getQueryData used to put into state)
+with opening a cursor for the first page, and with streaming every page
+through the cursor. Reports time to the first records, the size of the
+largest message the UI receives, and what the open cursor holds:
+    python -m benchmarks.bench_query_pages [rows] [page_size]
+"""
+import asyncio
+import json
+import sys
+import time
+
+from benchmarks.bench_soql_engine import timed
+from benchmarks.common import print_table
+
+from dataset import synthetic_database
+from soql import parse
+from soql.cursors import CursorStore
+
+QUERIES = [
+    "SELECT Id, Name, Amount FROM Opportunity WHERE Amount >= 495000",
+    "SELECT Id, Name, StageName FROM Opportunity WHERE StageName = 'Closed Won'",
+    "SELECT Id, Name, Amount, CloseDate, StageName FROM Opportunity WHERE IsClosed = false ORDER BY CloseDate",
+    "SELECT Id, Name, Industry, BillingState FROM Account",
+]
+
+def size(payload) -> int:
+    return len(json.dumps(payload, separators=(",", ":")).encode())
+
+async def stream(store: CursorStore, query, page_size: int):
+    """Read every page; returns (records, largest page in bytes, longest gap between pages)."""
+    records, largest, longest = 0, 0, 0.0
+    last = time.perf_counter()
+    async for page in store.pages(query, page_size):
+        now = time.perf_counter()
+        longest = max(longest, now - last)
+        records += len(page["results"])
+        largest = max(largest, size(page))
+        last = time.perf_counter()
+    return records, largest, longest
+
+def main(rows: int = 1_000_000, page_size: int = 200):
+    database = synthetic_database(rows)
+    store = CursorStore(database, page_size=page_size)
+    print(f"{rows:,} rows per object, {page_size} records per page")
+
+    results = []
+    for soql in QUERIES:
+        query = parse(soql)
+        all_seconds, records = timed(lambda: database.execute(query))
+        first_seconds, page = timed(lambda: store.open(query))
+        held = store.get_metrics()["bytes_held"]
+        start = time.perf_counter()
+        streamed, largest, longest = asyncio.run(stream(store, query, page_size))
+        stream_seconds = time.perf_counter() - start
+        store.cursors.clear()
+        results.append([
+            soql[:56] + ("..." if len(soql) > 56 else ""),
+            f"{len(records):,}",
+            f"{all_seconds * 1000:,.1f}",
+            f"{first_seconds * 1000:,.1f}",
+            f"{stream_seconds * 1000:,.0f}",
+            f"{longest * 1000:,.2f}",
+            f"{size(records) / 1e6:,.1f}",
+            f"{largest / 1e3:,.1f}",
+            f"{held / 1e6:,.2f}",
+            "yes" if streamed == len(records) and page["totalSize"] == len(records) else "NO",
+        ])
+    # "all" builds every record, as getQueryData did; "first page" is what it returns now
+    print_table(
+        [
+            "query", "records", "all ms", "first page ms", "stream all ms", "max gap ms",
+            "all MB", "max page KB", "cursor MB", "complete"
+        ],
+        results
+    )
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    )
@@ -0,0 +1,101 @@
+"""Query result cache: preview opens served without running the query again.
+
+Replays onboarding users opening the same question previews over and over,
+each open written a little differently (field order, spacing, keyword
+case), against synthetic tables with a simulated CRM round trip per query
+run. Every WRITE_EVERY opens an UPDATE touches Opportunity, which must
+invalidate only the previews reading it:
+    python -m benchmarks.bench_result_cache [rows] [opens]
+"""
+import random
+import sys
+import time
+
+from benchmarks.common import print_table
+
+from dataset import synthetic_database
+from soql import parse
+from soql.cursors import CursorStore
+from soql.result_cache import ResultCache
+
+# What one query costs against the CRM API instead of the local engine
+CRM_LATENCY = 0.05
+WRITE_EVERY = 100
+
+# Each preview as different users' generated queries spell it
+PREVIEWS = [
+    [
+        "SELECT Id, Name, StageName FROM Opportunity WHERE StageName = 'Closed Won'",
+        "SELECT Name, Id, StageName FROM Opportunity WHERE StageName = 'Closed Won'",
+        "select   Id, StageName, Name from Opportunity where StageName = 'Closed Won'",
+    ],
+    [
+        "SELECT Id, Name, Industry FROM Account WHERE Industry = 'Energy' AND BillingState = 'TX'",
+        "SELECT Id, Industry, Name FROM Account WHERE BillingState = 'TX' AND Industry = 'Energy'",
+    ],
+    [
+        "SELECT StageName, SUM(Amount) FROM Opportunity GROUP BY StageName",
+        "select StageName, sum(Amount) from Opportunity group by StageName",
+    ],
+    [
+        "SELECT Id, Name FROM Account WHERE Type = 'Customer' ORDER BY Name LIMIT 50",
+        "SELECT Name, Id FROM Account WHERE Type = 'Customer' ORDER BY Name LIMIT 50",
+    ],
+]
+
+class CRMDatabase:
+    """The engine behind a simulated API round trip, counting the queries it runs."""
+
+    def __init__(self, database):
+        self.database = database
+        self.runs = 0
+
+    def _round_trip(self):
+        self.runs += 1
+        time.sleep(CRM_LATENCY)
+
+    def execute(self, query):
+        self._round_trip()
+        return self.database.execute(query)
+
+    def select(self, query):
+        self._round_trip()
+        return self.database.select(query)
+
+    def records(self, table, fields, rows):
+        return self.database.records(table, fields, rows)
+
+def replay(store: CursorStore, crm: CRMDatabase, opens: int, seed: int = 7):
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for position in range(opens):
+        if store.results and position and position % WRITE_EVERY == 0:
+            store.results.invalidate("Opportunity")
+        page = store.open(parse(rng.choice(rng.choice(PREVIEWS))))
+        if page["nextCursor"]:
+            store.close(page["nextCursor"])
+    return time.perf_counter() - start
+
+def main(rows: int = 100_000, opens: int = 500):
+    database = synthetic_database(rows)
+    table = []
+    for cached in (False, True):
+        crm = CRMDatabase(database)
+        store = CursorStore(crm, results=ResultCache() if cached else None)
+        seconds = replay(store, crm, opens)
+        metrics = store.results.get_metrics() if cached else {}
+        table.append([
+            "result cache" if cached else "no cache",
+            opens,
+            crm.runs,
+            f"{metrics['hit_rate']:.0%}" if cached else "-",
+            metrics.get("invalidated", "-"),
+            f"{seconds / opens * 1000:.2f}",
+            f"{seconds:.2f} s",
+        ])
+    print(f"{rows:,} rows per object, {sum(map(len, PREVIEWS))} spellings of {len(PREVIEWS)} previews, "
+          f"{CRM_LATENCY * 1000:.0f} ms per CRM query, an Opportunity write every {WRITE_EVERY} opens")
+    print_table(["mode", "opens", "queries run", "hit rate", "invalidated", "ms per open", "wall time"], table)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,81 @@
+"""End-to-end onboarding run with and without deterministic fast-path routing.
+
+Counts the orchestrator's GPT-4 calls for a full run, then checks that a
+user question the LLM answers with tools gets its answer: the LLM has to
+read the tool results before the fixed sequence takes over again. Exits
+non-zero when it does not:
+    python -m benchmarks.bench_routing
+"""
+import asyncio
+import sys
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from benchmarks.common import FakeOrchestratorModel, fake_query_execute, print_table
+
+import graph as onboarding_graph
+
+async def run_onboarding(fast_path: bool, latency: float):
+    agent = onboarding_graph.OnboardingAgent(fast_path=fast_path)
+    agent.model = FakeOrchestratorModel(latency=latency)
+    agent.query_builder.execute = fake_query_execute
+
+    start = time.perf_counter()
+    final_state = await agent.graph.ainvoke(agent.initial_state, {"recursion_limit": 50})
+    elapsed = time.perf_counter() - start
+
+    counters = agent.get_metrics()["counters"]
+    return [
+        "on" if fast_path else "off",
+        agent.model.calls,
+        counters.get("routing.rule", 0),
+        counters.get("routing.llm", 0),
+        "yes" if final_state.get("query_results") else "no",
+        f"{elapsed * 1000:.0f} ms"
+    ]
+
+QUESTION = "Tell me what step 2 is about and its questions"
+QUESTION_TOOL_CALLS = [
+    {"name": "getStepById", "args": {"stepId": "step_2"}, "id": "call_step"},
+    {"name": "getQuestionsByStep", "args": {"stepId": "step_2"}, "id": "call_questions"},
+]
+
+async def answer_question(fast_path: bool, latency: float):
+    """Whether the LLM answers a question it needed tools for, after reading their results."""
+    agent = onboarding_graph.OnboardingAgent(fast_path=fast_path)
+    agent.model = FakeOrchestratorModel(latency=latency, tool_calls=[QUESTION_TOOL_CALLS])
+    agent.query_builder.execute = fake_query_execute
+
+    turn = agent.initial_state.model_copy(update={"messages": [HumanMessage(content=QUESTION)]})
+    final_state = await agent.graph.ainvoke(turn, {"recursion_limit": 50})
+
+    messages = final_state["messages"]
+    last_tool = max(i for i, message in enumerate(messages) if isinstance(message, ToolMessage))
+    answered = any(
+        isinstance(message, AIMessage) and not message.tool_calls
+        for message in messages[last_tool + 1:]
+    )
+    return answered, [
+        "on" if fast_path else "off",
+        agent.model.calls,
+        " ".join(type(message).__name__.replace("Message", "") for message in messages),
+        "yes" if answered else "no"
+    ]
+
+async def main(latency: float = 0.5):
+    rows = [await run_onboarding(fast_path, latency) for fast_path in (False, True)]
+    print(f"Full onboarding run, simulated GPT-4 latency {latency * 1000:.0f} ms")
+    print_table(["fast path", "gpt-4 calls", "rule hops", "llm hops", "query results", "wall time"], rows)
+
+    outcomes = [await answer_question(fast_path, latency) for fast_path in (False, True)]
+    print()
+    print(f'"{QUESTION}", answered with {len(QUESTION_TOOL_CALLS)} tool calls')
+    print_table(["fast path", "gpt-4 calls", "messages", "answered"], [row for _, row in outcomes])
+    if not all(answered for answered, _ in outcomes):
+        print("FAIL: the LLM did not get to answer after its tool calls")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
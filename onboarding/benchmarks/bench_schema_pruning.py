@@ -0,0 +1,107 @@
+"""Query-generation prompt size with and without schema pruning.
+
+Builds buildQuery's GPT-4 prompt for the onboarding descriptions against
+the onboarding schema and against a customer-sized one (the same objects
+plus a few hundred custom objects), with the whole schema and with the
+part SchemaRegistry finds relevant. Reports prompt tokens, the registry
+lookup time, the prompt-processing time those tokens cost at a given
+prefill rate, and whether the pruned schema still holds every object and
+field of the query an analyst wrote for the description:
+    python -m benchmarks.bench_schema_pruning [custom_objects]
+"""
+import random
+import sys
+import time
+
+import tiktoken
+
+from benchmarks.bench_synthesis import CORPUS
+from benchmarks.common import print_table
+
+from query_builder import SALESFORCE_SCHEMA, generation_prompt
+from schema_registry import SchemaRegistry
+from soql import parse
+
+# GPT-4 prompt processing, in milliseconds per 1,000 prompt tokens
+PREFILL_MS_PER_1K = 150
+
+# Descriptions that need more than the onboarding corpus: joins and custom objects
+EXTRA = [
+    ("accounts with closed won opportunities and their contacts", None),
+    ("invoices over 10000 for customer accounts", None),
+    ("open support cases by account", None),
+]
+
+NOUNS = [
+    "Invoice", "Case", "Contract", "Asset", "Order", "Quote", "Campaign", "Lead", "Product", "Shipment",
+    "Subscription", "Renewal", "Entitlement", "Territory", "Forecast", "Payment", "Refund", "Survey",
+    "Ticket", "Project", "Milestone", "Task", "Event", "Partner", "Vendor", "License", "Warranty",
+]
+QUALIFIERS = ["", "Regional", "Partner", "Legacy", "Enterprise", "Service", "Billing", "Field", "Channel", "Global", "Internal"]
+FIELD_WORDS = [
+    "Status", "Amount", "Region", "Priority", "Category", "Source", "Owner", "Due", "Start", "End", "Total",
+    "Discount", "Tier", "Score", "Rating", "Channel", "Currency", "Quantity", "Reason", "Code", "Notes", "Stage",
+]
+
+def large_schema(custom_objects: int, fields: int = 40, seed: int = 7):
+    """The onboarding schema plus ``custom_objects`` custom objects of ``fields`` fields each."""
+    rng = random.Random(seed)
+    schema = dict(SALESFORCE_SCHEMA)
+    names = [f"{qualifier}{noun}" for qualifier in QUALIFIERS for noun in NOUNS]
+    for name in names[:custom_objects]:
+        words = rng.sample(FIELD_WORDS, 6)
+        standard = ["Id", "Name", "OwnerId", "CreatedDate", "AccountId"]
+        custom = [f"{a}{b}__c" for a in words for b in FIELD_WORDS if a != b][:fields - len(standard)]
+        schema[f"{name}__c"] = {"standard_fields": standard + custom}
+    return schema
+
+def covered(expected_soql: str, schema) -> bool:
+    """Whether the schema has the object and every field of the expected query."""
+    query = parse(expected_soql)
+    fields = set(schema.get(query.object_name, {}).get("standard_fields", []))
+    return query.object_name in schema and all(field in fields for field in query.fields)
+
+def token_counter():
+    """GPT-4's tokenizer, or about four characters per token when its encoding cannot be downloaded."""
+    try:
+        encoding = tiktoken.encoding_for_model("gpt-4")
+        return "cl100k_base", lambda text: len(encoding.encode(text))
+    except Exception:
+        return "~4 characters per token (tokenizer unavailable offline)", lambda text: round(len(text) / 4)
+
+def main(custom_objects: int = 297):
+    tokenizer, count_tokens = token_counter()
+    corpus = [*CORPUS, *EXTRA]
+    rows = []
+    for label, schema in [("onboarding", SALESFORCE_SCHEMA), (f"+{custom_objects} custom objects", large_schema(custom_objects))]:
+        registry = SchemaRegistry(schema)
+        for pruning in (False, True):
+            tokens = lookup_seconds = 0
+            kept = total = 0
+            for description, expected in corpus:
+                start = time.perf_counter()
+                relevant = registry.relevant(description) if pruning else schema
+                lookup_seconds += time.perf_counter() - start
+                prompt = generation_prompt(description, relevant)
+                tokens += sum(count_tokens(message["content"]) for message in prompt)
+                if expected:
+                    total += 1
+                    kept += covered(expected, relevant)
+            average = tokens / len(corpus)
+            rows.append([
+                label,
+                len(schema),
+                "on" if pruning else "off",
+                f"{average:,.0f}",
+                f"{lookup_seconds / len(corpus) * 1e6:,.0f}",
+                f"{average / 1000 * PREFILL_MS_PER_1K:,.0f}",
+                f"{kept}/{total}",
+            ])
+    print(f"{len(corpus)} descriptions; tokens counted with {tokenizer}; prompt processing at {PREFILL_MS_PER_1K} ms per 1k tokens")
+    print_table(
+        ["schema", "objects", "pruning", "prompt tokens", "lookup us", "prefill ms", "expected query covered"],
+        rows
+    )
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 297)
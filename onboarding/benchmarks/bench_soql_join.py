@@ -0,0 +1,116 @@
+"""Hash semi-joins and parent fields in the local SOQL engine.
+
+Runs the onboarding flow's canonical question ("accounts with a Closed Won
+opportunity in the last 365 days") and parent-field lookups over synthetic
+tables of growing size, with AccountId sharing Account.Id's dictionary and
+with a separate one (values must then be translated through the smaller
+side's distinct keys). Compares with the same joins written as Python
+dict/set joins over lists of records:
+    python -m benchmarks.bench_soql_join [rows ...]
+"""
+import sys
+
+import numpy as np
+
+from benchmarks.bench_soql_engine import records, timed
+from benchmarks.common import print_table
+
+from dataset import TODAY, synthetic_database
+from soql import parse
+
+LAST_365 = str(np.datetime64(TODAY) - 365)
+
+def won_accounts(rows):
+    won = {
+        r["AccountId"] for r in rows["Opportunity"]
+        if r["StageName"] == "Closed Won" and LAST_365 <= r["CloseDate"] <= str(TODAY)
+    }
+    return [{"Id": r["Id"], "Name": r["Name"]} for r in rows["Account"] if r["Id"] in won]
+
+def big_deal_accounts(rows):
+    big = {r["AccountId"] for r in rows["Opportunity"] if r["Amount"] >= 499000 and r["StageName"] == "Closed Won"}
+    return [{"Id": r["Id"], "Industry": r["Industry"]} for r in rows["Account"] if r["Id"] in big]
+
+def open_partner_accounts(rows):
+    partners = {r["Id"]: r["Name"] for r in rows["Account"] if r["Type"] == "Partner" and r["Industry"] == "Energy"}
+    open_ids = {r["AccountId"] for r in rows["Opportunity"] if r["IsClosed"] is False and r["AccountId"] in partners}
+    return [{"Id": id_, "Name": name} for id_, name in partners.items() if id_ in open_ids]
+
+def big_deal_owners(rows):
+    accounts = {r["Id"]: r["Name"] for r in rows["Account"]}
+    users = {r["Id"]: r["Name"] for r in rows["User"]}
+    return sorted(
+        (
+            {
+                "Id": r["Id"],
+                "Amount": r["Amount"],
+                "Account.Name": accounts.get(r["AccountId"]),
+                "CreatedBy.Name": users.get(r["CreatedById"]),
+            }
+            for r in rows["Opportunity"] if r["Amount"] >= 499000 and r["StageName"] == "Closed Won"
+        ),
+        key=lambda r: r["Id"]
+    )
+
+# (label, SOQL, equivalent dict join)
+QUERIES = [
+    (
+        "semi-join, wide inner",
+        "SELECT Id, Name FROM Account WHERE Id IN "
+        "(SELECT AccountId FROM Opportunity WHERE StageName = 'Closed Won' AND CloseDate = LAST_N_DAYS:365)",
+        won_accounts,
+    ),
+    (
+        "semi-join, narrow inner",
+        "SELECT Id, Industry FROM Account WHERE Id IN "
+        "(SELECT AccountId FROM Opportunity WHERE Amount >= 499000 AND StageName = 'Closed Won')",
+        big_deal_accounts,
+    ),
+    (
+        "semi-join, narrow outer",
+        "SELECT Id, Name FROM Account WHERE Type = 'Partner' AND Industry = 'Energy' AND Id IN "
+        "(SELECT AccountId FROM Opportunity WHERE IsClosed = false)",
+        open_partner_accounts,
+    ),
+    (
+        "parent fields",
+        "SELECT Id, Amount, Account.Name, CreatedBy.Name FROM Opportunity "
+        "WHERE Amount >= 499000 AND StageName = 'Closed Won' ORDER BY Id",
+        big_deal_owners,
+    ),
+]
+
+def main(sizes=(10_000, 100_000, 1_000_000)):
+    results = []
+    for rows in sizes:
+        for shared_keys in (True, False):
+            database = synthetic_database(rows, shared_keys=shared_keys)
+            row_tables = {name: records(table) for name, table in database.tables.items()}
+            for label, soql, join in QUERIES:
+                query = parse(soql)
+                database.joins.clear()
+                database.execute(query)
+                built = ", ".join(sorted(database.joins))
+                engine_seconds, engine_rows = timed(lambda: database.execute(query))
+                join_seconds, join_rows = timed(lambda: join(row_tables), repeat=1)
+                results.append([
+                    f"{rows:,}",
+                    "shared" if shared_keys else "separate",
+                    label,
+                    len(engine_rows),
+                    built,
+                    f"{join_seconds * 1000:,.1f}",
+                    f"{engine_seconds * 1000:,.1f}",
+                    f"{join_seconds / engine_seconds:,.1f}x",
+                    "yes" if engine_rows == join_rows else "NO",
+                ])
+    print_table(
+        ["rows", "key dictionary", "query", "result", "joins", "dict join ms", "engine ms", "speedup", "same rows"],
+        results
+    )
+
+    print()
+    print(synthetic_database(sizes[0]).explain(QUERIES[0][1]))
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (10_000, 100_000, 1_000_000))
@@ -0,0 +1,66 @@
+"""SOQL parse and validation throughput.
+
+Parses and validates a mix of onboarding queries, including LLM-style
+output wrapped in markdown fences, and reports queries per second for each
+stage plus the errors found in a set of malformed outputs:
+    python -m benchmarks.bench_soql_parse
+"""
+import time
+
+from benchmarks.common import print_table
+
+from query_builder import SALESFORCE_SCHEMA
+from soql import SOQLError, check, extract_soql, parse, validate
+
+QUERIES = [
+    "SELECT Id, Name FROM Account WHERE Type = 'Customer'",
+    "SELECT Id, Name, Amount, CloseDate FROM Opportunity WHERE IsClosed = false ORDER BY CloseDate ASC LIMIT 50",
+    "SELECT Id, Name, Email, Title FROM Contact WHERE Title IN ('CEO', 'CTO', 'CFO') AND Email LIKE '%@acme.com'",
+    "SELECT Id, Name, Industry, BillingCity, BillingState FROM Account WHERE Id IN "
+    "(SELECT AccountId FROM Opportunity WHERE StageName = 'Closed Won' AND CloseDate = LAST_N_DAYS:365)",
+    "SELECT StageName, SUM(Amount) total, COUNT(Id) deals FROM Opportunity GROUP BY StageName ORDER BY total DESC",
+    "```sql\nSELECT Id, Name, CreatedBy.Name FROM Opportunity WHERE (Amount > 50000 OR StageName = 'Negotiation') "
+    "AND NOT IsClosed = true ORDER BY Amount DESC NULLS LAST LIMIT 10 OFFSET 20;\n```",
+]
+
+MALFORMED = [
+    "SELECT Id, Name FROM Acount WHERE Type = 'Customer'",
+    "SELECT Id, Nmae, Industy FROM Account",
+    "SELECT Id FROM Opportunity WHERE StageName = Closed Won",
+    "SELECT Id, Name FROM Contact WHERE",
+    "Sure! Here is the query: SELECT Id FROM Contact LIMIT 5. Let me know if you need more.",
+]
+
+def throughput(stage, inputs, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for value in inputs:
+            stage(value)
+    return iterations * len(inputs) / (time.perf_counter() - start)
+
+def main(iterations: int = 2000):
+    texts = [extract_soql(query) for query in QUERIES]
+    parsed = [parse(text) for text in texts]
+
+    rows = [
+        ["extract", f"{throughput(extract_soql, QUERIES, iterations):,.0f}"],
+        ["parse", f"{throughput(parse, texts, iterations):,.0f}"],
+        ["validate", f"{throughput(lambda q: validate(q, SALESFORCE_SCHEMA), parsed, iterations):,.0f}"],
+        ["check (all three)", f"{throughput(lambda q: check(q, SALESFORCE_SCHEMA), QUERIES, iterations):,.0f}"],
+    ]
+    print(f"{len(QUERIES)} queries x {iterations} iterations")
+    print_table(["stage", "queries/s"], rows)
+
+    print()
+    rows = []
+    for text in MALFORMED:
+        try:
+            check(text, SALESFORCE_SCHEMA)
+            rows.append([text[:48], "-", "accepted"])
+        except SOQLError as e:
+            for error in e.errors:
+                rows.append([text[:48], error["kind"], error["message"] + (f" ({error['suggestion']})" if error["suggestion"] else "")])
+    print_table(["malformed output", "kind", "error fed to the repair prompt"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Coverage and latency of template SOQL synthesis on onboarding query descriptions.
+
+Runs a corpus of descriptions collected from onboarding sessions through
+SOQLSynthesizer at several confidence thresholds. Coverage is the share
+answered without the LLM; accuracy compares those answers with the query
+an analyst wrote for the description. Exits non-zero when the default
+threshold answers a description with the wrong query, since that query runs
+instead of GPT-4's:
+    python -m benchmarks.bench_synthesis
+"""
+import sys
+import time
+
+from benchmarks.common import print_table
+
+from query_builder import SALESFORCE_SCHEMA
+from soql_synth import SOQLSynthesizer
+from tools.questions import catalog
+
+# (description, expected SOQL or None when only the LLM can answer it)
+CORPUS = [
+    ("show closed won opportunities", "SELECT Id, Name FROM Opportunity WHERE StageName = 'Closed Won'"),
+    ("Show me all open opportunities", "SELECT Id, Name FROM Opportunity WHERE IsClosed = false"),
+    ("closed lost deals", "SELECT Id, Name FROM Opportunity WHERE StageName = 'Closed Lost'"),
+    ("Open opportunities with amount and close date", "SELECT Id, Name, Amount, CloseDate FROM Opportunity WHERE IsClosed = false"),
+    ("opportunities with amount over 50000", "SELECT Id, Name, Amount FROM Opportunity WHERE Amount > 50000"),
+    ("Closed won opportunities with amount", "SELECT Id, Name, Amount FROM Opportunity WHERE StageName = 'Closed Won'"),
+    ("opportunities where StageName is Prospecting", "SELECT Id, Name, StageName FROM Opportunity WHERE StageName = 'Prospecting'"),
+    ("List accounts where Type is Customer", "SELECT Id, Name, Type FROM Account WHERE Type = 'Customer'"),
+    ("accounts where industry is Technology", "SELECT Id, Name, Industry FROM Account WHERE Industry = 'Technology'"),
+    ("accounts where billing state is CA", "SELECT Id, Name, BillingState FROM Account WHERE BillingState = 'CA'"),
+    ("customer accounts with phone and website", "SELECT Id, Name, Phone, Website FROM Account"),
+    ("all accounts", "SELECT Id, Name FROM Account"),
+    ("contacts with email and title", "SELECT Id, Name, Email, Title FROM Contact"),
+    ("contacts where Department is Executive", "SELECT Id, Name, Department FROM Contact WHERE Department = 'Executive'"),
+    ("contacts where title is CEO", "SELECT Id, Name, Title FROM Contact WHERE Title = 'CEO'"),
+    ("Show contacts and their account id", "SELECT Id, Name, AccountId FROM Contact"),
+    ("accounts whose billing city is San Francisco", "SELECT Id, Name, BillingCity FROM Account WHERE BillingCity = 'San Francisco'"),
+    ("contacts whose title is not VP Sales", "SELECT Id, Name, Title FROM Contact WHERE Title != 'VP Sales'"),
+    ("accounts whose type is Customer - Direct", "SELECT Id, Name, Type FROM Account WHERE Type = 'Customer - Direct'"),
+    ("accounts where name is Acme Corp", "SELECT Id, Name FROM Account WHERE Name = 'Acme Corp'"),
+    ("opportunities where StageName is Closed Won", "SELECT Id, Name, StageName FROM Opportunity WHERE StageName = 'Closed Won'"),
+    # Negations, orderings, limits and conditions the templates cannot express
+    ("opportunities not closed won", None),
+    ("open opportunities with amount sorted by close date", None),
+    ("accounts where name is 'Acme' corp", None),
+    ("opportunities with amount over 50000 dollars", None),
+    ("opportunities where StageName is Closed Won in 2024", None),
+    ("first 20 contacts with email", None),
+    ("accounts in California", None),
+    ("Who are the decision makers at Acme?", None),
+    ("Which opportunities are stuck in negotiation for more than 90 days?", None),
+    ("contacts who influence purchases above 100k", None),
+    ("top 10 accounts by revenue this year", None),
+    *((question["description"], None) for question in catalog.questions()),
+]
+
+def main(thresholds=(0.5, 0.75, 0.9), llm_latency_ms: float = 1500, gate_threshold: float = 0.75):
+    rows = []
+    wrong = []
+    for threshold in thresholds:
+        synthesizer = SOQLSynthesizer(SALESFORCE_SCHEMA, threshold=threshold)
+        answered = correct = 0
+        start = time.perf_counter()
+        for description, expected in CORPUS:
+            synthesis = synthesizer.synthesize(description)
+            if synthesis:
+                answered += 1
+                correct += synthesis.soql == expected
+                if threshold == gate_threshold and synthesis.soql != expected:
+                    wrong.append((description, synthesis.soql))
+        elapsed = time.perf_counter() - start
+
+        llm_calls = len(CORPUS) - answered
+        rows.append([
+            threshold,
+            f"{answered}/{len(CORPUS)}",
+            f"{answered / len(CORPUS):.0%}",
+            f"{correct / answered:.0%}" if answered else "-",
+            f"{elapsed / len(CORPUS) * 1e6:.0f} us",
+            f"{llm_calls * llm_latency_ms / 1000:.1f} s"
+        ])
+    print(f"{len(CORPUS)} onboarding descriptions; LLM time assumes {llm_latency_ms:.0f} ms per GPT-4 call")
+    print_table(["threshold", "synthesized", "coverage", "accuracy", "latency/description", "remaining llm time"], rows)
+
+    for description, soql in wrong:
+        print(f"FAIL at threshold {gate_threshold}: {description!r} -> {soql}")
+    return 1 if wrong else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
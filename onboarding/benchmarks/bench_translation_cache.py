@@ -0,0 +1,78 @@
+"""NL-to-SOQL translation cache: GPT-4 calls and time saved across onboarding runs.
+
+Every customer's onboarding asks the same questions. Replays the query
+descriptions of several customers through buildQuery, outside a graph run
+so with its state emits muted, then reopens the cache as a restarted
+process would, so the SQLite tier is exercised:
+    python -m benchmarks.bench_translation_cache
+"""
+import asyncio
+import os
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage
+
+from benchmarks.common import print_table
+
+import query_builder
+from emitter import state_emitter
+from tools.questions import catalog
+from translation_cache import TranslationCache
+
+class FakeSOQLModel:
+    """Stands in for the shared GPT-4 client buildQuery translates with; answers after a fixed delay."""
+    latency = 0.5
+    calls = 0
+
+    async def ainvoke(self, prompt):
+        FakeSOQLModel.calls += 1
+        await asyncio.sleep(self.latency)
+        return AIMessage(content="SELECT Id, Name, Type FROM Account WHERE Type = 'Customer'")
+
+def customer_descriptions(customer: int):
+    # Customers phrase the same questions with small differences in case and punctuation
+    for question in catalog.questions():
+        description = question["description"]
+        yield description.upper() if customer % 2 else f"  {description.rstrip('.')}?"
+
+async def replay(label: str, customers: int):
+    calls_before = FakeSOQLModel.calls
+    start = time.perf_counter()
+    with state_emitter.muted():
+        for customer in range(customers):
+            for description in customer_descriptions(customer):
+                await query_builder.buildQuery(description, {})
+    elapsed = time.perf_counter() - start
+    metrics = query_builder.translation_cache.get_metrics()
+    return [
+        label,
+        customers * len(catalog.questions()),
+        FakeSOQLModel.calls - calls_before,
+        metrics["memory_hits"],
+        metrics["sqlite_hits"],
+        f"{metrics['hit_rate']:.0%}",
+        f"{metrics['llm_seconds_saved']:.1f} s",
+        f"{elapsed:.2f} s"
+    ]
+
+async def main(customers: int = 10):
+    query_builder.cfg.SOQL_LLM = FakeSOQLModel()
+    path = os.path.join(tempfile.mkdtemp(), "translation_cache.db")
+    schema = query_builder.SALESFORCE_SCHEMA
+
+    rows = []
+    query_builder.translation_cache = TranslationCache(path, schema)
+    rows.append(await replay("cold process", customers))
+    # A restarted process starts with an empty memory tier
+    query_builder.translation_cache = TranslationCache(path, schema)
+    rows.append(await replay("restarted process", customers))
+    # Changing the schema invalidates every translation
+    query_builder.translation_cache = TranslationCache(path, {**schema, "Lead": {"standard_fields": ["Id"]}})
+    rows.append(await replay("schema changed", customers))
+
+    print(f"{customers} customers x {len(catalog.questions())} questions, simulated GPT-4 latency {FakeSOQLModel.latency * 1000:.0f} ms")
+    print_table(["run", "descriptions", "gpt-4 calls", "memory hits", "sqlite hits", "hit rate", "llm time saved", "wall time"], rows)
+
+if __name__ == "__main__":
+    asyncio.run(main())
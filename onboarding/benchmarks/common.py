@@ -0,0 +1,53 @@
+"""Shared helpers for the onboarding benchmarks.
+
+Benchmarks are run from the onboarding directory, e.g.
+``python -m benchmarks.bench_routing``. They replace the GPT-4 orchestrator
+model with a stand-in that answers after a fixed delay, so LLM calls can be
+counted without an API key.
+"""
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage
+
+# Config() builds the OpenAI clients at import time
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+class FakeOrchestratorModel:
+    """Stands in for the bound GPT-4 model and counts its calls."""
+
+    def __init__(self, latency: float = 0.05, tool_calls: Optional[List[List[Dict[str, Any]]]] = None):
+        """
+        Args:
+            latency: Simulated LLM latency in seconds
+            tool_calls: Tool calls to answer with, one list per call; further
+                calls answer without tool calls
+        """
+        self.latency = latency
+        self.tool_calls = list(tool_calls or [])
+        self.calls = 0
+
+    async def ainvoke(self, messages, config=None) -> AIMessage:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        tool_calls = self.tool_calls.pop(0) if self.tool_calls else []
+        return AIMessage(content="" if tool_calls else "Continuing the onboarding.", tool_calls=tool_calls)
+
+async def fake_query_execute(query_description: str, state: Optional[Dict] = None):
+    """Stands in for QueryBuilderAgent.execute so no GPT-4 query generation runs."""
+    return state, {
+        "query": "SELECT Id, Name FROM Account WHERE Type = 'Customer'",
+        "results": [{"Id": "0011a00000X1Y2Z3", "Name": "Acme Corporation"}]
+    }
+
+def print_table(headers: List[str], rows: List[List[Any]]) -> None:
+    """Print benchmark results as an aligned table."""
+    widths = [
+        max(len(str(cell)) for cell in [header, *(row[i] for row in rows)])
+        for i, header in enumerate(headers)
+    ]
+    print("  ".join(str(header).ljust(width) for header, width in zip(headers, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))
@@ -0,0 +1,69 @@
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from state import RunUsage
+
+# USD per 1K (input, output) tokens of GPT-4, which both the orchestrator and the query builder use
+GPT4_PRICING = (0.03, 0.06)
+
+@dataclass(frozen=True)
+class RunBudget:
+    """Upper bounds for one onboarding run."""
+    max_hops: int
+    max_tokens: int
+    max_seconds: float
+
+    def for_run(self, config: Optional[RunnableConfig]) -> "RunBudget":
+        """Apply per-run overrides from config["configurable"]."""
+        configurable = (config or {}).get("configurable", {})
+        overrides = {
+            name: configurable[name]
+            for name in ("max_hops", "max_tokens", "max_seconds")
+            if configurable.get(name) is not None
+        }
+        return replace(self, **overrides) if overrides else self
+
+    def exhausted(self, usage: RunUsage) -> Optional[str]:
+        """Return why the budget is exhausted, or None while it is not."""
+        if usage.hops > self.max_hops:
+            return f"hop budget of {self.max_hops} hops exhausted"
+        if usage.input_tokens + usage.output_tokens >= self.max_tokens:
+            return f"token budget of {self.max_tokens} tokens exhausted"
+        if usage.started_at is not None and time.time() - usage.started_at >= self.max_seconds:
+            return f"time budget of {self.max_seconds:g}s exhausted"
+        return None
+
+def record_llm_call(usage: RunUsage, response: Any) -> None:
+    """Add the token usage reported on an LLM response."""
+    metadata = getattr(response, "usage_metadata", None) or {}
+    usage.llm_calls += 1
+    usage.input_tokens += metadata.get("input_tokens", 0)
+    usage.output_tokens += metadata.get("output_tokens", 0)
+
+def add_usage(usage: RunUsage, spent: RunUsage) -> None:
+    """Add the LLM calls and tokens of ``spent`` to ``usage``."""
+    usage.llm_calls += spent.llm_calls
+    usage.input_tokens += spent.input_tokens
+    usage.output_tokens += spent.output_tokens
+
+def cost_summary(usage: RunUsage, budget: RunBudget, stopped_by: Optional[str] = None) -> Dict[str, Any]:
+    """Summarize what a run used against its budget."""
+    input_price, output_price = GPT4_PRICING
+    elapsed = time.time() - usage.started_at if usage.started_at is not None else 0.0
+    return {
+        "hops": usage.hops,
+        "max_hops": budget.max_hops,
+        "llm_calls": usage.llm_calls,
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "max_tokens": budget.max_tokens,
+        "wall_seconds": round(elapsed, 3),
+        "max_seconds": budget.max_seconds,
+        "estimated_cost_usd": round(
+            (usage.input_tokens * input_price + usage.output_tokens * output_price) / 1000, 4
+        ),
+        "stopped_by": stopped_by
+    }
@@ -0,0 +1,239 @@
+"""Onboarding steps and questions, per workspace, indexed for the tools.
+
+The catalog is read from a JSON file ({"workspaces": {<name>: {"steps":
+[...], "questions": [...]}}}, or one workspace's {"steps", "questions"}) or
+from a SQLite database written by save_catalog. Steps are indexed by id,
+questions by id and by step id, once per load. Workers notice when the
+source changes and load it again, swapping the whole catalog at once.
+"""
+import functools
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# The standard onboarding every workspace starts from
+CATALOG_FILE = Path(__file__).parent / "data" / "catalog.json"
+
+# Workspaces without steps and questions of their own get these
+DEFAULT_WORKSPACE = "default"
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS steps (
+    workspace TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (workspace, id)
+);
+CREATE TABLE IF NOT EXISTS questions (
+    workspace TEXT NOT NULL,
+    id TEXT NOT NULL,
+    step_id TEXT,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (workspace, id)
+);
+"""
+
+Workspaces = Dict[str, Dict[str, List[Dict[str, Any]]]]
+
+def step_of(question: Dict[str, Any]) -> Optional[str]:
+    """Id of the step a question belongs to."""
+    return (question.get("step") or {}).get("id")
+
+@dataclass(frozen=True)
+class WorkspaceCatalog:
+    """One workspace's steps in order and questions in order, with their indexes."""
+    steps: List[Dict[str, Any]]
+    questions: List[Dict[str, Any]]
+    steps_by_id: Dict[str, Dict[str, Any]]
+    questions_by_id: Dict[str, Dict[str, Any]]
+    questions_by_step: Dict[str, List[Dict[str, Any]]]
+
+    @classmethod
+    def build(cls, steps: List[Dict[str, Any]], questions: List[Dict[str, Any]]) -> "WorkspaceCatalog":
+        steps = sorted(steps, key=lambda step: step.get("order", 0))
+        questions_by_step: Dict[str, List[Dict[str, Any]]] = {}
+        for question in questions:
+            questions_by_step.setdefault(step_of(question), []).append(question)
+        return cls(
+            steps=steps,
+            questions=list(questions),
+            steps_by_id={step["id"]: step for step in steps},
+            questions_by_id={question["id"]: question for question in questions},
+            questions_by_step=questions_by_step
+        )
+
+EMPTY = WorkspaceCatalog.build([], [])
+
+def _read_json(path: Path) -> Workspaces:
+    with open(path) as f:
+        data = json.load(f)
+    return data["workspaces"] if "workspaces" in data else {DEFAULT_WORKSPACE: data}
+
+def _read_sqlite(path: Path) -> Workspaces:
+    # Read-only, so a missing file is an error instead of a new empty catalog
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        workspaces: Workspaces = {}
+        for table in ("steps", "questions"):
+            for workspace, data in conn.execute(f"SELECT workspace, data FROM {table} ORDER BY workspace, position"):
+                workspaces.setdefault(workspace, {"steps": [], "questions": []})[table].append(json.loads(data))
+        return workspaces
+    finally:
+        conn.close()
+
+def read_catalog(path: Union[str, Path]) -> Workspaces:
+    """Steps and questions per workspace from a JSON file or a SQLite database."""
+    path = Path(path)
+    return _read_sqlite(path) if path.suffix in SQLITE_SUFFIXES else _read_json(path)
+
+def save_catalog(workspaces: Workspaces, path: Union[str, Path]) -> None:
+    """Write steps and questions per workspace as JSON, or into SQLite for a .db/.sqlite path.
+
+    A SQLite catalog is replaced in one transaction, so workers reloading
+    meanwhile see the old catalog or the new one.
+    """
+    path = Path(path)
+    if path.suffix not in SQLITE_SUFFIXES:
+        # Written aside and renamed, so a reload never reads half a file
+        partial = path.with_name(path.name + ".partial")
+        with open(partial, "w") as f:
+            json.dump({"workspaces": workspaces}, f, indent=2)
+        os.replace(partial, path)
+        return
+
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.execute("DELETE FROM steps")
+            conn.execute("DELETE FROM questions")
+            for name, workspace in workspaces.items():
+                conn.executemany(
+                    "INSERT INTO steps VALUES (?, ?, ?, ?)",
+                    [(name, step["id"], position, json.dumps(step)) for position, step in enumerate(workspace.get("steps", []))]
+                )
+                conn.executemany(
+                    "INSERT INTO questions VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (name, question["id"], step_of(question), position, json.dumps(question))
+                        for position, question in enumerate(workspace.get("questions", []))
+                    ]
+                )
+    finally:
+        conn.close()
+
+class Catalog:
+    """Indexed steps and questions of every workspace, reloaded when the source changes.
+
+    Lookups by id and by step are dict lookups. At most every
+    ``reload_interval`` seconds a lookup checks the source's modification
+    time and size (and those of a SQLite write-ahead log); when they
+    changed, the catalog is read and indexed again and replaces the old
+    one in a single assignment, so concurrent lookups see one or the
+    other. A source that fails to load keeps the previous catalog.
+    """
+
+    def __init__(self, path: Union[str, Path] = CATALOG_FILE, reload_interval: float = 2.0):
+        """
+        Args:
+            path: JSON file or SQLite database of steps and questions per workspace
+            reload_interval: Seconds between checks for a changed source; 0
+                checks on every lookup, a negative interval never reloads
+        """
+        self.path = Path(path)
+        self.reload_interval = reload_interval
+        self.workspaces: Dict[str, WorkspaceCatalog] = {}
+        self.loads = 0
+        self.failed_loads = 0
+        self.load_seconds = 0.0
+        self._signature = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        if not self.reload():
+            raise ValueError(f"Could not load the onboarding catalog from {self.path}")
+
+    def _source_signature(self) -> Tuple:
+        files = [self.path, self.path.with_name(self.path.name + "-wal")]
+        return tuple((stat.st_mtime_ns, stat.st_size) for stat in (os.stat(f) for f in files if f.exists()))
+
+    def reload(self) -> bool:
+        """Read and index the source again; returns whether the new catalog is in use."""
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                signature = self._source_signature()
+                workspaces = {
+                    name: WorkspaceCatalog.build(workspace.get("steps", []), workspace.get("questions", []))
+                    for name, workspace in read_catalog(self.path).items()
+                }
+            except Exception as e:
+                self.failed_loads += 1
+                logging.error(f"Error loading the onboarding catalog from {self.path}: {str(e)}")
+                return False
+            self.workspaces = workspaces
+            self._signature = signature
+            self.loads += 1
+            self.load_seconds += time.perf_counter() - start
+            return True
+
+    def _reload_if_changed(self) -> None:
+        if self.reload_interval < 0:
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            changed = self._source_signature() != self._signature
+        except OSError:
+            changed = False
+        if changed:
+            self.reload()
+
+    def workspace(self, workspace: Optional[str] = None) -> WorkspaceCatalog:
+        """A workspace's catalog; unknown workspaces get the default one."""
+        self._reload_if_changed()
+        workspaces = self.workspaces
+        return workspaces.get(workspace or DEFAULT_WORKSPACE) or workspaces.get(DEFAULT_WORKSPACE) or EMPTY
+
+    def steps(self, workspace: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.workspace(workspace).steps
+
+    def step(self, step_id: str, workspace: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return self.workspace(workspace).steps_by_id.get(step_id)
+
+    def questions(self, workspace: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.workspace(workspace).questions
+
+    def question(self, question_id: str, workspace: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return self.workspace(workspace).questions_by_id.get(question_id)
+
+    def questions_by_step(self, step_id: str, workspace: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.workspace(workspace).questions_by_step.get(step_id, [])
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Loads, failed loads, mean load time and what the catalog holds."""
+        workspaces = self.workspaces
+        return {
+            "loads": self.loads,
+            "failed_loads": self.failed_loads,
+            "mean_load_ms": self.load_seconds / self.loads * 1000 if self.loads else 0.0,
+            "workspaces": len(workspaces),
+            "steps": sum(len(workspace.steps) for workspace in workspaces.values()),
+            "questions": sum(len(workspace.questions) for workspace in workspaces.values())
+        }
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(path: str = "", reload_interval: float = 2.0) -> Catalog:
+    """The catalog of a source (the bundled one by default), shared by every tool of the process."""
+    return Catalog(path or CATALOG_FILE, reload_interval=reload_interval)
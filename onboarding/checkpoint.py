@@ -0,0 +1,508 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.base import SerializerProtocol
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    checkpoint_type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+
+CREATE TABLE IF NOT EXISTS checkpoint_blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    base_version TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+
+CREATE TABLE IF NOT EXISTS checkpoint_writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB,
+    task_path TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+# Blob row type prefix marking a list channel stored as the items appended to base_version
+DELTA_TYPE = "delta"
+
+class SqliteDeltaSaver(BaseCheckpointSaver):
+    """SQLite checkpointer that stores state deltas instead of full snapshots.
+
+    Each checkpoint row only holds channel versions; channel values live in
+    checkpoint_blobs and are written only for the channels that changed in
+    that step. List channels that grew by appending, such as the message
+    history, are stored as just the appended items on top of the previous
+    version, with a full copy every ``snapshot_every`` deltas to keep
+    reads short.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        snapshot_every: int = 20,
+        delta: bool = True,
+        serde: Optional[SerializerProtocol] = None
+    ):
+        """
+        Args:
+            path: SQLite database file (":memory:" for a throwaway store)
+            snapshot_every: Maximum length of a delta chain before a full copy
+            delta: Store appended list items only; False writes a full copy
+                of every changed channel
+            serde: Serializer for channel values; defaults to the langgraph one
+        """
+        super().__init__(serde=serde)
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.delta = delta
+        self.bytes_written = 0
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        # Last written value per (thread_id, checkpoint_ns, channel): (version, items, chain length);
+        # only read or changed while holding the lock
+        self._last_lists: Dict[Tuple[str, str, str], Tuple[str, list, int]] = {}
+
+    # Channel values
+
+    def _dump_channel(self, key: Tuple[str, str, str], version: str, value: Any) -> Tuple[str, bytes, Optional[str]]:
+        """Serialize a channel value, as a delta on the previous version when possible."""
+        previous = self._last_lists.get(key)
+        if isinstance(value, list):
+            items = list(value)
+            if (
+                self.delta
+                and previous is not None
+                and previous[2] < self.snapshot_every
+                and len(items) >= len(previous[1])
+                and all(a is b or a == b for a, b in zip(previous[1], items))
+            ):
+                self._last_lists[key] = (version, items, previous[2] + 1)
+                type_, blob = self.serde.dumps_typed(items[len(previous[1]):])
+                return f"{DELTA_TYPE}:{type_}", blob, previous[0]
+            self._last_lists[key] = (version, items, 0)
+        else:
+            self._last_lists.pop(key, None)
+
+        type_, blob = self.serde.dumps_typed(value)
+        return type_, blob, None
+
+    def _load_channel(self, thread_id: str, checkpoint_ns: str, channel: str, version: str) -> Tuple[bool, Any]:
+        """Load a channel value, following delta rows back to their base; returns (found, value)."""
+        suffixes = []
+        while True:
+            row = self.conn.execute(
+                """
+                SELECT type, blob, base_version FROM checkpoint_blobs
+                WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?
+                """,
+                (thread_id, checkpoint_ns, channel, version)
+            ).fetchone()
+            if row is None or row[0] == "empty":
+                return False, None
+
+            type_, blob, base_version = row
+            if not type_.startswith(f"{DELTA_TYPE}:"):
+                value = self.serde.loads_typed((type_, blob))
+                break
+            suffixes.append(self.serde.loads_typed((type_.split(":", 1)[1], blob)))
+            version = base_version
+
+        if not suffixes:
+            return True, value
+
+        items = list(value)
+        for suffix in reversed(suffixes):
+            items.extend(suffix)
+        return True, items
+
+    def _load_channel_values(self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions) -> Dict[str, Any]:
+        values = {}
+        for channel, version in versions.items():
+            found, value = self._load_channel(thread_id, checkpoint_ns, channel, str(version))
+            if found:
+                values[channel] = value
+                if isinstance(value, list):
+                    self._last_lists[(thread_id, checkpoint_ns, channel)] = (str(version), list(value), self.snapshot_every)
+        return values
+
+    # BaseCheckpointSaver
+
+    def _tuple_from_row(self, row: tuple) -> CheckpointTuple:
+        thread_id, checkpoint_ns, checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, metadata = row
+        checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint))
+        writes = self.conn.execute(
+            """
+            SELECT task_id, channel, type, blob FROM checkpoint_writes
+            WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+            ORDER BY task_path, task_id, idx
+            """,
+            (thread_id, checkpoint_ns, checkpoint_id)
+        ).fetchall()
+
+        return CheckpointTuple(
+            config={"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id
+            }},
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_channel_values(
+                    thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                )
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {"configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": parent_id
+                }}
+                if parent_id else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((type_, blob)))
+                for task_id, channel, type_, blob in writes
+            ]
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        columns = """thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                     checkpoint_type, checkpoint, metadata_type, metadata"""
+
+        with self.lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    f"""
+                    SELECT {columns} FROM checkpoints
+                    WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+                    """,
+                    (thread_id, checkpoint_ns, checkpoint_id)
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    f"""
+                    SELECT {columns} FROM checkpoints
+                    WHERE thread_id = ? AND checkpoint_ns = ?
+                    ORDER BY checkpoint_id DESC LIMIT 1
+                    """,
+                    (thread_id, checkpoint_ns)
+                ).fetchone()
+            return self._tuple_from_row(row) if row else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if "checkpoint_ns" in config["configurable"]:
+                clauses.append("checkpoint_ns = ?")
+                params.append(config["configurable"]["checkpoint_ns"])
+        if before and (before_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self.lock:
+            rows = self.conn.execute(
+                f"""
+                SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+                       checkpoint_type, checkpoint, metadata_type, metadata
+                FROM checkpoints {where}
+                ORDER BY checkpoint_id DESC
+                """,
+                params
+            ).fetchall()
+
+            # Built before yielding, so the lock is not held while the caller iterates
+            checkpoint_tuples = []
+            for row in rows:
+                checkpoint_tuple = self._tuple_from_row(row)
+                if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                checkpoint_tuples.append(checkpoint_tuple)
+                if limit is not None and len(checkpoint_tuples) >= limit:
+                    break
+
+        yield from checkpoint_tuples
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        stored = checkpoint.copy()
+        values = stored.pop("channel_values")
+
+        checkpoint_type, checkpoint_blob = self.serde.dumps_typed(stored)
+        metadata_type, metadata_blob = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        with self.lock, self.conn:
+            # Only the channels that changed in this step are written; deltas
+            # read and update _last_lists, which the lock guards
+            blob_rows = []
+            for channel, version in new_versions.items():
+                if channel in values:
+                    type_, blob, base_version = self._dump_channel(
+                        (thread_id, checkpoint_ns, channel), str(version), values[channel]
+                    )
+                else:
+                    type_, blob, base_version = "empty", None, None
+                blob_rows.append((thread_id, checkpoint_ns, channel, str(version), type_, blob, base_version))
+            self.bytes_written += len(checkpoint_blob) + len(metadata_blob) + sum(len(row[5] or b"") for row in blob_rows)
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO checkpoint_blobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                blob_rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id, checkpoint_ns, checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    checkpoint_type, checkpoint_blob, metadata_type, metadata_blob, time.time()
+                )
+            )
+
+        return {"configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint["id"]
+        }}
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append((
+                thread_id, checkpoint_ns, checkpoint_id, task_id,
+                WRITES_IDX_MAP.get(channel, idx), channel, type_, blob, task_path
+            ))
+
+        # Special writes (errors, interrupts) replace earlier ones, regular writes are kept
+        verb = "INSERT OR REPLACE" if all(w[0] in WRITES_IDX_MAP for w in writes) else "INSERT OR IGNORE"
+        with self.lock, self.conn:
+            self.conn.executemany(f"{verb} INTO checkpoint_writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock, self.conn:
+            for table in ("checkpoints", "checkpoint_blobs", "checkpoint_writes"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            for key in [key for key in self._last_lists if key[0] == thread_id]:
+                del self._last_lists[key]
+
+    # The async methods run the SQLite work on a worker thread, off the event loop
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    # Retention
+
+    def prune_checkpoints(
+        self,
+        keep_last: int = 10,
+        max_age_seconds: Optional[float] = None,
+        thread_id: Optional[str] = None
+    ) -> int:
+        """Delete old checkpoints and the blobs and writes only they referenced.
+
+        Args:
+            keep_last: Checkpoints kept per thread and namespace, newest first
+            max_age_seconds: Also delete whole threads whose latest checkpoint
+                is older than this
+            thread_id: Only trim this thread's checkpoints, which reads just
+                its own rows; None trims every thread
+
+        Returns:
+            Number of deleted checkpoints
+        """
+        scope, params = ("thread_id = ?", (thread_id,)) if thread_id is not None else ("1", ())
+        with self.lock, self.conn:
+            if max_age_seconds is not None:
+                stale = [row[0] for row in self.conn.execute(
+                    "SELECT thread_id FROM checkpoints GROUP BY thread_id HAVING MAX(created_at) < ?",
+                    (time.time() - max_age_seconds,)
+                )]
+            else:
+                stale = []
+
+            deleted = 0
+            for stale_thread in stale:
+                deleted += self.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (stale_thread,)).rowcount
+                self.conn.execute("DELETE FROM checkpoint_blobs WHERE thread_id = ?", (stale_thread,))
+                self.conn.execute("DELETE FROM checkpoint_writes WHERE thread_id = ?", (stale_thread,))
+
+            deleted += self.conn.execute(
+                f"""
+                DELETE FROM checkpoints WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (
+                            PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC
+                        ) AS position
+                        FROM checkpoints WHERE {scope}
+                    ) WHERE position > ?
+                )
+                """,
+                (*params, keep_last)
+            ).rowcount
+            self.conn.execute(
+                f"""
+                DELETE FROM checkpoint_writes WHERE {scope} AND NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = checkpoint_writes.thread_id
+                      AND c.checkpoint_ns = checkpoint_writes.checkpoint_ns
+                      AND c.checkpoint_id = checkpoint_writes.checkpoint_id
+                )
+                """,
+                params
+            )
+            self._prune_blobs(scope, params)
+            for key in [key for key in self._last_lists if key[0] in stale]:
+                del self._last_lists[key]
+
+        return deleted
+
+    async def aprune_checkpoints(
+        self,
+        keep_last: int = 10,
+        max_age_seconds: Optional[float] = None,
+        thread_id: Optional[str] = None
+    ) -> int:
+        """prune_checkpoints on a worker thread, so deserializing checkpoints never blocks the event loop."""
+        return await asyncio.to_thread(self.prune_checkpoints, keep_last, max_age_seconds, thread_id)
+
+    def _prune_blobs(self, scope: str = "1", params: Tuple = ()) -> None:
+        """Delete blobs no remaining checkpoint reaches, directly or as a delta base.
+
+        ``scope`` is a condition on thread_id limiting the checkpoints read
+        and the blobs considered, with its ``params``.
+        """
+        referenced = set()
+        for thread_id, checkpoint_ns, checkpoint_type, checkpoint in self.conn.execute(
+            f"SELECT thread_id, checkpoint_ns, checkpoint_type, checkpoint FROM checkpoints WHERE {scope}", params
+        ):
+            versions = self.serde.loads_typed((checkpoint_type, checkpoint))["channel_versions"]
+            for channel, version in versions.items():
+                referenced.add((thread_id, checkpoint_ns, channel, str(version)))
+
+        bases = {
+            (thread_id, checkpoint_ns, channel, version): base_version
+            for thread_id, checkpoint_ns, channel, version, base_version in self.conn.execute(
+                f"""
+                SELECT thread_id, checkpoint_ns, channel, version, base_version
+                FROM checkpoint_blobs WHERE {scope} AND base_version IS NOT NULL
+                """,
+                params
+            )
+        }
+        for key in list(referenced):
+            while key in bases:
+                key = (*key[:3], bases[key])
+                referenced.add(key)
+
+        unreferenced = [
+            row for row in self.conn.execute(
+                f"SELECT thread_id, checkpoint_ns, channel, version FROM checkpoint_blobs WHERE {scope}", params
+            ).fetchall()
+            if row not in referenced
+        ]
+        self.conn.executemany(
+            """
+            DELETE FROM checkpoint_blobs
+            WHERE thread_id = ? AND checkpoint_ns = ? AND channel = ? AND version = ?
+            """,
+            unreferenced
+        )
@@ -0,0 +1,30 @@
+import asyncio
+import weakref
+
+class LoopLocalSemaphore:
+    """An asyncio.Semaphore per running event loop.
+
+    The graph instance is created at import time and may be driven from
+    several event loops (the LangGraph server, benchmarks, tests), while an
+    asyncio.Semaphore is bound to the loop it first waits on.
+    """
+
+    def __init__(self, value: int):
+        if value < 1:
+            raise ValueError("Semaphore value must be at least 1")
+        self.value = value
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def get(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.value)
+        return semaphore
+
+    async def __aenter__(self):
+        await self.get().acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.get().release()
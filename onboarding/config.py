@@ -1,3 +1,5 @@
+import os
+
 from langchain_openai import ChatOpenAI
 
 class Config:
@@ -5,5 +7,61 @@ class Config:
         self.FACTUAL_LLM = ChatOpenAI(
             model="gpt-4",
             temperature=0,
-            streaming=True
-        )
\ No newline at end of file
+            streaming=True,
+            stream_usage=True
+        )
+        # Client buildQuery translates descriptions to SOQL with; shared by
+        # every session so calls reuse its connection pool
+        self.SOQL_LLM = ChatOpenAI(model="gpt-4", temperature=0)
+
+        # Per-run budgets for the orchestrator loop; each can be overridden
+        # per run through config["configurable"] (max_hops, max_tokens, max_seconds)
+        self.MAX_HOPS = int(os.getenv("ONBOARDING_MAX_HOPS", "25"))
+        self.MAX_TOKENS = int(os.getenv("ONBOARDING_MAX_TOKENS", "60000"))
+        self.MAX_SECONDS = float(os.getenv("ONBOARDING_MAX_SECONDS", "300"))
+
+        # SQLite file for durable run checkpoints, so a thread can be resumed
+        # after a restart; empty keeps runs in memory only
+        self.CHECKPOINT_DB = os.getenv("ONBOARDING_CHECKPOINT_DB", "")
+        self.CHECKPOINT_KEEP_LAST = int(os.getenv("ONBOARDING_CHECKPOINT_KEEP_LAST", "20"))
+
+        # SQLite file persisting natural language to SOQL translations; empty
+        # keeps them in memory only
+        self.TRANSLATION_CACHE_DB = os.getenv("ONBOARDING_TRANSLATION_CACHE_DB", "")
+
+        # Minimum share of a query description the schema templates must
+        # explain for buildQuery to skip the LLM
+        self.SYNTHESIS_THRESHOLD = float(os.getenv("ONBOARDING_SYNTHESIS_THRESHOLD", "0.75"))
+
+        # Query results are returned a page at a time; the rest stays behind a
+        # server-side cursor that expires when unused for QUERY_CURSOR_TTL seconds
+        self.QUERY_PAGE_SIZE = int(os.getenv("ONBOARDING_QUERY_PAGE_SIZE", "200"))
+        self.QUERY_CURSOR_TTL = float(os.getenv("ONBOARDING_QUERY_CURSOR_TTL", "900"))
+        self.QUERY_MAX_CURSORS = int(os.getenv("ONBOARDING_QUERY_MAX_CURSORS", "256"))
+
+        # Query results are reused for QUERY_RESULT_TTL seconds, up to
+        # QUERY_RESULT_CACHE_SIZE queries. WRITE_LOG is the SQLite file the
+        # query_builder_with_data agent records its writes in (set the same
+        # ONBOARDING_WRITE_LOG for both); results of written objects are run
+        # again. Empty turns the result cache off, since writes would go unseen
+        # and stale results be served until they expire.
+        self.QUERY_RESULT_TTL = float(os.getenv("ONBOARDING_QUERY_RESULT_TTL", "300"))
+        self.QUERY_RESULT_CACHE_SIZE = int(os.getenv("ONBOARDING_QUERY_RESULT_CACHE_SIZE", "512"))
+        self.WRITE_LOG = os.getenv("ONBOARDING_WRITE_LOG", "")
+
+        # Records getQueryData serves: a JSON file of records per object or a
+        # columnar directory written by dataset.py; empty uses the bundled mock
+        # records. DATASET_MMAP maps columnar files instead of reading them.
+        self.DATASET = os.getenv("ONBOARDING_DATASET", "")
+        self.DATASET_MMAP = os.getenv("ONBOARDING_DATASET_MMAP", "false").lower() in ("1", "true", "yes")
+
+        # Put only the schema objects and fields a description is about into
+        # query-generation prompts instead of the whole schema
+        self.SCHEMA_PRUNING = os.getenv("ONBOARDING_SCHEMA_PRUNING", "true").lower() in ("1", "true", "yes")
+
+        # Steps and questions per workspace: a JSON file or a SQLite database
+        # written by catalog.save_catalog; empty uses the bundled catalog.
+        # Workers check for a changed source every CATALOG_RELOAD_INTERVAL
+        # seconds and load it again; a negative interval never reloads.
+        self.CATALOG = os.getenv("ONBOARDING_CATALOG", "")
+        self.CATALOG_RELOAD_INTERVAL = float(os.getenv("ONBOARDING_CATALOG_RELOAD_INTERVAL", "2"))
@@ -0,0 +1,216 @@
+"""Salesforce records for the local SOQL engine.
+
+Records are loaded once, from a JSON file of records per object or from a
+directory of columnar NumPy files that can be memory-mapped, and a seeded
+generator builds realistic Accounts, Opportunities, Contacts and Users by
+the million for load testing. Write a generated dataset to disk with:
+    python dataset.py <directory> [rows] [seed]
+"""
+import functools
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from soql.engine import Column, Database, Table
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# The handful of records the onboarding flow previews by default
+MOCK_RECORDS = DATA_DIR / "mock_records.json"
+
+# Version of the columnar directory layout written by save_columnar
+COLUMNAR_FORMAT = 1
+
+@functools.lru_cache(maxsize=None)
+def _read_records(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    with open(path) as f:
+        return json.load(f)
+
+def load_records(path: Union[str, Path] = MOCK_RECORDS) -> Dict[str, List[Dict[str, Any]]]:
+    """Records per object from a JSON file, read once per process.
+
+    The returned dict is shared between callers; treat it as read-only.
+    """
+    return _read_records(str(Path(path).resolve()))
+
+def load_database(path: Union[str, Path] = MOCK_RECORDS, mmap: bool = False, today: Optional[date] = None) -> Database:
+    """A database from a JSON records file or a directory written by save_columnar.
+
+    Args:
+        path: JSON file of records per object, or a columnar directory
+        mmap: Memory-map the columnar arrays instead of reading them, so
+            only the pages queries touch are loaded; ignored for JSON
+        today: Date relative date literals resolve against; defaults to the
+            one saved with a columnar dataset, then to the current date
+    """
+    path = Path(path)
+    if not path.is_dir():
+        return Database.from_records(load_records(path), today=today)
+
+    with open(path / "manifest.json") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != COLUMNAR_FORMAT:
+        raise ValueError(f"Unsupported columnar dataset format {manifest.get('format')} in {path}")
+
+    # Dictionaries are shared between columns (AccountId and Account.Id), as
+    # they were when saved, so joins between them need no value lookups.
+    # Object arrays cannot be mapped; the dictionaries are always read.
+    dictionaries: Dict[str, np.ndarray] = {}
+    tables = {}
+    for object_name, spec in manifest["tables"].items():
+        columns = {}
+        for field_name, column_spec in spec["columns"].items():
+            data = np.load(path / f"{object_name}.{field_name}.npy", mmap_mode="r" if mmap else None)
+            if column_spec["kind"] == "string":
+                name = column_spec["dictionary"]
+                if name not in dictionaries:
+                    dictionaries[name] = np.load(path / "dictionaries" / f"{name}.npy").astype(object)
+                columns[field_name] = Column.strings(data, dictionaries[name])
+            else:
+                columns[field_name] = Column(column_spec["kind"], data)
+        tables[object_name] = Table(object_name, columns)
+    saved_today = manifest.get("today")
+    return Database(tables, today=today or (date.fromisoformat(saved_today) if saved_today else None))
+
+def save_columnar(database: Database, directory: Union[str, Path]) -> None:
+    """Write a database as one .npy file per column plus a manifest.
+
+    String columns are stored as int32 codes, with each distinct dictionary
+    written once under ``dictionaries/`` however many columns share it.
+    """
+    directory = Path(directory)
+    (directory / "dictionaries").mkdir(parents=True, exist_ok=True)
+    written: Dict[int, str] = {}
+    tables = {}
+    for object_name, table in database.tables.items():
+        columns = {}
+        for field_name, column in table.columns.items():
+            np.save(directory / f"{object_name}.{field_name}.npy", np.asarray(column.data))
+            spec = {"kind": column.kind}
+            if column.kind == "string":
+                name = written.get(id(column.categories))
+                if name is None:
+                    name = written[id(column.categories)] = f"{object_name}.{field_name}"
+                    np.save(directory / "dictionaries" / f"{name}.npy", column.categories.astype(str))
+                spec["dictionary"] = name
+            columns[field_name] = spec
+        tables[object_name] = {"rows": table.size, "columns": columns}
+
+    manifest = {
+        "format": COLUMNAR_FORMAT,
+        "today": database.today.isoformat() if database.today else None,
+        "tables": tables
+    }
+    with open(directory / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+# Reference date of the synthetic data, so date literals match the same rows on every run
+TODAY = date(2025, 6, 30)
+
+TYPES = ["Customer", "Prospect", "Partner", "Reseller", "Other"]
+INDUSTRIES = ["Technology", "Finance", "Healthcare", "Retail", "Manufacturing", "Energy", "Education"]
+# Billing city per state, so the two always agree
+STATES = ["CA", "NY", "TX", "WA", "IL", "MA", "CO", "GA"]
+CITIES = ["San Francisco", "New York", "Austin", "Seattle", "Chicago", "Boston", "Denver", "Atlanta"]
+STAGES = ["Prospecting", "Qualification", "Proposal", "Negotiation", "Closed Won", "Closed Lost"]
+TITLES = ["CEO", "CTO", "CFO", "VP Sales", "Engineer", "Analyst", "Manager"]
+DEPARTMENTS = ["Executive", "Technology", "Finance", "Sales", "Engineering", "Operations", "Marketing"]
+
+def ids(prefix: str, rows: int) -> Column:
+    """Unique 15-character Ids with a Salesforce key prefix."""
+    return Column.strings(np.arange(rows), np.array([f"{prefix}{i:012d}" for i in range(rows)], dtype=object))
+
+def choice(rng: np.random.Generator, values, rows: int, null_share: float = 0.0) -> Column:
+    codes = rng.integers(0, len(values), rows)
+    if null_share:
+        codes[rng.random(rows) < null_share] = -1
+    return Column.strings(codes, np.array(values, dtype=object))
+
+def phones(rng: np.random.Generator, rows: int) -> Column:
+    # Numbers repeat across records, so the dictionary stays at 10,000 entries
+    return Column.strings(rng.integers(0, 10_000, rows), np.array([f"555-{i:04d}" for i in range(10_000)], dtype=object))
+
+def synthetic_database(
+    rows: int,
+    seed: int = 7,
+    shared_keys: bool = True,
+    users: int = 500,
+    today: date = TODAY
+) -> Database:
+    """Synthetic Account, Opportunity and Contact tables of ``rows`` rows each, plus ``users`` Users.
+
+    The same seed always gives the same records. With ``shared_keys`` the
+    AccountId columns reuse the dictionary of Account.Id, as tables loaded
+    together would; otherwise they get their own copy, so joins have to
+    translate values between dictionaries.
+    """
+    rng = np.random.default_rng(seed)
+    state = rng.integers(0, len(STATES), rows)
+    account = Table("Account", {
+        "Id": ids("001", rows),
+        "Name": Column.strings(np.arange(rows), np.array([f"Company {i}" for i in range(rows)], dtype=object)),
+        "Type": choice(rng, TYPES, rows),
+        "Industry": choice(rng, INDUSTRIES, rows, null_share=0.05),
+        "BillingCity": Column.strings(state, np.array(CITIES, dtype=object)),
+        "BillingState": Column.strings(state, np.array(STATES, dtype=object)),
+        "BillingCountry": Column.strings(np.zeros(rows), np.array(["USA"], dtype=object)),
+        "Phone": phones(rng, rows),
+        "Website": Column.strings(np.arange(rows), np.array([f"www.company{i}.com" for i in range(rows)], dtype=object)),
+        "AnnualRevenue": Column("number", rng.lognormal(15, 1.5, rows).round(0)),
+    })
+    account_ids = account.columns["Id"].categories
+    key_dictionary = account_ids if shared_keys else account_ids.copy()
+    user = Table("User", {
+        "Id": ids("005", users),
+        "Name": Column.strings(np.arange(users), np.array([f"User {i}" for i in range(users)], dtype=object)),
+    })
+    user_ids = user.columns["Id"].categories
+
+    stage = rng.integers(0, len(STAGES), rows)
+    close_date = np.datetime64(today) - rng.integers(-180, 720, rows).astype("timedelta64[D]")
+    # Created up to 200 days before closing, at some time of day
+    created = (close_date - rng.integers(10, 200, rows).astype("timedelta64[D]")).astype("datetime64[s]")
+    opportunity = Table("Opportunity", {
+        "Id": ids("006", rows),
+        "Name": Column.strings(np.arange(rows), np.array([f"Deal {i}" for i in range(rows)], dtype=object)),
+        "AccountId": Column.strings(rng.integers(0, rows, rows), key_dictionary),
+        "Amount": Column("number", rng.integers(1, 500, rows) * 1000.0),
+        "CloseDate": Column("date", close_date),
+        "StageName": Column.strings(stage, np.array(STAGES, dtype=object)),
+        "IsClosed": Column("boolean", (stage >= 4).astype(np.int8)),
+        "CreatedById": Column.strings(rng.integers(0, users, rows), user_ids),
+        "CreatedDate": Column("datetime", created + rng.integers(0, 86_400, rows).astype("timedelta64[s]")),
+        "LastModifiedById": Column.strings(rng.integers(0, users, rows), user_ids),
+    })
+
+    contact = Table("Contact", {
+        "Id": ids("003", rows),
+        "Name": Column.strings(np.arange(rows), np.array([f"Person {i}" for i in range(rows)], dtype=object)),
+        "Email": Column.strings(np.arange(rows), np.array(
+            [f"person{i}@{'acme' if i % 10 == 0 else 'example'}.com" for i in range(rows)], dtype=object
+        )),
+        "Phone": phones(rng, rows),
+        "Title": choice(rng, TITLES, rows),
+        "Department": choice(rng, DEPARTMENTS, rows, null_share=0.1),
+        "AccountId": Column.strings(rng.integers(0, rows, rows), key_dictionary),
+        "CreatedDate": Column("datetime", (
+            np.datetime64(today, "s") - rng.integers(0, 3 * 365 * 86_400, rows).astype("timedelta64[s]")
+        )),
+    })
+    return Database(
+        {"Account": account, "Opportunity": opportunity, "Contact": contact, "User": user},
+        today=today
+    )
+
+if __name__ == "__main__":
+    directory = sys.argv[1]
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 7
+    start = time.perf_counter()
+    save_columnar(synthetic_database(rows, seed=seed), directory)
+    print(f"Wrote {rows:,} rows per object to {directory} in {time.perf_counter() - start:.1f}s")
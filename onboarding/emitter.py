@@ -0,0 +1,184 @@
+import copy
+import functools
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+from copilotkit.langchain import copilotkit_emit_state
+from langchain_core.runnables import RunnableConfig, ensure_config
+
+def _pointer(path: str, key: Any) -> str:
+    """Append a key to a JSON pointer, escaping "~" and "/"."""
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON-patch (RFC 6902) operations turning ``old`` into ``new``.
+
+    Dicts are diffed key by key. Lists that only grew get one "add" per
+    appended item; any other list change replaces the whole list.
+    """
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = [{"op": "remove", "path": _pointer(path, key)} for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, _pointer(path, key)))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[:len(old)] == old:
+        return [{"op": "add", "path": f"{path}/-", "value": value} for value in new[len(old):]]
+
+    return [{"op": "replace", "path": path, "value": new}]
+
+def thread_of(config: Optional[RunnableConfig] = None) -> Optional[str]:
+    """Thread id of the run a config belongs to, if it has one."""
+    thread_id = ensure_config(config).get("configurable", {}).get("thread_id")
+    return None if thread_id is None else str(thread_id)
+
+def run_key(config: Optional[RunnableConfig] = None) -> str:
+    """Key of the run a config belongs to: its thread id."""
+    return thread_of(config) or "default"
+
+def _size(payload: Any) -> int:
+    return len(json.dumps(payload, separators=(",", ":")).encode())
+
+@dataclass
+class EmitStats:
+    """What one onboarding run sent to the frontend."""
+    requested: int = 0
+    coalesced: int = 0
+    skipped: int = 0
+    sent: int = 0
+    bytes_sent: int = 0
+    # What sending every requested emit as a full snapshot would have cost
+    bytes_full: int = 0
+
+@dataclass
+class EmitSession:
+    seq: int = 0
+    last: Optional[Dict[str, Any]] = None
+    stats: EmitStats = field(default_factory=EmitStats)
+
+class StateEmitter:
+    """Coalescing, diff-based front end to copilotkit_emit_state.
+
+    Tools wrapped with ``coalesce`` may call ``emit`` as often as they like;
+    only the last state of the tool call is sent, once the call returns.
+    Nested tool calls (buildQuery calling getQueryData) join the outer one.
+
+    The first emit of a run sends ``{"seq": 0, "snapshot": state}``; later
+    ones send ``{"seq": n, "patch": [...]}`` with the JSON-patch operations
+    against the previous emit, and emits that change nothing are skipped.
+    Sessions are keyed by the run's thread id and dropped by ``finish_run``.
+    Runs without a thread id have nothing tying their emits together, so
+    each of their emits is a full snapshot and no session is kept for them.
+    """
+
+    def __init__(self, diff: bool = True):
+        """
+        Args:
+            diff: Send JSON-patch diffs; False sends the full state every time
+        """
+        self.diff = diff
+        self.sessions: Dict[str, EmitSession] = {}
+        self._pending: ContextVar[Optional[Dict[str, Any]]] = ContextVar("pending_emit", default=None)
+        self._muted: ContextVar[bool] = ContextVar("muted_emit", default=False)
+
+    def _session(self, config: Optional[RunnableConfig] = None) -> EmitSession:
+        key = thread_of(config)
+        if key is None:
+            return EmitSession()
+        session = self.sessions.get(key)
+        if session is None:
+            session = self.sessions[key] = EmitSession()
+        return session
+
+    def start_run(self, config: Optional[RunnableConfig] = None) -> None:
+        """Reset the session of a run, so its next emit is a full snapshot."""
+        self.sessions.pop(thread_of(config), None)
+
+    def run_stats(self, config: Optional[RunnableConfig] = None) -> Dict[str, int]:
+        """Emission counts and bytes of a run."""
+        return asdict(self._session(config).stats)
+
+    def finish_run(self, config: Optional[RunnableConfig] = None) -> Dict[str, int]:
+        """Drop the session of a run that ended; returns its emission counts and bytes."""
+        session = self.sessions.pop(thread_of(config), None) or EmitSession()
+        return asdict(session.stats)
+
+    @contextmanager
+    def muted(self):
+        """Drop emits made in this context, and in tasks created from it."""
+        token = self._muted.set(True)
+        try:
+            yield
+        finally:
+            self._muted.reset(token)
+
+    def coalesce(self, func):
+        """Decorate a tool coroutine so its emits are sent once, when it returns."""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if self._pending.get() is not None:
+                return await func(*args, **kwargs)
+
+            pending: Dict[str, Any] = {}
+            token = self._pending.set(pending)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self._pending.reset(token)
+                if "state" in pending:
+                    await self._send(pending["config"], pending["state"])
+        return wrapper
+
+    async def emit(self, state: Dict[str, Any], config: Optional[RunnableConfig] = None) -> None:
+        """Emit the state, or hold it until the enclosing tool call returns."""
+        if self._muted.get():
+            return
+        config = ensure_config(config)
+        # Normalize to plain JSON so the stored copy is not mutated by the caller
+        snapshot = json.loads(json.dumps(state, default=str))
+        stats = self._session(config).stats
+        stats.requested += 1
+        stats.bytes_full += _size(snapshot)
+
+        pending = self._pending.get()
+        if pending is None:
+            await self._send(config, snapshot)
+            return
+        if "state" in pending:
+            stats.coalesced += 1
+        pending["state"] = snapshot
+        pending["config"] = config
+
+    async def _send(self, config: RunnableConfig, state: Dict[str, Any]) -> None:
+        session = self._session(config)
+        stats = session.stats
+
+        if session.last is None or not self.diff:
+            if session.last == state:
+                stats.skipped += 1
+                return
+            payload = {"seq": session.seq, "snapshot": state}
+        else:
+            ops = json_diff(session.last, state)
+            if not ops:
+                stats.skipped += 1
+                return
+            payload = {"seq": session.seq, "patch": ops}
+
+        await copilotkit_emit_state(config, payload)
+        session.last = copy.deepcopy(state)
+        session.seq += 1
+        stats.sent += 1
+        stats.bytes_sent += _size(payload)
+
+# Shared by all onboarding tools
+state_emitter = StateEmitter()
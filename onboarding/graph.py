@@ -1,30 +1,84 @@
+import asyncio
 import json
 from datetime import datetime
-from typing import Literal, cast, Dict, Any
+from typing import Literal, cast, Dict, Any, List, Optional
 from dotenv import load_dotenv
 import logging
+import time
 import uuid
 
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage, ToolMessage
 from langgraph.graph import StateGraph
-from langgraph.types import Command
+from langgraph.types import Command, Send
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
 from langchain_core.runnables import RunnableConfig
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from copilotkit.langchain import copilotkit_emit_state
 from langchain_openai import ChatOpenAI
 
-from state import OnboardingState
+from state import OnboardingState, RunUsage
+from budget import RunBudget, add_usage, record_llm_call, cost_summary
 from config import Config
+from metrics import Metrics
+from routing import RoutingPolicy
+from concurrency import LoopLocalSemaphore
+from checkpoint import SqliteDeltaSaver
+from emitter import state_emitter
+from prefetch import Prefetcher
 
 from tools.steps import getSteps, getStepById
-from tools.questions import getQuestions, getQuestionsByStep, getQuestionById
-from query_builder import QueryBuilderAgent
+from tools.questions import catalog, getQuestions, getQuestionsByStep, getQuestionById
+from query_builder import QueryBuilderAgent, counting_usage
 
 load_dotenv('.env')
 
+# State field each tool's result is stored in; the other tools only answer the LLM
+TOOL_RESULT_FIELDS = {
+    "getSteps": "steps",
+    "getQuestions": "questions",
+    "getQuestionsByStep": "questions",
+    "buildQuery": "query_results",
+    "getQueryData": "query_results",
+    "getAggregateData": "query_results",
+    "getMoreQueryData": "query_results",
+}
+
 cfg = Config()
 
 class OnboardingAgent:
-    def __init__(self):
+    def __init__(
+        self,
+        fast_path: bool = True,
+        budget: RunBudget = None,
+        fan_out: bool = False,
+        max_llm_calls: int = 4,
+        checkpointer: SqliteDeltaSaver = None
+    ):
+        """
+        Args:
+            fast_path: Route by state instead of asking the LLM when the next node is determined
+            budget: Per-run hop, token and time budget; defaults to the Config values
+            fan_out: Prepare the questions and queries of all steps in parallel
+                branches instead of one orchestrator round trip each
+            max_llm_calls: Maximum number of in-flight query-building LLM calls in fan-out mode
+            checkpointer: Checkpoint store for resumable runs; defaults to a
+                SqliteDeltaSaver on Config.CHECKPOINT_DB when that is set
+        """
+        self.metrics = Metrics()
+        self.routing = RoutingPolicy(enabled=fast_path, fan_out=fan_out)
+        self.llm_slots = LoopLocalSemaphore(max_llm_calls)
+        self.prefetcher = Prefetcher(self.metrics)
+        self.budget = budget or RunBudget(
+            max_hops=cfg.MAX_HOPS,
+            max_tokens=cfg.MAX_TOKENS,
+            max_seconds=cfg.MAX_SECONDS
+        )
+        if checkpointer is None and cfg.CHECKPOINT_DB:
+            checkpointer = SqliteDeltaSaver(
+                cfg.CHECKPOINT_DB,
+                serde=JsonPlusSerializer(allowed_msgpack_modules=[("state", "RunUsage")])
+            )
+        self.checkpointer = checkpointer
         self.query_builder = QueryBuilderAgent()  # Initialize query_builder first
         self._initialize_tools()
         self._build_workflow()
@@ -39,6 +93,8 @@ class OnboardingAgent:
             getQuestionById,
             self.query_builder.tools[0],  # buildQuery tool
             self.query_builder.tools[1],  # getQueryData tool
+            self.query_builder.tools[2],  # getAggregateData tool
+            self.query_builder.tools[3],  # getMoreQueryData tool
         ]
         # Create name mapping using the tool's name from the decorator
         self.tools_by_name = {
@@ -49,8 +105,14 @@ class OnboardingAgent:
             "getQuestionById": getQuestionById,
             "buildQuery": self.query_builder.tools[0],
             "getQueryData": self.query_builder.tools[1],
+            "getAggregateData": self.query_builder.tools[2],
+            "getMoreQueryData": self.query_builder.tools[3],
         }
 
+        # Serialize the tool schemas and bind them once, instead of on every orchestrator hop
+        self.tool_schemas = [convert_to_openai_tool(t) for t in self.tools]
+        self.model = cfg.FACTUAL_LLM.bind_tools(self.tool_schemas, parallel_tool_calls=True)
+
     def _build_workflow(self):
         # Create the graph
         workflow = StateGraph(OnboardingState)
@@ -60,21 +122,22 @@ class OnboardingAgent:
         workflow.add_node("steps_node", self.steps_node)
         workflow.add_node("questions_node", self.questions_node)
         workflow.add_node("query_node", self.query_node)
-
-        # Define the graph structure
+        workflow.add_node("tools_node", self.tools_node)
+
+        # Fan-out mode: one branch per step, then one branch per question
+        workflow.add_node("prepare_workspace", self.prepare_workspace)
+        workflow.add_node("load_step_questions", self.load_step_questions)
+        workflow.add_node("dispatch_queries", self.dispatch_queries)
+        workflow.add_node("build_question_query", self.build_question_query)
+        workflow.add_node("merge_workspace", self.merge_workspace)
+        workflow.add_edge("load_step_questions", "dispatch_queries")
+        workflow.add_edge("build_question_query", "merge_workspace")
+
+        # Define the graph structure; nodes route with Command, so no static edges
         workflow.set_entry_point("orchestrator")
 
-        # Add edges
-        workflow.add_edge("orchestrator", "steps_node")
-        workflow.add_edge("steps_node", "questions_node")
-        workflow.add_edge("questions_node", "query_node")
-        workflow.add_edge("query_node", "orchestrator")
-
-        # Set finish point
-        workflow.set_finish_point("orchestrator")
-
-        # Initialize with default state
-        initial_state = OnboardingState(
+        # Default input for a new onboarding run
+        self.initial_state = OnboardingState(
             messages=[HumanMessage(content="Let's start the onboarding process.")],
             steps=[],
             current_step=None,
@@ -82,14 +145,17 @@ class OnboardingAgent:
             query_results=None
         )
 
-        # Compile the graph with the initial state
-        self.graph = workflow.compile(initial_state)
+        # Each hop is checkpointed per thread_id when a checkpointer is configured
+        self.graph = workflow.compile(checkpointer=self.checkpointer)
 
     def _build_system_prompt(self, state: OnboardingState) -> str:
         return """You are an expert onboarding assistant. Follow these steps:
 1. First, get the list of steps using getSteps
 2. Then, get questions for the current step using getQuestions
 3. Finally, use the query builder to generate and execute SOQL queries
+   For counts, totals or averages, call getAggregateData with COUNT/SUM/AVG and GROUP BY
+   instead of fetching the records with getQueryData
+   Results come a page at a time; call getMoreQueryData with nextCursor only when more records are needed
 
 Current State:
 - Steps: {steps_count}
@@ -103,109 +169,374 @@ Current State:
             has_results="Available" if state.query_results else "None"
         )
 
-    async def orchestrator_node(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["steps_node", "questions_node", "query_node", "__end__"]]:
+    async def run(self, thread_id: str, message: str = None, workspace_id: str = None) -> Dict[str, Any]:
+        """Start or resume the onboarding run of a thread.
+
+        With a checkpointer, a thread that already has checkpoints continues
+        from its latest state; the run budget starts over for the new turn.
+
+        Args:
+            thread_id: Conversation to start or resume
+            message: Optional user message for this turn
+            workspace_id: Workspace whose steps and questions a new run
+                onboards; a resumed thread keeps its own
+
+        Returns:
+            The final state values
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        existing = self.checkpointer and await self.checkpointer.aget_tuple(config)
+        if not existing:
+            run_input = self.initial_state.model_copy(update={"workspace_id": workspace_id})
+            if message:
+                run_input = run_input.model_copy(update={"messages": [HumanMessage(content=message)]})
+        else:
+            run_input = {"usage": RunUsage(), "budget_exhausted": None, "last_node": None}
+            if message:
+                # messages has no reducer, so the new turn is appended to the saved history
+                history = existing.checkpoint["channel_values"].get("messages", [])
+                run_input["messages"] = [*history, HumanMessage(content=message)]
+            self.metrics.incr("checkpoint.resumed")
+
+        result = await self.graph.ainvoke(run_input, config)
+
+        if self.checkpointer:
+            # Only this thread's checkpoints, off the event loop: pruning deserializes each one it keeps
+            await self.checkpointer.aprune_checkpoints(keep_last=cfg.CHECKPOINT_KEEP_LAST, thread_id=thread_id)
+        return result
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Orchestrator hop timings, LLM-routed versus rule-routed hop counts, query builder caches and the catalog."""
+        return {**self.metrics.summary(), **self.query_builder.get_metrics(), "catalog": catalog.get_metrics()}
+
+    async def orchestrator_node(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["steps_node", "questions_node", "query_node", "tools_node", "prepare_workspace", "__end__"]]:
         """Main orchestrator node that decides the flow"""
+        hop_start = time.perf_counter()
+        timing = {"llm": 0.0}
+        try:
+            budget = self.budget.for_run(config)
+            usage = state.usage.model_copy()
+            if usage.started_at is None:
+                usage.started_at = time.time()
+                state_emitter.start_run(config)
+                self.prefetcher.finish_run(config)
+            usage.hops += 1
+
+            # Stop gracefully, keeping partial results, once a budget is used up
+            exhausted = budget.exhausted(usage)
+            if exhausted:
+                self.metrics.incr("budget.exhausted")
+                self.prefetcher.finish_run(config)
+                logging.warning(f"Ending onboarding run: {exhausted}")
+                return Command(goto="__end__", update={
+                    "messages": [*state.messages, AIMessage(
+                        content=f"Stopping the onboarding run: {exhausted}. Results so far are kept."
+                    )],
+                    "usage": usage,
+                    "budget_exhausted": exhausted,
+                    "run_summary": {
+                        **cost_summary(usage, budget, stopped_by=exhausted),
+                        "emitted": state_emitter.finish_run(config)
+                    }
+                })
+
+            command = await self._orchestrate(state, config, timing, usage)
+            update = {**(command.update or {}), "usage": usage}
+            if command.goto == "__end__":
+                self.prefetcher.finish_run(config)
+                update["run_summary"] = {**cost_summary(usage, budget), "emitted": state_emitter.finish_run(config)}
+            return Command(goto=command.goto, update=update)
+        finally:
+            hop_seconds = time.perf_counter() - hop_start
+            self.metrics.incr("orchestrator.hops")
+            self.metrics.observe("orchestrator.hop", hop_seconds)
+            self.metrics.observe("orchestrator.llm", timing["llm"])
+            self.metrics.observe("orchestrator.overhead", hop_seconds - timing["llm"])
+
+    async def _orchestrate(self, state: OnboardingState, config: RunnableConfig, timing: Dict[str, float], usage: RunUsage) -> Command[Literal["steps_node", "questions_node", "query_node", "tools_node", "prepare_workspace", "__end__"]]:
         try:
             if not state.messages:
-                state.messages = [HumanMessage(content="Let's start by getting the steps.")]
-                return Command(goto="steps_node")
-
-            # Call LLM to decide next step
-            model = cfg.FACTUAL_LLM.bind_tools(self.tools, parallel_tool_calls=False)
-            response = await model.ainvoke([
+                return Command(
+                    goto="steps_node",
+                    update={"messages": [HumanMessage(content="Let's start by getting the steps.")]}
+                )
+
+            # Skip the LLM whenever the state alone determines the next node
+            next_node = self.routing.route(state)
+            if next_node:
+                self.metrics.incr("routing.rule")
+                return Command(goto=next_node)
+
+            # Call LLM to decide next step, fetching the likely next data meanwhile
+            self.metrics.incr("routing.llm")
+            self._launch_prefetches(state, config)
+            llm_start = time.perf_counter()
+            response = await self.model.ainvoke([
                 SystemMessage(content=self._build_system_prompt(state)),
                 *state.messages
             ], config)
+            timing["llm"] = time.perf_counter() - llm_start
+            record_llm_call(usage, response)
 
             # Add response to messages
-            state.messages.append(response)
+            messages = [*state.messages, response]
             response = cast(AIMessage, response)
 
-            # Check for tool calls in the response
+            # Run all tool calls of the response together
             if hasattr(response, 'tool_calls') and response.tool_calls:
-                tool_call = response.tool_calls[0]  # Get the first tool call
-                tool_name = tool_call.get('name')
-
-                # Route based on tool name
-                if tool_name in ["buildQuery", "getQueryData"]:
-                    return Command(goto="query_node")
-                elif tool_name in ["getQuestions", "getQuestionsByStep", "getQuestionById"]:
-                    return Command(goto="questions_node")
-                elif tool_name in ["getSteps", "getStepById"]:
-                    return Command(goto="steps_node")
+                return Command(goto="tools_node", update={"messages": messages})
 
             # Default routing based on state
-            if not state.steps:
-                return Command(goto="steps_node")
-            elif not state.questions:
-                return Command(goto="questions_node")
-            elif not state.query_results:
-                return Command(goto="query_node")
-
-            return Command(goto="__end__")
+            return Command(goto=self.routing.next_node(state), update={"messages": messages})
         except Exception as e:
             logging.error(f"Error in orchestrator node: {str(e)}")
             # Add error message to state
-            state.messages.append(SystemMessage(
-                content=f"An error occurred: {str(e)}"
-            ))
-            return Command(goto="__end__")
+            return Command(goto="__end__", update={"messages": [
+                *state.messages,
+                SystemMessage(content=f"An error occurred: {str(e)}")
+            ]})
+
+    def _launch_prefetches(self, state: OnboardingState, config: RunnableConfig) -> None:
+        """Start fetching the steps and the current step's questions if the state lacks them.
+
+        Only LLM-decided hops prefetch, since the LLM call is the wait they
+        hide; rule-routed hops go straight to the node that fetches.
+        """
+        if not state.steps:
+            self.prefetcher.launch(config, "steps", lambda: getSteps.ainvoke({"state": {"workspace_id": state.workspace_id}}))
+        if state.current_step and not state.questions:
+            step_id = state.current_step
+            self.prefetcher.launch(config, f"questions:{step_id}", lambda: self._load_step_questions(step_id, state.workspace_id))
+
+    def _tool_state(self, state: OnboardingState) -> Dict[str, Any]:
+        """Plain-dict copy of the state handed to the tools for emission."""
+        return state.model_dump(exclude={"messages"})
 
     async def steps_node(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["orchestrator"]]:
         """Node for handling steps"""
         try:
-            # Get steps
-            result = await getSteps(state=state)
-            if isinstance(result, dict) and "result" in result:
-                state.steps = result["result"]
+            # Get steps, unless the orchestrator already prefetched them
+            prefetched, steps = await self.prefetcher.take(config, "steps")
+            if prefetched:
+                await state_emitter.emit({**self._tool_state(state), "steps": steps})
             else:
-                state.steps = result
+                result = await getSteps.ainvoke({"state": self._tool_state(state)})
+                if isinstance(result, dict) and "result" in result:
+                    steps = result["result"]
+                else:
+                    steps = result
+            update = {"steps": steps, "last_node": "steps_node"}
 
             # Set current step if not set
-            if not state.current_step and state.steps:
-                state.current_step = state.steps[0]["id"]
+            if not state.current_step and steps:
+                update["current_step"] = steps[0]["id"]
 
-            return Command(goto="orchestrator")
+            return Command(goto="orchestrator", update=update)
         except Exception as e:
             logging.error(f"Error in steps node: {str(e)}")
-            return Command(goto="orchestrator")
+            return Command(goto="orchestrator", update={"last_node": "steps_node"})
 
     async def questions_node(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["orchestrator"]]:
         """Node for handling questions"""
         try:
             if not state.current_step:
-                return Command(goto="orchestrator")
+                return Command(goto="orchestrator", update={"last_node": "questions_node"})
 
-            # Get questions for current step
-            result = await getQuestionsByStep(stepId=state.current_step, state=state)
-            if isinstance(result, dict) and "result" in result:
-                state.questions = result["result"]
+            # Get questions for current step, unless the orchestrator already prefetched them
+            prefetched, questions = await self.prefetcher.take(config, f"questions:{state.current_step}")
+            if prefetched:
+                await state_emitter.emit({**self._tool_state(state), "questions": questions})
             else:
-                state.questions = result
-
-            return Command(goto="orchestrator")
+                result = await getQuestionsByStep.ainvoke({
+                    "stepId": state.current_step,
+                    "state": self._tool_state(state)
+                })
+                if isinstance(result, dict) and "result" in result:
+                    questions = result["result"]
+                else:
+                    questions = result
+
+            return Command(goto="orchestrator", update={"questions": questions, "last_node": "questions_node"})
         except Exception as e:
             logging.error(f"Error in questions node: {str(e)}")
-            return Command(goto="orchestrator")
+            return Command(goto="orchestrator", update={"last_node": "questions_node"})
 
     async def query_node(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["orchestrator"]]:
         """Node for handling queries"""
+        usage = state.usage.model_copy()
         try:
             if not state.questions:
-                return Command(goto="orchestrator")
+                return Command(goto="orchestrator", update={"last_node": "query_node"})
+
+            # A used-up budget skips the query; the orchestrator then ends the run
+            exhausted = self.budget.for_run(config).exhausted(usage)
+            if exhausted:
+                logging.warning(f"Not building the query: {exhausted}")
+                return Command(goto="orchestrator", update={"last_node": "query_node"})
 
             # Build and execute query for the first question
             question = state.questions[0]
-            state, query_result = await self.query_builder.execute(
-                query_description=question["description"],
-                state=state
-            )
-            state.query_results = query_result
+            with counting_usage(usage):
+                _, query_result = await self.query_builder.execute(
+                    query_description=question["description"],
+                    state=self._tool_state(state)
+                )
 
-            return Command(goto="orchestrator")
+            return Command(goto="orchestrator", update={"query_results": query_result, "last_node": "query_node", "usage": usage})
         except Exception as e:
             logging.error(f"Error in query node: {str(e)}")
-            return Command(goto="orchestrator")
+            return Command(goto="orchestrator", update={"last_node": "query_node", "usage": usage})
+
+    async def _call_tool(self, tool_call: Dict[str, Any], tool_state: Dict[str, Any], usage: RunUsage, budget: RunBudget) -> Any:
+        """Run one tool call of the LLM and unwrap its result."""
+        name = tool_call["name"]
+        tool = self.tools_by_name.get(name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {name}")
+        # buildQuery is the tool calling the LLM, so it is refused once the budget is used up
+        if name == "buildQuery":
+            exhausted = budget.exhausted(usage)
+            if exhausted:
+                raise RuntimeError(f"Not building the query: {exhausted}")
+
+        args = {**tool_call.get("args", {}), "state": dict(tool_state)}
+        start = time.perf_counter()
+        try:
+            # buildQuery is a plain coroutine function, the others are tools
+            result = await tool.ainvoke(args) if hasattr(tool, "ainvoke") else await tool(**args)
+        finally:
+            self.metrics.observe(f"tool.{name}", time.perf_counter() - start)
+
+        # Query tools return (state, result); list tools wrap their result for the LLM
+        if isinstance(result, tuple):
+            result = result[-1]
+        if isinstance(result, dict) and "result" in result:
+            result = result["result"]
+        return result
+
+    async def tools_node(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["orchestrator"]]:
+        """Node running every tool call of the last LLM response concurrently"""
+        tool_calls = state.messages[-1].tool_calls if state.messages else []
+        tool_state = self._tool_state(state)
+        usage = state.usage.model_copy()
+        budget = self.budget.for_run(config)
+        self.metrics.incr("tools.calls", len(tool_calls))
+        with counting_usage(usage):
+            results = await asyncio.gather(
+                *(self._call_tool(tool_call, tool_state, usage, budget) for tool_call in tool_calls),
+                return_exceptions=True
+            )
+
+        # One ToolMessage per call, in call order; results also fill the state fields
+        messages = list(state.messages)
+        update = {"last_node": "tools_node", "usage": usage}
+        for tool_call, result in zip(tool_calls, results):
+            if isinstance(result, Exception):
+                logging.error(f"Error in tool {tool_call['name']}: {str(result)}")
+                self.metrics.incr("tools.errors")
+                messages.append(ToolMessage(
+                    content=f"Error: {str(result)}",
+                    name=tool_call["name"],
+                    tool_call_id=tool_call["id"],
+                    status="error"
+                ))
+                continue
+
+            messages.append(ToolMessage(
+                content=json.dumps(result, default=str),
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"]
+            ))
+            field = TOOL_RESULT_FIELDS.get(tool_call["name"])
+            if field:
+                update[field] = result
+
+        if update.get("steps") and not state.current_step:
+            update["current_step"] = update["steps"][0]["id"]
+        update["messages"] = messages
+        return Command(goto="orchestrator", update=update)
+
+    async def _load_step_questions(self, step_id: str, workspace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        result = await getQuestionsByStep.ainvoke({"stepId": step_id, "state": {"workspace_id": workspace_id}})
+        if isinstance(result, dict) and "result" in result:
+            return result["result"]
+        return result
+
+    def _ordered_questions(self, state: OnboardingState) -> List[Dict[str, Any]]:
+        """Questions of all steps, in step order."""
+        return [
+            question
+            for step in state.steps
+            for question in state.questions_by_step.get(step["id"], [])
+        ]
+
+    async def prepare_workspace(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["load_step_questions", "dispatch_queries"]]:
+        """Fan out question loading to one branch per step"""
+        sends = [
+            Send("load_step_questions", {"step_id": step["id"], "workspace_id": state.workspace_id})
+            for step in state.steps
+        ]
+        return Command(goto=sends or "dispatch_queries")
+
+    async def load_step_questions(self, task: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        """Fan-out branch loading the questions of a single step; receives the Send payload"""
+        step_id = task["step_id"]
+        try:
+            questions = await self._load_step_questions(step_id, task.get("workspace_id"))
+        except Exception as e:
+            logging.error(f"Error loading questions for step {step_id}: {str(e)}")
+            questions = []
+        return {"questions_by_step": {step_id: questions}}
+
+    async def dispatch_queries(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["build_question_query", "merge_workspace"]]:
+        """Fan out query building to one branch per loaded question"""
+        # Shared by the branches, so each checks the budget against what the others spent so far
+        usage = state.usage.model_copy()
+        sends = [
+            Send("build_question_query", {"question": question, "usage": usage})
+            for question in self._ordered_questions(state)
+        ]
+        return Command(goto=sends or "merge_workspace")
+
+    async def build_question_query(self, task: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        """Fan-out branch building and running the query of a single question; receives the Send payload"""
+        question = task["question"]
+        usage = task["usage"]
+        spent = RunUsage()
+        try:
+            # Bound the number of query-building LLM calls in flight
+            async with self.llm_slots:
+                exhausted = self.budget.for_run(config).exhausted(usage)
+                if exhausted:
+                    raise RuntimeError(f"Not building the query: {exhausted}")
+                with counting_usage(spent):
+                    _, result = await self.query_builder.execute(query_description=question["description"])
+        except Exception as e:
+            logging.error(f"Error building query for question {question['id']}: {str(e)}")
+            result = {"error": str(e)}
+        finally:
+            add_usage(usage, spent)
+        return {
+            "query_results_by_question": {question["id"]: result},
+            "query_usage_by_question": {question["id"]: spent}
+        }
+
+    async def merge_workspace(self, state: OnboardingState, config: RunnableConfig) -> Command[Literal["orchestrator"]]:
+        """Merge the fan-out results back into the sequential state fields"""
+        questions = self._ordered_questions(state)
+        usage = state.usage.model_copy()
+        for spent in state.query_usage_by_question.values():
+            add_usage(usage, spent)
+        update = {"questions": questions, "workspace_ready": True, "last_node": "merge_workspace", "usage": usage}
+
+        # The first successful query stands in for the sequential query_results
+        for question in questions:
+            result = state.query_results_by_question.get(question["id"])
+            if result and "error" not in result:
+                update["query_results"] = result
+                break
+
+        return Command(goto="orchestrator", update=update)
 
 # Create the graph instance
 graph = OnboardingAgent().graph
@@ -0,0 +1,47 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+class Metrics:
+    """In-process counters and timings for the onboarding graph."""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, List[float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record one timing sample, in seconds."""
+        self.timings.setdefault(name, []).append(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time the body of a with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        self.counters.clear()
+        self.timings.clear()
+
+    def summary(self) -> Dict[str, Dict]:
+        """Summarize counters and timings (count, total, mean and max in ms)."""
+        return {
+            "counters": dict(self.counters),
+            "timings": {
+                name: {
+                    "count": len(samples),
+                    "total_ms": sum(samples) * 1000,
+                    "mean_ms": sum(samples) * 1000 / len(samples),
+                    "max_ms": max(samples) * 1000
+                }
+                for name, samples in self.timings.items()
+                if samples
+            }
+        }
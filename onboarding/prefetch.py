@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from langchain_core.runnables import RunnableConfig
+
+from metrics import Metrics
+from emitter import run_key, state_emitter
+
+class Prefetcher:
+    """Speculative fetches shared between the orchestrator and the nodes of a run.
+
+    The orchestrator launches fetches of data the next node is likely to
+    need while it waits for the LLM; the node then takes the result instead
+    of fetching it again. Results are kept per run (keyed by thread id) and
+    whatever was never taken counts as wasted when the run ends.
+    """
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self._runs: Dict[str, Dict[str, asyncio.Task]] = {}
+
+    def launch(self, config: RunnableConfig, name: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        """Start fetching ``name`` in the background unless it is already in flight or done."""
+        tasks = self._runs.setdefault(run_key(config), {})
+        if name in tasks:
+            return
+        # Speculative results must not reach the frontend until a node uses them
+        with state_emitter.muted():
+            task = tasks[name] = asyncio.create_task(fetch())
+        # Failures of prefetches nobody takes are expected, not worth an asyncio warning
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.metrics.incr("prefetch.launched")
+
+    async def take(self, config: RunnableConfig, name: str) -> Tuple[bool, Any]:
+        """Take a prefetched result; returns (hit, value)."""
+        task = self._runs.get(run_key(config), {}).pop(name, None)
+        if task is None:
+            self.metrics.incr("prefetch.miss")
+            return False, None
+        try:
+            value = await task
+        except Exception as e:
+            logging.warning(f"Prefetch of {name} failed: {str(e)}")
+            self.metrics.incr("prefetch.failed")
+            return False, None
+        self.metrics.incr("prefetch.used")
+        return True, value
+
+    def finish_run(self, config: RunnableConfig) -> int:
+        """Drop a run's prefetches that were never taken; returns how many."""
+        tasks = self._runs.pop(run_key(config), {})
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+        if tasks:
+            self.metrics.incr("prefetch.wasted", len(tasks))
+        return len(tasks)
@@ -1,12 +1,26 @@
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, List, Dict, Any, Optional
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 import logging
+import time
 from datetime import datetime
-from copilotkit.langchain import copilotkit_emit_state
-from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 
+from budget import record_llm_call
+from config import Config
+from dataset import MOCK_RECORDS, load_database
+from emitter import state_emitter
+from metrics import Metrics
+from soql import SOQLError, check, extract_soql, repair_prompt
+from soql.cursors import CursorStore
+from soql.result_cache import ResultCache
+from translation_cache import TranslationCache
+from schema_registry import SchemaRegistry
+from soql_synth import SOQLSynthesizer
+from state import RunUsage
+
 # Base schema for common Salesforce objects
 SALESFORCE_SCHEMA = {
     "Opportunity": {
@@ -35,10 +49,36 @@ SALESFORCE_SCHEMA = {
     }
 }
 
+cfg = Config()
+
+# Translations are only valid for the schema they were generated against
+translation_cache = TranslationCache(cfg.TRANSLATION_CACHE_DB or None, SALESFORCE_SCHEMA)
+
+metrics = Metrics()
+
+# Descriptions the schema alone explains are turned into SOQL without the LLM
+synthesizer = SOQLSynthesizer(SALESFORCE_SCHEMA, threshold=cfg.SYNTHESIS_THRESHOLD)
+
+# Query prompts only carry the objects and fields a description is about
+schema_registry = SchemaRegistry(SALESFORCE_SCHEMA)
+
+# Run usage the translation calls are added to, set with counting_usage
+run_usage: ContextVar[Optional[RunUsage]] = ContextVar("query_run_usage", default=None)
+
+@contextmanager
+def counting_usage(usage: RunUsage):
+    """Add the LLM calls of queries built in this context, and in tasks created from it, to ``usage``."""
+    token = run_usage.set(usage)
+    try:
+        yield
+    finally:
+        run_usage.reset(token)
+
 class QueryBuilderInput(BaseModel):
     query_description: str = Field(description="Natural language description of the query")
     state: Optional[Dict] = Field(description="State of the query builder")
 
+@state_emitter.coalesce
 async def buildQuery(query_description: str, state: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Converts natural language to SOQL query and executes it.
@@ -56,52 +96,39 @@ async def buildQuery(query_description: str, state: Optional[Dict] = None) -> Di
 
         logging.info(f"Building query for: {query_description}")
 
-        config = RunnableConfig()
-        await copilotkit_emit_state(config, state)
-
-        # Create prompt for the LLM
-        prompt = [
-            {
-                "role": "system",
-                "content": """You are a SOQL query expert. Convert natural language to SOQL queries.
-                Use the following schema as reference:
-                {schema}
-
-                Rules:
-                1. Always include Id in the SELECT clause
-                2. Use standard fields from the schema
-                3. Add appropriate WHERE clauses based on the description
-                4. Return only the SOQL query without any explanation
-                """.format(schema=SALESFORCE_SCHEMA)
-            },
-            {
-                "role": "user",
-                "content": f"Convert this to SOQL: {query_description}"
-            }
-        ]
+        await state_emitter.emit(state)
 
-        # Generate SOQL query using LLM
-        llm = ChatOpenAI(model='gpt-4', temperature=0)
-        response = llm.invoke(prompt)
-        soql_query = response.content.strip()
+        # Build the query from the schema when the description is simple enough,
+        # otherwise generate it with the LLM unless it was translated before
+        synthesis = synthesizer.synthesize(query_description)
+        soql_query = synthesis.soql if synthesis else translation_cache.get(query_description)
+        if soql_query is None:
+            start = time.perf_counter()
+            # Prompt with the schema pruned to what the description is about
+            schema = schema_registry.relevant(query_description) if cfg.SCHEMA_PRUNING else SALESFORCE_SCHEMA
+            soql_query = await translate(cfg.SOQL_LLM, generation_prompt(query_description, schema))
+            translation_cache.put(query_description, soql_query, time.perf_counter() - start)
 
         # Store the generated query in state
-        state.generated_query = soql_query
-        await copilotkit_emit_state(config, state)
+        state["generated_query"] = soql_query
+        await state_emitter.emit(state)
 
         # Execute the query using getQueryData tool
-        state, query_results = await getQueryData(soql_query, state)
+        state, query_results = await getQueryData.coroutine(soql_query, state)
 
-        # Combine all results
+        # Combine all results; the first page, with the cursor to the rest
         final_results = {
             "query": soql_query,
             "results": query_results["results"],
+            "totalSize": query_results["totalSize"],
+            "done": query_results["done"],
+            "nextCursor": query_results["nextCursor"],
             "timestamp": datetime.now().isoformat()
         }
 
         # Update state with final results
-        state.final_results = final_results
-        await copilotkit_emit_state(config, state)
+        state["final_results"] = final_results
+        await state_emitter.emit(state)
 
         return state, final_results
 
@@ -109,6 +136,98 @@ async def buildQuery(query_description: str, state: Optional[Dict] = None) -> Di
         logging.error(f"Error in buildQuery: {str(e)}")
         raise
 
+def generation_prompt(query_description: str, schema: Dict[str, Any]) -> List[Dict[str, str]]:
+    """The messages asking the LLM to translate a description into SOQL over the given schema."""
+    return [
+        {
+            "role": "system",
+            "content": """You are a SOQL query expert. Convert natural language to SOQL queries.
+            Use the following schema as reference:
+            {schema}
+
+            Rules:
+            1. Always include Id in the SELECT clause
+            2. Use standard fields from the schema
+            3. Add appropriate WHERE clauses based on the description
+            4. Return only the SOQL query without any explanation
+            """.format(schema=schema)
+        },
+        {
+            "role": "user",
+            "content": f"Convert this to SOQL: {query_description}"
+        }
+    ]
+
+async def translate(llm: ChatOpenAI, prompt: List[Dict[str, str]]) -> str:
+    """Generate a query with the LLM and validate it, with one repair round for invalid output.
+
+    The repair prompt lists the parser's and validator's errors, so the LLM
+    only fixes those instead of translating the description again. Both
+    calls count toward the run usage set with counting_usage.
+
+    Returns:
+        The query in canonical form
+
+    Raises:
+        SOQLError: If the repaired query is still invalid
+    """
+    usage = run_usage.get()
+    response = await llm.ainvoke(prompt)
+    if usage is not None:
+        record_llm_call(usage, response)
+    try:
+        return check(response.content, SALESFORCE_SCHEMA).to_soql()
+    except SOQLError as e:
+        metrics.incr("soql.invalid")
+        logging.warning(f"Invalid SOQL from the LLM, repairing: {str(e)}")
+        repair = [
+            *prompt,
+            {"role": "assistant", "content": response.content},
+            {"role": "user", "content": repair_prompt(extract_soql(response.content), e.errors)}
+        ]
+
+    response = await llm.ainvoke(repair)
+    if usage is not None:
+        record_llm_call(usage, response)
+    try:
+        soql_query = check(response.content, SALESFORCE_SCHEMA).to_soql()
+    except SOQLError:
+        metrics.incr("soql.repair_failed")
+        raise
+    metrics.incr("soql.repaired")
+    return soql_query
+
+# Fields onboarding previews filter on: picklists and flags get bitmap
+# indexes, foreign keys hash indexes
+INDEXED_FIELDS = {
+    "Opportunity": {"StageName": "bitmap", "IsClosed": "bitmap", "AccountId": "hash"},
+    "Account": {"Type": "bitmap", "Industry": "bitmap"},
+    "Contact": {"AccountId": "hash"},
+}
+
+# Records getQueryData runs queries against: the bundled mock records unless
+# ONBOARDING_DATASET names another records file or a columnar dataset
+database = load_database(cfg.DATASET or MOCK_RECORDS, mmap=cfg.DATASET_MMAP)
+database.create_indexes(INDEXED_FIELDS)
+
+# Previews opened again reuse the result until it expires or its objects are
+# written. Without a write log this process never hears of the writes the
+# query_builder_with_data agent makes, so results are not cached at all.
+result_cache = ResultCache(
+    ttl_seconds=cfg.QUERY_RESULT_TTL,
+    max_entries=cfg.QUERY_RESULT_CACHE_SIZE,
+    write_log=cfg.WRITE_LOG
+) if cfg.WRITE_LOG else None
+
+# Results beyond the first page wait here until getMoreQueryData asks for them
+cursors = CursorStore(
+    database,
+    page_size=cfg.QUERY_PAGE_SIZE,
+    ttl_seconds=cfg.QUERY_CURSOR_TTL,
+    max_cursors=cfg.QUERY_MAX_CURSORS,
+    results=result_cache
+)
+
 class GetQueryDataInput(BaseModel):
     soql_query: str = Field(description="The SOQL query to execute")
     state: Optional[Dict] = Field(description="State of the query data")
@@ -117,8 +236,10 @@ class GetQueryDataInput(BaseModel):
     "getQueryData",
     args_schema=GetQueryDataInput,
     return_direct=True,
-    description="Execute a SOQL query and return mock data results."
+    description="Execute a SOQL query and return the first page of mock data results, "
+                "with a nextCursor for getMoreQueryData when more records remain."
 )
+@state_emitter.coalesce
 async def getQueryData(soql_query: str, state: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Executes a SOQL query and returns mock data results.
@@ -128,7 +249,7 @@ async def getQueryData(soql_query: str, state: Optional[Dict] = None) -> Dict[st
         state (Optional[Dict]): State of the query data
 
     Returns:
-        Dict[str, Any]: Mock query results
+        Dict[str, Any]: The first page of results, with "totalSize", "done" and "nextCursor"
     """
     try:
         if state is None:
@@ -136,114 +257,179 @@ async def getQueryData(soql_query: str, state: Optional[Dict] = None) -> Dict[st
 
         logging.info(f"Getting data for query: {soql_query}")
 
-        config = RunnableConfig()
-        await copilotkit_emit_state(config, state)
-
-        # Mock data generation based on the query
-        mock_data = {
-            "Opportunity": [
-                {
-                    "Id": "0061a00000A1B2C3",
-                    "Name": "Sample Opportunity 1",
-                    "AccountId": "0011a00000X1Y2Z3",
-                    "Amount": 50000,
-                    "CloseDate": "2024-12-31",
-                    "StageName": "Prospecting",
-                    "IsClosed": False
-                },
-                {
-                    "Id": "0061a00000D4E5F6",
-                    "Name": "Sample Opportunity 2",
-                    "AccountId": "0011a00000G7H8I9",
-                    "Amount": 75000,
-                    "CloseDate": "2024-11-30",
-                    "StageName": "Closed Won",
-                    "IsClosed": True
-                }
-            ],
-            "Account": [
-                {
-                    "Id": "0011a00000X1Y2Z3",
-                    "Name": "Acme Corporation",
-                    "Type": "Customer",
-                    "Industry": "Technology",
-                    "BillingCity": "San Francisco",
-                    "BillingState": "CA",
-                    "BillingCountry": "USA",
-                    "Phone": "555-0123",
-                    "Website": "www.acme.com"
-                },
-                {
-                    "Id": "0011a00000G7H8I9",
-                    "Name": "Tech Solutions Inc",
-                    "Type": "Customer",
-                    "Industry": "Technology",
-                    "BillingCity": "New York",
-                    "BillingState": "NY",
-                    "BillingCountry": "USA",
-                    "Phone": "555-0456",
-                    "Website": "www.techsolutions.com"
-                }
-            ],
-            "Contact": [
-                {
-                    "Id": "0031a00000J1K2L3",
-                    "Name": "John Doe",
-                    "Email": "john.doe@acme.com",
-                    "Phone": "555-0789",
-                    "Title": "CEO",
-                    "Department": "Executive",
-                    "AccountId": "0011a00000X1Y2Z3"
-                },
-                {
-                    "Id": "0031a00000M4N5O6",
-                    "Name": "Jane Smith",
-                    "Email": "jane.smith@techsolutions.com",
-                    "Phone": "555-0123",
-                    "Title": "CTO",
-                    "Department": "Technology",
-                    "AccountId": "0011a00000G7H8I9"
-                }
-            ]
+        await state_emitter.emit(state)
+
+        # Reject malformed queries instead of silently returning no rows
+        query = check(soql_query, SALESFORCE_SCHEMA)
+        soql_query = query.to_soql()
+
+        # Run the projection, filters, ordering and LIMIT/OFFSET over the mock records;
+        # only the first page goes into state, the rest stays behind the cursor
+        query_results = {
+            "query": soql_query,
+            **cursors.open(query),
+            "timestamp": datetime.now().isoformat()
         }
 
-        # Determine which object is being queried
-        object_type = None
-        if "FROM Opportunity" in soql_query:
-            object_type = "Opportunity"
-        elif "FROM Account" in soql_query:
-            object_type = "Account"
-        elif "FROM Contact" in soql_query:
-            object_type = "Contact"
+        state["query_results"] = query_results
+        await state_emitter.emit(state)
+
+        return state, query_results
+
+    except Exception as e:
+        logging.error(f"Error in getQueryData: {str(e)}")
+        raise
+
+class GetAggregateDataInput(BaseModel):
+    soql_query: str = Field(description="A SOQL query with COUNT/SUM/AVG/MIN/MAX and optional GROUP BY")
+    state: Optional[Dict] = Field(description="State of the query data")
+
+@tool(
+    "getAggregateData",
+    args_schema=GetAggregateDataInput,
+    return_direct=True,
+    description="Execute a SOQL aggregate query (COUNT, SUM, AVG, MIN, MAX, GROUP BY) and return one row per group."
+)
+@state_emitter.coalesce
+async def getAggregateData(soql_query: str, state: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Executes a SOQL aggregate query and returns one row per group, instead
+    of the matching records for the agent to count or total itself.
+
+    Args:
+        soql_query (str): The SOQL aggregate query to execute
+        state (Optional[Dict]): State of the query data
+
+    Returns:
+        Dict[str, Any]: Aggregate rows, keyed by group field and alias (expr0, expr1, ... without one)
+    """
+    try:
+        if state is None:
+            state = {}
+
+        logging.info(f"Getting aggregates for query: {soql_query}")
+
+        await state_emitter.emit(state)
 
-        # Get mock data for the queried object
-        results = mock_data.get(object_type, []) if object_type else []
+        query = check(soql_query, SALESFORCE_SCHEMA)
+        if not query.is_aggregate:
+            raise ValueError("getAggregateData needs COUNT, SUM, AVG, MIN or MAX; use getQueryData for records")
+        soql_query = query.to_soql()
 
         query_results = {
             "query": soql_query,
-            "results": results,
+            **cursors.open(query),
             "timestamp": datetime.now().isoformat()
         }
 
-        state.query_results = query_results
-        await copilotkit_emit_state(config, state)
+        state["query_results"] = query_results
+        await state_emitter.emit(state)
 
         return state, query_results
 
     except Exception as e:
-        logging.error(f"Error in getQueryData: {str(e)}")
+        logging.error(f"Error in getAggregateData: {str(e)}")
+        raise
+
+class GetMoreQueryDataInput(BaseModel):
+    cursor: str = Field(description="The nextCursor of a previous page of results")
+    state: Optional[Dict] = Field(description="State of the query data")
+
+@tool(
+    "getMoreQueryData",
+    args_schema=GetMoreQueryDataInput,
+    return_direct=True,
+    description="Return the next page of a query's results from the nextCursor of the previous page."
+)
+@state_emitter.coalesce
+async def getMoreQueryData(cursor: str, state: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Returns the page of results a cursor points to, like Salesforce queryMore.
+
+    Args:
+        cursor (str): The nextCursor of a previous page
+        state (Optional[Dict]): State of the query data
+
+    Returns:
+        Dict[str, Any]: The page, with "totalSize", "done" and the next "nextCursor"
+    """
+    try:
+        if state is None:
+            state = {}
+
+        logging.info(f"Getting more data for cursor: {cursor}")
+
+        previous = state.get("query_results") or {}
+        query_results = {
+            "query": previous.get("query"),
+            **cursors.fetch(cursor),
+            "timestamp": datetime.now().isoformat()
+        }
+
+        state["query_results"] = query_results
+        await state_emitter.emit(state)
+
+        return state, query_results
+
+    except Exception as e:
+        logging.error(f"Error in getMoreQueryData: {str(e)}")
         raise
 
+async def streamQueryData(
+    soql_query: str,
+    state: Optional[Dict] = None,
+    page_size: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Runs a SOQL query and streams its results to the UI one page at a time.
+
+    Each page replaces ``state["query_results"]`` and is emitted before it
+    is yielded, so neither the state nor an emitted message ever holds
+    more than one page, whatever the result size.
+
+    Args:
+        soql_query (str): The SOQL query to execute
+        state (Optional[Dict]): State to emit the pages with
+        page_size (Optional[int]): Records per page; defaults to QUERY_PAGE_SIZE
+
+    Yields:
+        Dict[str, Any]: Pages shaped like getQueryData results
+    """
+    if state is None:
+        state = {}
+    query = check(soql_query, SALESFORCE_SCHEMA)
+    soql_query = query.to_soql()
+    async for page in cursors.pages(query, page_size):
+        query_results = {"query": soql_query, **page, "timestamp": datetime.now().isoformat()}
+        state["query_results"] = query_results
+        await state_emitter.emit(state)
+        yield query_results
+
 # Register the tools
 tools = [
     buildQuery,
-    getQueryData
+    getQueryData,
+    getAggregateData,
+    getMoreQueryData
 ]
 
 # Create a QueryBuilder agent that can use both tools
 class QueryBuilderAgent:
     def __init__(self):
-        self.tools = [buildQuery, getQueryData]
+        self.tools = [buildQuery, getQueryData, getAggregateData, getMoreQueryData]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """SOQL validation and repair counts, template synthesis coverage, schema pruning, translation
+        cache hit rate, index use of the local query engine, open result cursors and the result cache."""
+        return {
+            "query_builder": metrics.summary(),
+            "synthesizer": synthesizer.get_metrics(),
+            "schema_registry": schema_registry.get_metrics(),
+            "translation_cache": translation_cache.get_metrics(),
+            "engine": database.get_metrics(),
+            "cursors": cursors.get_metrics(),
+            "result_cache": result_cache.get_metrics() if result_cache else None
+        }
 
     async def execute(self, query_description: str, state: Optional[Dict] = None) -> Dict[str, Any]:
         """
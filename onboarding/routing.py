@@ -0,0 +1,72 @@
+import re
+from typing import Optional
+
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from state import OnboardingState
+
+# User turns that only ask the flow to carry on, so the state decides what is next
+CONTINUE_PATTERN = re.compile(
+    r"^\s*(let'?s\s+)?(start|begin|continue|next|go( on)?|proceed|resume|ok(ay)?|yes|sure)\b"
+    r"[\w\s',.!]*$",
+    re.IGNORECASE
+)
+
+def next_node_from_state(state: OnboardingState, fan_out: bool = False) -> str:
+    """The next node of the fixed steps -> questions -> query sequence.
+
+    In fan-out mode the questions and queries of all steps are prepared at
+    once by prepare_workspace instead.
+    """
+    if not state.steps:
+        return "steps_node"
+    if fan_out and not state.workspace_ready:
+        return "prepare_workspace"
+    if not state.questions:
+        return "questions_node"
+    if not state.query_results:
+        return "query_node"
+    return "__end__"
+
+class RoutingPolicy:
+    """Decide the orchestrator's next node without the LLM when the state determines it.
+
+    The LLM is only needed for open-ended user turns and to read the
+    results of the tool calls it made. Any other hop (the orchestrator
+    coming back from a node, or a user asking to simply carry on) follows
+    the fixed steps -> questions -> query sequence.
+    """
+
+    def __init__(self, enabled: bool = True, fan_out: bool = False):
+        self.enabled = enabled
+        self.fan_out = fan_out
+
+    def is_open_ended(self, state: OnboardingState) -> bool:
+        """Whether the latest message is a user turn that needs the LLM to interpret it."""
+        if not state.messages:
+            return False
+        last_message = state.messages[-1]
+        if not isinstance(last_message, HumanMessage):
+            return False
+        return not CONTINUE_PATTERN.match(str(last_message.content))
+
+    def has_tool_results(self, state: OnboardingState) -> bool:
+        """Whether the latest messages answer tool calls of the LLM, which it has to read."""
+        return bool(state.messages) and isinstance(state.messages[-1], ToolMessage)
+
+    def next_node(self, state: OnboardingState) -> str:
+        """The next node of the fixed sequence.
+
+        A node that just ran without producing its result is not retried:
+        the run ends instead, so a failing node cannot spin the loop.
+        """
+        next_node = next_node_from_state(state, fan_out=self.fan_out)
+        if next_node == state.last_node:
+            return "__end__"
+        return next_node
+
+    def route(self, state: OnboardingState) -> Optional[str]:
+        """Return the next node, or None if the LLM has to decide."""
+        if not self.enabled or self.is_open_ended(state) or self.has_tool_results(state):
+            return None
+        return self.next_node(state)
@@ -0,0 +1,159 @@
+import math
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from soql_synth import OBJECT_SYNONYMS, STOPWORDS, _field_words, _words
+
+# A term (a phrase of stemmed words) and what it names: (object, field or None, weight)
+Entry = Tuple[Tuple[str, ...], str, Optional[str], float]
+
+def _label(api_name: str) -> str:
+    """The name users would say: custom objects and fields drop their "__c" suffix."""
+    return api_name[:-3] if api_name.endswith("__c") else api_name
+
+class SchemaRegistry:
+    """Index of a schema's objects, fields and aliases, for pruning query prompts.
+
+    ``relevant`` returns the part of the schema a description is about:
+    the objects it names (by name, synonym or alias) or whose fields it
+    names, with their filters and up to ``max_fields`` fields each. Field
+    matches are weighted by how rare the field's words are across objects,
+    so "name" or "created date" alone do not pull in every object. The
+    objects a kept lookup field points to are not added; they are only
+    kept when the description is about them too.
+    """
+
+    def __init__(
+        self,
+        schema: Dict[str, Any],
+        aliases: Optional[Dict[str, List[str]]] = None,
+        max_objects: int = 4,
+        max_fields: int = 25,
+        fallback_objects: int = 20
+    ):
+        """
+        Args:
+            schema: Salesforce schema with standard_fields and optional common_filters per object
+            aliases: Other names of objects ("Opportunity") and fields
+                ("Opportunity.CloseDate"); object synonyms of the synthesizer are included
+            max_objects: Objects kept at most, best matches first
+            max_fields: Fields kept per object; larger objects keep Id, Name,
+                the fields the description names and lookups between kept
+                objects, then fill up in schema order
+            fallback_objects: Schemas up to this many objects are given whole
+                to descriptions that match nothing; larger ones as object names
+                with Id and Name only
+        """
+        self.schema = schema
+        self.max_objects = max_objects
+        self.max_fields = max_fields
+        self.fallback_objects = fallback_objects
+        self.lookups = 0
+        self.fallbacks = 0
+        self.objects_kept = 0
+        self.fields_kept = 0
+
+        aliases = {**OBJECT_SYNONYMS, **(aliases or {})}
+        self._objects_with_word = defaultdict(set)
+        for object_name, spec in schema.items():
+            for field_name in spec.get("standard_fields", []):
+                for word in _field_words(_label(field_name)):
+                    self._objects_with_word[word].add(object_name)
+
+        # Terms are indexed by their first word, so a description is scanned once
+        self.terms: Dict[str, List[Entry]] = defaultdict(list)
+        for object_name, spec in schema.items():
+            for name in [_label(object_name), *aliases.get(object_name, [])]:
+                self._add(_words(name), object_name, None, 3.0)
+            for field_name in spec.get("standard_fields", []):
+                names = [_field_words(_label(field_name))] + [
+                    _words(alias) for alias in aliases.get(f"{object_name}.{field_name}", [])
+                ]
+                for words in names:
+                    self._add(words, object_name, field_name, self._rarity(words))
+            for filter_name in spec.get("common_filters", {}):
+                self._add(_words(filter_name.replace("_", " ")), object_name, None, 1.0)
+
+    def _rarity(self, words: List[str]) -> float:
+        """Inverse document frequency of the rarest word over objects, scaled to 0..1.
+
+        1.0 for a word only one object's fields use (or none, as in aliases),
+        0.0 for a word every object's fields use.
+        """
+        def idf(word: str) -> float:
+            objects = len(self._objects_with_word.get(word, ()))
+            if objects == 0 or len(self.schema) < 2:
+                return 1.0
+            return math.log(len(self.schema) / objects) / math.log(len(self.schema))
+        return max((idf(word) for word in words), default=1.0)
+
+    def _add(self, words: List[str], object_name: str, field_name: Optional[str], weight: float) -> None:
+        words = tuple(word for word in words if word not in STOPWORDS) or tuple(words)
+        entries = self.terms[words[0]] if words else None
+        # An object name and its synonym may stem to the same term; count it once
+        if words and not any(entry[:3] == (words, object_name, field_name) for entry in entries):
+            entries.append((words, object_name, field_name, weight))
+
+    def match(self, description: str) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+        """Score per object and the fields named per object, for a description."""
+        words = [word for word in _words(description) if word not in STOPWORDS]
+        scores: Dict[str, float] = defaultdict(float)
+        fields: Dict[str, List[str]] = defaultdict(list)
+        for position, word in enumerate(words):
+            for term, object_name, field_name, weight in self.terms.get(word, ()):
+                if tuple(words[position:position + len(term)]) != term:
+                    continue
+                scores[object_name] += weight
+                if field_name and field_name not in fields[object_name]:
+                    fields[object_name].append(field_name)
+        return dict(scores), dict(fields)
+
+    def relevant(self, description: str) -> Dict[str, Any]:
+        """The part of the schema a description needs, in the schema's own shape.
+
+        When nothing in the description matches, the LLM has to pick an
+        object itself: small schemas are given whole, larger ones as every
+        object with only its Id and Name.
+        """
+        self.lookups += 1
+        scores, named_fields = self.match(description)
+        # Objects named outright (3.0) or whose rare fields are named (~1.0); generic field words don't count
+        ranked = sorted((name for name, score in scores.items() if score >= 0.5), key=lambda name: -scores[name])
+        kept_objects = ranked[:self.max_objects]
+        if not kept_objects:
+            self.fallbacks += 1
+            if len(self.schema) <= self.fallback_objects:
+                pruned = self.schema
+            else:
+                pruned = {
+                    object_name: {"standard_fields": [f for f in spec.get("standard_fields", []) if f in ("Id", "Name")]}
+                    for object_name, spec in self.schema.items()
+                }
+            self.objects_kept += len(pruned)
+            self.fields_kept += sum(len(spec.get("standard_fields", [])) for spec in pruned.values())
+            return pruned
+
+        pruned = {}
+        for object_name in kept_objects:
+            spec = self.schema[object_name]
+            standard_fields = spec.get("standard_fields", [])
+            if len(standard_fields) > self.max_fields:
+                wanted = {"Id", "Name", *named_fields.get(object_name, [])}
+                # Lookups to other kept objects, for the joins between them
+                wanted |= {f"{other}Id" for other in kept_objects if other != object_name}
+                kept = [f for f in standard_fields if f in wanted]
+                kept += [f for f in standard_fields if f not in wanted][:max(self.max_fields - len(kept), 0)]
+                standard_fields = [f for f in spec["standard_fields"] if f in set(kept)]
+            pruned[object_name] = {**spec, "standard_fields": standard_fields}
+            self.fields_kept += len(standard_fields)
+        self.objects_kept += len(pruned)
+        return pruned
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Lookups, how many fell back to the whole schema, and objects and fields kept per lookup."""
+        return {
+            "lookups": self.lookups,
+            "fallbacks": self.fallbacks,
+            "objects_per_prompt": self.objects_kept / self.lookups if self.lookups else 0.0,
+            "fields_per_prompt": self.fields_kept / self.lookups if self.lookups else 0.0
+        }
@@ -0,0 +1,20 @@
+from .nodes import (
+    Aggregate,
+    And,
+    Comparison,
+    DateLiteral,
+    InList,
+    InSubquery,
+    Literal,
+    Not,
+    Or,
+    OrderBy,
+    Query,
+)
+from .parser import SOQLError, extract_soql, parse
+from .validator import check, repair_prompt, validate
+
+__all__ = [
+    "Aggregate", "And", "Comparison", "DateLiteral", "InList", "InSubquery", "Literal", "Not", "Or",
+    "OrderBy", "Query", "SOQLError", "extract_soql", "parse", "check", "repair_prompt", "validate",
+]
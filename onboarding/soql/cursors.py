@@ -0,0 +1,186 @@
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .engine import Database, Table
+from .nodes import Query
+from .parser import SOQLError
+from .result_cache import ResultCache
+
+def cursor_error(message: str) -> SOQLError:
+    return SOQLError([{"kind": "cursor", "message": message, "position": None, "suggestion": "Run the query again"}])
+
+@dataclass
+class _Cursor:
+    """The remaining result of a query: row numbers to turn into records page by page.
+
+    Aggregate queries keep their (few) group records instead.
+    """
+    query: str
+    total: int
+    page_size: int
+    expires_at: float
+    table: Optional[Table] = None
+    fields: Tuple[str, ...] = ()
+    rows: Optional[np.ndarray] = None
+    groups: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes if self.rows is not None else 0
+
+class CursorStore:
+    """Server-side query cursors, modeled on Salesforce query/queryMore.
+
+    ``open`` runs a query and returns its first page; when more records
+    remain the page carries an opaque ``nextCursor`` that ``fetch`` turns
+    into the next page. Only the matching row numbers are held between
+    pages, and records are built a page at a time, so a million-row result
+    costs one integer array rather than a million dicts.
+
+    A cursor names its position ("<id>-<offset>"), so fetching the same
+    cursor twice returns the same page. Cursors expire ``ttl_seconds``
+    after their last use, and the least recently used one is dropped when
+    more than ``max_cursors`` are open.
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        page_size: int = 200,
+        ttl_seconds: float = 900.0,
+        max_cursors: int = 256,
+        results: Optional[ResultCache] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            database: Engine the queries run on
+            page_size: Records per page unless a query asks for another size
+            ttl_seconds: How long an unused cursor is kept
+            max_cursors: Open cursors kept at most; the least recently used goes first
+            results: Cache of query results shared by cursors of the same query;
+                None runs every query
+            clock: Time source, in seconds
+        """
+        self.database = database
+        self.page_size = page_size
+        self.ttl_seconds = ttl_seconds
+        self.max_cursors = max_cursors
+        self.results = results
+        self.clock = clock
+        self.cursors: "OrderedDict[str, _Cursor]" = OrderedDict()
+        self.opened = 0
+        self.pages_served = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def open(self, query: Query, page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Run a query and return its first page.
+
+        Returns:
+            Dict with "results" (the page's records), "totalSize", "done"
+            and "nextCursor" (None once done)
+        """
+        page_size = page_size or self.page_size
+        if page_size < 1:
+            raise ValueError(f"page_size must be positive, got {page_size}")
+        self.evict_expired()
+        cursor = _Cursor(query=query.to_soql(), total=0, page_size=page_size, expires_at=0.0)
+        if query.is_aggregate:
+            cursor.groups = self._run(query, lambda: self.database.execute(query))
+            cursor.total = len(cursor.groups)
+        else:
+            cursor.table, rows = self._run(query, lambda: self.database.select(query))
+            cursor.fields = query.fields
+            # Row numbers fit 32 bits for any table this engine holds; halves what a cursor keeps
+            cursor.rows = rows.astype(np.int32) if cursor.table.size < 2 ** 31 else rows
+            cursor.total = len(rows)
+        self.opened += 1
+        return self._page(secrets.token_urlsafe(12), cursor, 0)
+
+    def _run(self, query: Query, run: Callable[[], Any]) -> Any:
+        return self.results.get_or_run(query, run) if self.results else run()
+
+    def fetch(self, cursor_id: str) -> Dict[str, Any]:
+        """The page a cursor returned by ``open`` or ``fetch`` points to."""
+        key, _, position = cursor_id.rpartition("-")
+        cursor = self.cursors.get(key)
+        if cursor is not None and cursor.expires_at <= self.clock():
+            self._drop(key)
+            self.expired += 1
+            cursor = None
+        if cursor is None or not position.isdigit() or int(position) > cursor.total:
+            raise cursor_error(f"Unknown or expired query cursor {cursor_id}")
+        return self._page(key, cursor, int(position))
+
+    def close(self, cursor_id: str) -> None:
+        """Release a cursor before it is read to the end."""
+        self._drop(cursor_id.rpartition("-")[0])
+
+    async def pages(self, query: Query, page_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a query's result page by page, yielding to the event loop between pages."""
+        page = self.open(query, page_size)
+        try:
+            yield page
+            while page["nextCursor"]:
+                await asyncio.sleep(0)
+                page = self.fetch(page["nextCursor"])
+                yield page
+        finally:
+            # A consumer that stops early must not leave the cursor open
+            if page["nextCursor"]:
+                self.close(page["nextCursor"])
+
+    def evict_expired(self) -> int:
+        """Drop every expired cursor; returns how many were dropped."""
+        now = self.clock()
+        expired = [key for key, cursor in self.cursors.items() if cursor.expires_at <= now]
+        for key in expired:
+            self._drop(key)
+        self.expired += len(expired)
+        return len(expired)
+
+    def _page(self, key: str, cursor: _Cursor, start: int) -> Dict[str, Any]:
+        end = min(start + cursor.page_size, cursor.total)
+        if cursor.groups is not None:
+            results = cursor.groups[start:end]
+        else:
+            results = self.database.records(cursor.table, cursor.fields, cursor.rows[start:end])
+        self.pages_served += 1
+
+        done = end >= cursor.total
+        if done:
+            self._drop(key)
+        else:
+            cursor.expires_at = self.clock() + self.ttl_seconds
+            self.cursors[key] = cursor
+            self.cursors.move_to_end(key)
+            while len(self.cursors) > self.max_cursors:
+                self.cursors.popitem(last=False)
+                self.evicted += 1
+        return {
+            "results": results,
+            "totalSize": cursor.total,
+            "done": done,
+            "nextCursor": None if done else f"{key}-{end}"
+        }
+
+    def _drop(self, key: str) -> None:
+        self.cursors.pop(key, None)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Cursors opened, pages served, cursors dropped by TTL and by size, and what open cursors hold."""
+        return {
+            "opened": self.opened,
+            "pages_served": self.pages_served,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "open_cursors": len(self.cursors),
+            "bytes_held": sum(cursor.nbytes for cursor in self.cursors.values())
+        }
@@ -0,0 +1,988 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .nodes import (
+    RELATIONSHIP_OBJECTS,
+    Aggregate,
+    And,
+    Comparison,
+    Condition,
+    DateLiteral,
+    InList,
+    InSubquery,
+    Literal,
+    Not,
+    Or,
+    Query,
+    Value,
+)
+from .indexes import RowSet, create_index
+from .parser import SOQLError, parse
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATETIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}")
+
+def unsupported(message: str) -> SOQLError:
+    return SOQLError([{"kind": "unsupported", "message": message, "position": None, "suggestion": None}])
+
+def like_to_regex(pattern: str) -> "re.Pattern":
+    """Translate a LIKE pattern (% and _ wildcards, case-insensitive as in SOQL) to a regex."""
+    parts = [".*" if char == "%" else "." if char == "_" else re.escape(char) for char in pattern]
+    return re.compile("".join(parts), re.IGNORECASE | re.DOTALL)
+
+def _month_start(day: np.datetime64, months: int = 0) -> np.datetime64:
+    return (day.astype("datetime64[M]") + months).astype("datetime64[D]")
+
+def _quarter_start(day: np.datetime64, quarters: int = 0) -> np.datetime64:
+    month = day.astype("datetime64[M]")
+    first = month - (month.astype(int) % 3)
+    return (first + 3 * quarters).astype("datetime64[D]")
+
+def _year_start(day: np.datetime64, years: int = 0) -> np.datetime64:
+    return (day.astype("datetime64[Y]") + years).astype("datetime64[D]")
+
+def _week_start(day: np.datetime64, weeks: int = 0) -> np.datetime64:
+    # Weeks start on Sunday; 1970-01-01 was a Thursday
+    weekday = (day.astype(int) + 4) % 7
+    return day - weekday + 7 * weeks
+
+def date_range(literal: DateLiteral, today: np.datetime64) -> Tuple[np.datetime64, np.datetime64]:
+    """Start (inclusive) and end (exclusive) day of a relative date literal."""
+    one = np.timedelta64(1, "D")
+    name, n = literal.name, literal.n
+    ranges = {
+        "TODAY": (today, today + one),
+        "YESTERDAY": (today - one, today),
+        "TOMORROW": (today + one, today + 2 * one),
+        "THIS_WEEK": (_week_start(today), _week_start(today, 1)),
+        "LAST_WEEK": (_week_start(today, -1), _week_start(today)),
+        "NEXT_WEEK": (_week_start(today, 1), _week_start(today, 2)),
+        "THIS_MONTH": (_month_start(today), _month_start(today, 1)),
+        "LAST_MONTH": (_month_start(today, -1), _month_start(today)),
+        "NEXT_MONTH": (_month_start(today, 1), _month_start(today, 2)),
+        "THIS_QUARTER": (_quarter_start(today), _quarter_start(today, 1)),
+        "LAST_QUARTER": (_quarter_start(today, -1), _quarter_start(today)),
+        "NEXT_QUARTER": (_quarter_start(today, 1), _quarter_start(today, 2)),
+        "THIS_YEAR": (_year_start(today), _year_start(today, 1)),
+        "LAST_YEAR": (_year_start(today, -1), _year_start(today)),
+        "NEXT_YEAR": (_year_start(today, 1), _year_start(today, 2)),
+        "LAST_90_DAYS": (today - 90 * one, today + one),
+        "NEXT_90_DAYS": (today + one, today + 91 * one),
+    }
+    if name in ranges:
+        return ranges[name]
+    if name == "LAST_N_DAYS":
+        return today - n * one, today + one
+    if name == "NEXT_N_DAYS":
+        return today + one, today + (n + 1) * one
+    if name == "LAST_N_WEEKS":
+        return _week_start(today, -n), _week_start(today)
+    if name == "NEXT_N_WEEKS":
+        return _week_start(today, 1), _week_start(today, n + 1)
+    if name == "LAST_N_MONTHS":
+        return _month_start(today, -n), _month_start(today)
+    if name == "NEXT_N_MONTHS":
+        return _month_start(today, 1), _month_start(today, n + 1)
+    raise unsupported(f"Date literal {literal.to_soql()} is not supported")
+
+# Index lookups that would still return more than this share of a table
+# lose to one vectorized pass over its columns
+INDEX_MAX_SHARE = 0.1
+
+COMPARE = {
+    "=": np.equal, "!=": np.not_equal,
+    "<": np.less, "<=": np.less_equal,
+    ">": np.greater, ">=": np.greater_equal,
+}
+
+
+@dataclass
+class Column:
+    """One array-backed column.
+
+    kind is "number" (float64, NaN for null), "boolean" (int8, -1 for null),
+    "date" / "datetime" (datetime64, NaT for null) or "string". String
+    columns are dictionary encoded: ``data`` holds int32 codes into
+    ``categories`` (-1 for null), so predicates are evaluated once per
+    distinct value and gathered through the codes.
+
+    Predicates take the row numbers still in play (None for every row) and
+    return one boolean per such row, so conditions after the first in an
+    AND only look at the rows the earlier ones kept.
+    """
+    kind: str
+    data: np.ndarray
+    categories: Optional[np.ndarray] = None
+    _codes_by_value: Optional[Dict[str, int]] = field(default=None, repr=False)
+    _ranks: Optional[np.ndarray] = field(default=None, repr=False)
+    _folded: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @classmethod
+    def from_values(cls, values: Sequence[Any], kind: Optional[str] = None) -> "Column":
+        """Build a column from Python values, inferring its kind from the first non-null value."""
+        if kind is None:
+            sample = next((value for value in values if value is not None), None)
+            if isinstance(sample, bool):
+                kind = "boolean"
+            elif isinstance(sample, (int, float)):
+                kind = "number"
+            elif isinstance(sample, datetime) or (isinstance(sample, str) and DATETIME_PATTERN.match(sample)):
+                kind = "datetime"
+            elif isinstance(sample, date) or (isinstance(sample, str) and DATE_PATTERN.match(sample)):
+                kind = "date"
+            else:
+                kind = "string"
+
+        if kind == "number":
+            return cls(kind, np.array([np.nan if v is None else v for v in values], dtype=np.float64))
+        if kind == "boolean":
+            return cls(kind, np.array([-1 if v is None else int(bool(v)) for v in values], dtype=np.int8))
+        if kind == "date":
+            return cls(kind, np.array([str(v)[:10] if v is not None else "NaT" for v in values], dtype="datetime64[D]"))
+        if kind == "datetime":
+            return cls(kind, np.array(
+                [str(v).replace("Z", "")[:19] if v is not None else "NaT" for v in values],
+                dtype="datetime64[s]"
+            ))
+
+        strings = np.array(["" if v is None else str(v) for v in values], dtype=object)
+        categories, codes = np.unique(strings, return_inverse=True)
+        codes = codes.astype(np.int32)
+        nulls = np.array([v is None for v in values], dtype=bool)
+        codes[nulls] = -1
+        return cls.strings(codes, categories)
+
+    @classmethod
+    def strings(cls, codes: np.ndarray, categories: np.ndarray) -> "Column":
+        """A string column from dictionary codes (-1 for null) and their values."""
+        return cls("string", np.asarray(codes, dtype=np.int32), np.asarray(categories, dtype=object))
+
+    @classmethod
+    def nulls(cls, size: int) -> "Column":
+        """An all-null column for a field without data.
+
+        Its type is unknown, so it compares with any value, date literal or
+        number field aggregate and, like any null, only matches ``!=``.
+        """
+        return cls.strings(np.full(size, -1, dtype=np.int32), np.array([], dtype=object))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def untyped(self) -> bool:
+        """Whether this is a column of nulls only, built without a value to take a type from."""
+        return self.kind == "string" and len(self.categories) == 0
+
+    @property
+    def codes_by_value(self) -> Dict[str, int]:
+        if self._codes_by_value is None:
+            self._codes_by_value = {value: code for code, value in enumerate(self.categories)}
+        return self._codes_by_value
+
+    def _data(self, rows: Optional[np.ndarray]) -> np.ndarray:
+        return self.data if rows is None else self.data[rows]
+
+    def null_mask(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        data = self._data(rows)
+        if self.kind == "number":
+            return np.isnan(data)
+        if self.kind in ("date", "datetime"):
+            return np.isnat(data)
+        return data < 0
+
+    def _per_category(self, predicate, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Evaluate a predicate on the distinct values of a string column and gather it to rows.
+
+        ``predicate`` gets category numbers and returns one boolean each.
+        When fewer rows are in play than there are categories (e.g. on
+        names or emails), only the categories those rows use are evaluated.
+        Null rows are False.
+        """
+        codes = self._data(rows)
+        # One slot per category plus a last one, always False, that the null code -1 reads
+        matched = np.zeros(len(self.categories) + 1, dtype=bool)
+        if len(codes) < len(self.categories):
+            used = np.zeros(len(self.categories) + 1, dtype=bool)
+            used[codes] = True
+            used = np.flatnonzero(used[:-1])
+            matched[used[predicate(used)]] = True
+        else:
+            matched[:-1] = predicate(np.arange(len(self.categories)))
+        return matched[codes]
+
+    def _scalar(self, literal: Literal) -> Any:
+        if self.kind == "number":
+            if literal.kind != "number":
+                raise unsupported(f"Cannot compare a number with {literal.to_soql()}")
+            return literal.value
+        if self.kind == "boolean":
+            if literal.kind != "boolean":
+                raise unsupported(f"Cannot compare a boolean with {literal.to_soql()}")
+            return int(literal.value)
+        if self.kind in ("date", "datetime"):
+            if literal.kind not in ("date", "datetime"):
+                raise unsupported(f"Cannot compare a date with {literal.to_soql()}")
+            return np.datetime64(str(literal.value).replace("Z", "")[:19]).astype(self.data.dtype)
+        return str(literal.value)
+
+    def compare(self, op: str, value: Value, today: np.datetime64, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Which rows satisfy ``column op value``.
+
+        As in SOQL, null rows match ``!=`` and fail every other operator.
+        """
+        if isinstance(value, Literal) and value.kind == "null":
+            if op not in ("=", "!="):
+                raise unsupported("Only = and != can compare with null")
+            nulls = self.null_mask(rows)
+            return nulls if op == "=" else ~nulls
+
+        data = self._data(rows)
+        if self.untyped:
+            return np.full(len(data), op == "!=", dtype=bool)
+        if isinstance(value, DateLiteral):
+            if self.kind not in ("date", "datetime"):
+                raise unsupported(f"{value.to_soql()} needs a date field")
+            start, end = date_range(value, today)
+            days = data.astype("datetime64[D]")
+            ranges = {
+                "=": lambda: (days >= start) & (days < end),
+                "!=": lambda: (days < start) | (days >= end) | np.isnat(days),
+                "<": lambda: days < start,
+                "<=": lambda: days < end,
+                ">": lambda: days >= end,
+                ">=": lambda: days >= start,
+            }
+            return ranges[op]()
+
+        scalar = self._scalar(value)
+        if self.kind == "string":
+            if op in ("=", "!="):
+                code = self.codes_by_value.get(scalar, len(self.categories))
+                return data == code if op == "=" else data != code
+            return self._per_category(lambda used: COMPARE[op](self.categories[used], scalar).astype(bool), rows)
+        if self.kind == "boolean" and op != "!=":
+            return COMPARE[op](data, scalar) & (data >= 0)
+        return COMPARE[op](data, scalar)
+
+    def isin(self, values: Iterable[Value], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        data = self._data(rows)
+        if self.kind == "string":
+            matched = np.zeros(len(self.categories) + 1, dtype=bool)
+            matched[[self.codes_by_value[str(v.value)] for v in values if str(v.value) in self.codes_by_value]] = True
+            return matched[data]
+        scalars = [self._scalar(v) for v in values if isinstance(v, Literal) and v.kind != "null"]
+        if not scalars:
+            return np.zeros(len(data), dtype=bool)
+        return np.isin(data, np.array(scalars, dtype=self.data.dtype))
+
+    def like(self, pattern: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        if self.kind != "string":
+            raise unsupported("LIKE needs a string field")
+        if self._folded is None:
+            self._folded = np.char.lower(self.categories.astype(str))
+        folded = self._folded
+
+        # Prefix, suffix and substring patterns run as vectorized string operations
+        core = pattern.strip("%").lower()
+        if "%" not in core and "_" not in core:
+            starts, ends = pattern.startswith("%"), pattern.endswith("%")
+            if starts and ends:
+                match = lambda used: np.char.find(folded[used], core) >= 0
+            elif starts:
+                match = lambda used: np.char.endswith(folded[used], core)
+            elif ends:
+                match = lambda used: np.char.startswith(folded[used], core)
+            else:
+                match = lambda used: folded[used] == core
+        else:
+            regex = like_to_regex(pattern)
+            match = lambda used: np.fromiter(
+                (regex.fullmatch(value) is not None for value in self.categories[used]),
+                dtype=bool,
+                count=len(used)
+            )
+        return self._per_category(match, rows)
+
+    def sort_key(self, descending: bool, rows: np.ndarray) -> np.ndarray:
+        """A numeric key sorting the given rows by this column; null rows get an arbitrary key."""
+        if self.kind == "string":
+            if self._ranks is None:
+                # Rank of every category in sorted order, plus 0 for the null code -1
+                ranks = np.zeros(len(self.categories) + 1, dtype=np.int64)
+                ranks[np.argsort(self.categories, kind="stable")] = np.arange(len(self.categories))
+                self._ranks = ranks
+            key = self._ranks[self.data[rows]]
+        elif self.kind in ("date", "datetime"):
+            key = self.data[rows].astype(np.int64)
+        else:
+            key = np.nan_to_num(self.data[rows].astype(np.float64))
+        return -key if descending else key
+
+    def take(self, positions: np.ndarray) -> "Column":
+        """A column of the values at the given positions, null where a position is -1.
+
+        String columns keep sharing the dictionary (and its lookup caches).
+        """
+        missing = positions < 0
+        if len(self.data):
+            data = self.data[np.where(missing, 0, positions)]
+        else:
+            data = np.zeros(len(positions), dtype=self.data.dtype)
+            missing = np.ones(len(positions), dtype=bool)
+        if missing.any():
+            data[missing] = {"number": np.nan, "date": np.datetime64("NaT"), "datetime": np.datetime64("NaT")}.get(
+                self.kind, -1
+            )
+        return Column(self.kind, data, self.categories, self._codes_by_value, self._ranks, self._folded)
+
+    def values(self, rows: np.ndarray) -> List[Any]:
+        """Python values of the given rows, None for nulls."""
+        data = self.data[rows]
+        if self.kind == "string":
+            values = self.categories[data].tolist()
+            if (data < 0).any():
+                values = [None if code < 0 else value for code, value in zip(data.tolist(), values)]
+            return values
+        if self.kind == "number":
+            return [None if v != v else (int(v) if v.is_integer() else v) for v in data.tolist()]
+        if self.kind == "boolean":
+            return [None if v < 0 else bool(v) for v in data.tolist()]
+        if self.kind == "date":
+            return [None if np.isnat(v) else str(v) for v in data]
+        return [None if np.isnat(v) else f"{v}Z" for v in data]
+
+class Table:
+    """A named set of equally long columns."""
+
+    def __init__(self, name: str, columns: Dict[str, Column]):
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of {name} have different lengths: {sorted(lengths)}")
+        self.name = name
+        self.columns = columns
+        self.size = lengths.pop() if lengths else 0
+        self._lower = {column_name.lower(): column_name for column_name in columns}
+        self.indexes = {}
+        self._row_of_id = None
+
+    @classmethod
+    def from_records(cls, name: str, records: List[Dict[str, Any]]) -> "Table":
+        names = list(dict.fromkeys(key for record in records for key in record))
+        return cls(name, {
+            column_name: Column.from_values([record.get(column_name) for record in records])
+            for column_name in names
+        })
+
+    def column(self, name: str) -> Column:
+        """A column by case-insensitive name; schema fields without data read as all null."""
+        column_name = self._lower.get(name.lower())
+        if column_name is None:
+            return Column.nulls(self.size)
+        return self.columns[column_name]
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._lower
+
+    def row_of_id(self) -> np.ndarray:
+        """Row number per code of the Id column, plus a trailing -1 that null and unknown codes read."""
+        if self._row_of_id is None:
+            ids = self.column("Id")
+            row_of_id = np.full(len(ids.categories) + 1, -1, dtype=np.int64)
+            row_of_id[ids.data] = np.arange(self.size)
+            row_of_id[-1] = -1
+            self._row_of_id = row_of_id
+        return self._row_of_id
+
+    def create_index(self, field: str, kind: Optional[str] = None) -> None:
+        """Index a field for equality and IN lookups (see indexes.create_index)."""
+        column_name = self._lower.get(field.lower())
+        if column_name is None:
+            raise ValueError(f"{self.name} has no field {field}")
+        self.indexes[column_name.lower()] = create_index(column_name, self.columns[column_name], kind)
+
+    def index(self, field: str):
+        return self.indexes.get(field.lower())
+
+def translate_codes(source: Column, used: np.ndarray, target: Column) -> Tuple[np.ndarray, str]:
+    """Map the used codes of one string column to the codes of the same values in another.
+
+    This is the build/probe step of the hash joins: each column's
+    dictionary is a hash table of its values, built once. The side with
+    fewer values to look up probes the other side's hash, so a join costs
+    the smaller side rather than the larger one. Columns sharing one
+    dictionary need no lookups at all.
+
+    Returns:
+        Tuple of (target code per source code, with a trailing -1 for the
+        null code, unmatched codes -1; the side that was probed)
+    """
+    translation = np.full(len(source.categories) + 1, -1, dtype=np.int64)
+    if source.categories is target.categories:
+        translation[:-1] = np.arange(len(source.categories))
+        return translation, "shared"
+    if len(used) <= len(target.categories):
+        lookup = target.codes_by_value
+        translation[used] = [lookup.get(value, -1) for value in source.categories[used].tolist()]
+        return translation, "target"
+    lookup = source.codes_by_value
+    for code, value in enumerate(target.categories.tolist()):
+        source_code = lookup.get(value)
+        if source_code is not None:
+            translation[source_code] = code
+    return translation, "source"
+
+def used_codes(codes: np.ndarray, categories: int) -> np.ndarray:
+    """Distinct non-null codes, without sorting."""
+    present = np.zeros(categories + 1, dtype=bool)
+    present[codes] = True
+    return np.flatnonzero(present[:-1])
+
+def _subqueries(condition: Condition) -> List[InSubquery]:
+    if isinstance(condition, (And, Or)):
+        return [subquery for operand in condition.operands for subquery in _subqueries(operand)]
+    if isinstance(condition, Not):
+        return _subqueries(condition.operand)
+    return [condition] if isinstance(condition, InSubquery) else []
+
+def _cost(condition: Condition) -> int:
+    """Rough per-row cost rank: vectorized comparisons, then regex LIKE, then semi-joins."""
+    if isinstance(condition, InSubquery):
+        return 2
+    return 1 if isinstance(condition, Comparison) and condition.op == "LIKE" else 0
+
+@dataclass
+class Plan:
+    """How a query finds, orders and cuts its rows.
+
+    ``lookups`` are WHERE conditions answered entirely by indexes, whose
+    row sets are intersected; ``residual`` is the rest of the WHERE clause,
+    evaluated only on the rows the lookups found. Without lookups the
+    whole table is scanned.
+    """
+    query: Query
+    table_rows: int
+    lookups: Tuple[Condition, ...] = ()
+    residual: Optional[Condition] = None
+    estimated_rows: int = 0
+    index_names: Tuple[str, ...] = ()
+    skipped: Tuple[str, ...] = ()
+    subplans: Tuple[Tuple[str, "Plan"], ...] = ()
+
+    @property
+    def access(self) -> str:
+        return "index" if self.lookups else "full_scan"
+
+    def explain(self) -> str:
+        """EXPLAIN-style description of the plan, outermost step first."""
+        query = self.query
+        steps = []
+        if query.limit is not None or query.offset:
+            steps.append(
+                f"Limit {query.limit if query.limit is not None else 'all'}"
+                + (f" offset {query.offset}" if query.offset else "")
+            )
+        if query.order_by:
+            keep = (query.offset or 0) + query.limit if query.limit is not None else None
+            steps.append(
+                ("Top-k sort" if keep is not None else "Sort")
+                + f" by {', '.join(item.to_soql() for item in query.order_by)}"
+            )
+        fields = ", ".join(f if isinstance(f, str) else f.to_soql() for f in query.fields)
+        if query.is_aggregate:
+            steps.append(
+                f"Aggregate {fields}"
+                + (f" grouped by {', '.join(query.group_by)}" if query.group_by else " over all rows")
+            )
+        else:
+            steps.append(f"Project {fields}")
+        if self.residual is not None:
+            steps.append(f"Filter {self.residual.to_soql()}")
+        if self.lookups:
+            steps.append(
+                f"Index scan on {query.object_name} using {', '.join(self.index_names)}: "
+                f"{(And(self.lookups) if len(self.lookups) > 1 else self.lookups[0]).to_soql()} "
+                f"(~{self.estimated_rows:,} of {self.table_rows:,} rows)"
+            )
+        else:
+            steps.append(f"Full scan on {query.object_name} ({self.table_rows:,} rows)")
+        if self.skipped:
+            steps[-1] += f"; not selective enough: {', '.join(self.skipped)}"
+        lines = ["  " * depth + ("-> " if depth else "") + step for depth, step in enumerate(steps)]
+        for label, subplan in self.subplans:
+            indent = "  " * len(steps)
+            lines.append(f"{indent}-> Hash semi-join {label}, built on the side with fewer distinct values")
+            lines.extend(f"{indent}    {line}" for line in subplan.explain().splitlines())
+        return "\n".join(lines)
+
+class Database:
+    """Runs parsed SOQL SELECT queries over in-memory columnar tables.
+
+    Equality and IN conditions on indexed fields are answered from the
+    indexes (see ``plan``). The rest of the filter is evaluated as boolean
+    masks over whole columns; once an AND has narrowed the rows down, its
+    remaining operands (and LIKE and IN subqueries, always last) only look
+    at the rows still in play. IN subqueries and parent fields such as
+    CreatedBy.Name are hash joins (see translate_codes). ORDER BY is one
+    lexsort, preceded by a partition on the first key when LIMIT keeps only
+    a few rows, and only the selected fields of the rows inside
+    LIMIT/OFFSET are turned back into Python records.
+    """
+
+    def __init__(self, tables: Dict[str, Table] = None, today: Optional[date] = None):
+        """
+        Args:
+            tables: Tables by object name
+            today: Reference day for relative date literals; defaults to the current day
+        """
+        self.tables = dict(tables or {})
+        self.today = today
+        self.index_scans = 0
+        self.full_scans = 0
+        # Joins by kind and the side whose distinct keys they were built
+        # from, e.g. "semi.inner_built", or "shared" when both sides use
+        # one dictionary and need no translation
+        self.joins: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_records(cls, records_by_object: Dict[str, List[Dict[str, Any]]], **kwargs) -> "Database":
+        return cls({name: Table.from_records(name, records) for name, records in records_by_object.items()}, **kwargs)
+
+    def create_indexes(self, fields_by_object: Dict[str, Dict[str, Optional[str]]]) -> None:
+        """Index fields by object and index kind, e.g. {"Opportunity": {"StageName": "bitmap"}}.
+
+        A kind of None picks one from the number of distinct values.
+        """
+        for object_name, fields in fields_by_object.items():
+            table = self.table(object_name)
+            for field_name, kind in fields.items():
+                table.create_index(field_name, kind)
+
+    def _today(self) -> np.datetime64:
+        return np.datetime64(self.today or date.today(), "D")
+
+    def table(self, object_name: str) -> Table:
+        for name, table in self.tables.items():
+            if name.lower() == object_name.lower():
+                return table
+        raise unsupported(f"No data for object {object_name}")
+
+    def _parent_rows(self, table: Table, relationship: str, rows: Optional[np.ndarray]) -> Tuple[Optional[Table], np.ndarray]:
+        """Join the given rows to their parent through a lookup field.
+
+        Returns:
+            Tuple of (parent table, parent row per row with -1 where there is
+            none), or (None, all -1) when the lookup field or parent has no data
+        """
+        count = table.size if rows is None else len(rows)
+        parent_name = RELATIONSHIP_OBJECTS.get(relationship, relationship)
+        parent = next((t for name, t in self.tables.items() if name.lower() == parent_name.lower()), None)
+        lookup_field = f"{relationship}Id"
+        if parent is None or lookup_field not in table or "Id" not in parent:
+            return None, np.full(count, -1, dtype=np.int64)
+
+        keys = table.column(lookup_field)
+        codes = keys._data(rows)
+        used = used_codes(codes, len(keys.categories))
+        translation, probed = translate_codes(keys, used, parent.column("Id"))
+        self.joins["parent." + {"shared": "shared", "target": "child_built", "source": "parent_built"}[probed]] += 1
+        return parent, parent.row_of_id()[translation[codes]]
+
+    def _column(self, table: Table, name: str, rows: Optional[np.ndarray]) -> Tuple[Column, Optional[np.ndarray]]:
+        """The column behind a field and the rows to read from it.
+
+        Parent fields like ``CreatedBy.Name`` are hash-joined to the parent
+        table and come back as a column already aligned with ``rows``.
+        """
+        if "." not in name or name in table:
+            return table.column(name), rows
+        relationship, _, rest = name.partition(".")
+        parent, parent_rows = self._parent_rows(table, relationship, rows)
+        if parent is None:
+            return Column.nulls(len(parent_rows)), None
+        valid = parent_rows >= 0
+        column, column_rows = self._column(parent, rest, parent_rows[valid])
+        if column_rows is not None:
+            column = column.take(column_rows)
+        positions = np.full(len(parent_rows), -1, dtype=np.int64)
+        positions[valid] = np.arange(int(valid.sum()))
+        return column.take(positions), None
+
+    def _values(self, table: Table, name: str, rows: np.ndarray) -> List[Any]:
+        column, column_rows = self._column(table, name, rows)
+        return column.values(np.arange(len(column)) if column_rows is None else column_rows)
+
+    def _semi_join(self, table: Table, condition: InSubquery, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Which rows have their field among the values the subquery selects."""
+        inner_table, inner_rows = self.select(condition.query)
+        inner, inner_rows = self._column(inner_table, condition.query.fields[0], inner_rows)
+        inner_codes = inner._data(inner_rows)
+        outer, outer_rows = self._column(table, condition.field, rows)
+
+        if outer.kind == "string" and inner.kind == "string":
+            # Translate the smaller distinct-value set into the other dictionary
+            outer_codes = outer._data(outer_rows)
+            inner_used = used_codes(inner_codes, len(inner.categories))
+            outer_used = used_codes(outer_codes, len(outer.categories))
+            matched = np.zeros(len(outer.categories) + 1, dtype=bool)
+            if len(inner_used) <= len(outer_used):
+                translation, probed = translate_codes(inner, inner_used, outer)
+                found = translation[inner_used]
+                matched[found[found >= 0]] = True
+                built = "inner_built"
+            else:
+                translation, probed = translate_codes(outer, outer_used, inner)
+                present = np.zeros(len(inner.categories) + 1, dtype=bool)
+                present[inner_codes] = True
+                present[-1] = False
+                matched[outer_used] = present[translation[outer_used]]
+                built = "outer_built"
+            self.joins["semi." + ("shared" if probed == "shared" else built)] += 1
+            mask = matched[outer_codes]
+        else:
+            inner_values = inner._data(inner_rows)
+            mask = np.isin(outer._data(outer_rows), inner_values[~inner.null_mask(inner_rows)])
+        return ~mask if condition.negated else mask
+
+    def evaluate(self, table: Table, condition: Condition, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Which of the given rows (None for all) match a WHERE condition."""
+        if isinstance(condition, And):
+            mask = None
+            for operand in sorted(condition.operands, key=_cost):
+                if mask is None:
+                    mask = self.evaluate(table, operand, rows)
+                    continue
+                kept = np.flatnonzero(mask)
+                if not len(kept):
+                    break
+                if len(kept) * 8 > len(mask) and not _cost(operand):
+                    # Most rows are still in play: one pass over the column beats gathering them
+                    mask &= self.evaluate(table, operand, rows)
+                else:
+                    matched = self.evaluate(table, operand, kept if rows is None else rows[kept])
+                    mask[kept[~matched]] = False
+            return mask
+        if isinstance(condition, Or):
+            mask = self.evaluate(table, condition.operands[0], rows)
+            for operand in condition.operands[1:]:
+                mask |= self.evaluate(table, operand, rows)
+            return mask
+        if isinstance(condition, Not):
+            return ~self.evaluate(table, condition.operand, rows)
+        if isinstance(condition, InList):
+            column, column_rows = self._column(table, condition.field, rows)
+            mask = column.isin(condition.values, column_rows)
+            return ~mask if condition.negated else mask
+        if isinstance(condition, InSubquery):
+            return self._semi_join(table, condition, rows)
+        if isinstance(condition, Comparison):
+            column, column_rows = self._column(table, condition.field, rows)
+            if condition.op == "LIKE":
+                return column.like(condition.value.value, column_rows)
+            return column.compare(condition.op, condition.value, self._today(), column_rows)
+        raise unsupported(f"Unsupported condition {condition!r}")
+
+    def _order(self, table: Table, rows: np.ndarray, query: Query, keep: Optional[int]) -> np.ndarray:
+        """Sort rows by the ORDER BY items; only the first ``keep`` rows need to be right."""
+        keys = []
+        for item in query.order_by:
+            column, column_rows = self._column(table, item.field, rows)
+            if column_rows is None:
+                column_rows = np.arange(len(column))
+            # SOQL puts nulls first in ascending and last in descending order by default
+            nulls_first = item.nulls_first if item.nulls_first is not None else not item.descending
+            nulls = column.null_mask(column_rows)
+            keys.append((~nulls if nulls_first else nulls, column.sort_key(item.descending, column_rows)))
+
+        if keep is not None and keep < len(rows) // 2:
+            # Only rows tied with or before the keep-th on the first item can make the cut
+            nulls, key = keys[0]
+            first = np.where(nulls, np.inf, key.astype(np.float64))
+            cutoff = np.partition(first, keep - 1)[keep - 1] if keep else -np.inf
+            candidates = np.flatnonzero(first <= cutoff)
+            rows = rows[candidates]
+            keys = [(nulls[candidates], key[candidates]) for nulls, key in keys]
+
+        # lexsort sorts by the last key first, so pass the ORDER BY items in reverse
+        return rows[np.lexsort([array for pair in reversed(keys) for array in reversed(pair)])]
+
+    def _index_values(self, table: Table, condition: Condition) -> Optional[Tuple[Any, List[Any]]]:
+        """The index and values an equality or IN condition looks up, or None if it can't use one."""
+        if isinstance(condition, Comparison) and condition.op == "=":
+            values = [condition.value]
+        elif isinstance(condition, InList) and not condition.negated:
+            values = list(condition.values)
+        else:
+            return None
+        index = table.index(condition.field)
+        if index is None or not all(isinstance(v, Literal) and v.kind != "null" for v in values):
+            return None
+        try:
+            return index, [index.column._scalar(value) for value in values]
+        except SOQLError:
+            return None
+
+    def _indexable(self, table: Table, condition: Condition) -> bool:
+        if isinstance(condition, (And, Or)):
+            return all(self._indexable(table, operand) for operand in condition.operands)
+        return self._index_values(table, condition) is not None
+
+    def _estimate(self, table: Table, condition: Condition) -> int:
+        if isinstance(condition, And):
+            return min(self._estimate(table, operand) for operand in condition.operands)
+        if isinstance(condition, Or):
+            return min(table.size, sum(self._estimate(table, operand) for operand in condition.operands))
+        index, values = self._index_values(table, condition)
+        return index.estimate(values)
+
+    def _lookup(self, table: Table, condition: Condition) -> RowSet:
+        if isinstance(condition, (And, Or)):
+            result = self._lookup(table, condition.operands[0])
+            for operand in condition.operands[1:]:
+                other = self._lookup(table, operand)
+                result = result & other if isinstance(condition, And) else result | other
+            return result
+        index, values = self._index_values(table, condition)
+        return index.lookup(values)
+
+    def _index_names(self, table: Table, condition: Condition) -> List[str]:
+        if isinstance(condition, (And, Or)):
+            return [name for operand in condition.operands for name in self._index_names(table, operand)]
+        index, _ = self._index_values(table, condition)
+        return [f"{index.kind}({index.field})"]
+
+    def plan(self, query: Query) -> Plan:
+        """Choose index lookups for the equality/IN parts of the WHERE clause.
+
+        Each operand of a top-level AND (or the whole condition) that only
+        uses indexed equality/IN is looked up, most selective first, and
+        the remaining operands become the residual filter. Lookups estimated
+        to match more than INDEX_MAX_SHARE of the table are left to the scan.
+        """
+        table = self.table(query.object_name)
+        plan = Plan(query=query, table_rows=table.size, residual=query.where, estimated_rows=table.size)
+        where = query.where
+        if where is None:
+            return plan
+        plan.subplans = tuple(
+            (f"{condition.field} {'NOT IN' if condition.negated else 'IN'} "
+             f"{condition.query.object_name}.{condition.query.fields[0]}", self.plan(condition.query))
+            for condition in _subqueries(where)
+        )
+
+        operands = where.operands if isinstance(where, And) else (where,)
+        lookups, residual, skipped = [], [], []
+        for operand in operands:
+            if not self._indexable(table, operand):
+                residual.append(operand)
+                continue
+            estimate = self._estimate(table, operand)
+            if estimate > table.size * INDEX_MAX_SHARE:
+                skipped.append(f"{operand.to_soql()} (~{estimate:,} rows)")
+                residual.append(operand)
+            else:
+                lookups.append((estimate, operand))
+        plan.skipped = tuple(skipped)
+        if not lookups:
+            return plan
+
+        lookups.sort(key=lambda item: item[0])
+        plan.lookups = tuple(operand for _, operand in lookups)
+        plan.residual = None if not residual else residual[0] if len(residual) == 1 else And(tuple(residual))
+        plan.estimated_rows = lookups[0][0]
+        plan.index_names = tuple(dict.fromkeys(
+            name for condition in plan.lookups for name in self._index_names(table, condition)
+        ))
+        return plan
+
+    def explain(self, query: Union[Query, str]) -> str:
+        """EXPLAIN output for a parsed query or SOQL text."""
+        return self.plan(parse(query) if isinstance(query, str) else query).explain()
+
+    def _filter(self, query: Query) -> Tuple[Table, np.ndarray]:
+        """The table and the row numbers matching the WHERE clause, unordered."""
+        table = self.table(query.object_name)
+        plan = self.plan(query)
+        if plan.lookups:
+            self.index_scans += 1
+            found = self._lookup(table, plan.lookups[0])
+            for condition in plan.lookups[1:]:
+                found = found & self._lookup(table, condition)
+            rows = found.rows()
+            if plan.residual is not None and len(rows):
+                rows = rows[self.evaluate(table, plan.residual, rows)]
+        else:
+            self.full_scans += 1
+            if query.where is None:
+                rows = np.arange(table.size)
+            else:
+                rows = np.flatnonzero(self.evaluate(table, query.where))
+        return table, rows
+
+    def select(self, query: Query) -> Tuple[Table, np.ndarray]:
+        """The table and row numbers a query returns, in order, after OFFSET and LIMIT."""
+        if query.is_aggregate:
+            raise unsupported("Aggregate queries return groups, not rows; use execute")
+        table, rows = self._filter(query)
+        start = query.offset or 0
+        end = start + query.limit if query.limit is not None else None
+        if query.order_by:
+            rows = self._order(table, rows, query, end)
+        return table, rows[start:end]
+
+    def _group(self, table: Table, fields: Tuple[str, ...], rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Group rows by the GROUP BY fields.
+
+        Returns:
+            Tuple of (group number per row, position in ``rows`` of each group's first row)
+        """
+        if not fields:
+            # Without GROUP BY everything is one group, even when no row matched
+            return np.zeros(len(rows), dtype=np.int64), np.zeros(1, dtype=np.int64)
+        keys, sizes = [], []
+        for name in fields:
+            column, column_rows = self._column(table, name, rows)
+            data = column._data(column_rows)
+            if column.kind in ("string", "boolean"):
+                # Codes are already dense integers; shift so null (-1) becomes 0
+                keys.append(data.astype(np.int64) + 1)
+                sizes.append((len(column.categories) if column.kind == "string" else 2) + 1)
+            else:
+                values, key = np.unique(data, return_inverse=True)
+                keys.append(key.ravel())
+                sizes.append(len(values))
+        space = float(np.prod(sizes, dtype=np.float64))
+        if space >= 2 ** 62:
+            _, combined = np.unique(np.stack(keys, axis=1), axis=0, return_inverse=True)
+            combined, space = combined.ravel(), float(len(rows))
+        else:
+            combined = np.ravel_multi_index(keys, sizes) if len(keys) > 1 else keys[0]
+        if space > 4 * len(rows) + 1024:
+            _, first, groups = np.unique(combined, return_index=True, return_inverse=True)
+            return groups.ravel(), first
+        # Few possible keys (e.g. StageName x IsClosed): number the ones present
+        # with a lookup table instead of sorting every row's key
+        present = np.bincount(combined, minlength=int(space)) > 0
+        dense = np.cumsum(present) - 1
+        groups = dense[combined]
+        # Any row of a group will do as its representative; rows of a group share the key values
+        first = np.zeros(int(present.sum()), dtype=np.int64)
+        first[groups] = np.arange(len(rows))
+        return groups, first
+
+    def _reduce(self, table: Table, aggregate: Aggregate, rows: np.ndarray, groups: np.ndarray, count: int) -> List[Any]:
+        """One aggregate value per group, computed with bincount / ufunc.at over all rows at once."""
+        function = aggregate.function
+        if aggregate.field is None:
+            return np.bincount(groups, minlength=count).tolist()
+
+        column, column_rows = self._column(table, aggregate.field, rows)
+        if column_rows is None:
+            column_rows = np.arange(len(column))
+        valid = ~column.null_mask(column_rows)
+        groups, data = groups[valid], column.data[column_rows][valid]
+        counts = np.bincount(groups, minlength=count)
+
+        if function == "COUNT":
+            return counts.tolist()
+        if function == "COUNT_DISTINCT":
+            if column.kind == "string":
+                values, width = data.astype(np.int64), len(column.categories)
+            else:
+                distinct, values = np.unique(data, return_inverse=True)
+                values, width = values.ravel(), len(distinct)
+            pairs = np.unique(groups * max(width, 1) + values)
+            return np.bincount(pairs // max(width, 1), minlength=count).tolist()
+        if function in ("SUM", "AVG"):
+            if column.untyped:
+                return [None] * count
+            if column.kind != "number":
+                raise unsupported(f"{function}() needs a number field, {aggregate.field} is {column.kind}")
+            sums = np.bincount(groups, weights=data, minlength=count)
+            totals = sums / np.maximum(counts, 1) if function == "AVG" else sums
+            return [
+                None if n == 0 else (int(total) if float(total).is_integer() and function == "SUM" else float(total))
+                for total, n in zip(totals.tolist(), counts.tolist())
+            ]
+
+        # MIN / MAX over a numeric image of the values: ranks for strings, ticks for dates
+        if column.kind == "string":
+            keys = column.sort_key(False, column_rows)[valid].astype(np.float64)
+            by_rank = column.categories[np.argsort(column.categories, kind="stable")]
+            decode = lambda key: by_rank[int(key)]
+        elif column.kind in ("date", "datetime"):
+            keys = data.astype(np.int64).astype(np.float64)
+            unit = np.datetime_data(column.data.dtype)[0]
+            suffix = "Z" if column.kind == "datetime" else ""
+            decode = lambda key: f"{np.datetime64(int(key), unit)}{suffix}"
+        elif column.kind == "boolean":
+            keys = data.astype(np.float64)
+            decode = bool
+        else:
+            keys = data
+            decode = lambda key: int(key) if key.is_integer() else key
+        ufunc = np.minimum if function == "MIN" else np.maximum
+        extreme = np.full(count, np.inf if function == "MIN" else -np.inf)
+        if count == 1:
+            # A single group (no GROUP BY) is a plain reduction, much faster than ufunc.at
+            extreme[0] = ufunc.reduce(keys, initial=extreme[0])
+        else:
+            ufunc.at(extreme, groups, keys)
+        return [None if n == 0 else decode(key) for key, n in zip(extreme.tolist(), counts.tolist())]
+
+    def aggregate(self, query: Query) -> List[Dict[str, Any]]:
+        """Run an aggregate query: one record per group, named by field or alias (expr0, expr1, ... otherwise)."""
+        table, rows = self._filter(query)
+        groups, first = self._group(table, query.group_by, rows)
+        count = len(first)
+        firsts = rows[first] if len(rows) else np.zeros(0, dtype=np.int64)
+
+        columns, unnamed = {}, 0
+        for item in query.fields:
+            if isinstance(item, str):
+                columns[item] = self._values(table, item, firsts) if len(firsts) else [None] * count
+            else:
+                name = item.alias or f"expr{unnamed}"
+                unnamed += 0 if item.alias else 1
+                columns[name] = self._reduce(table, item, rows, groups, count)
+        records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+        # ORDER BY, OFFSET and LIMIT apply to the groups
+        if query.order_by and records:
+            result = Table.from_records("groups", records)
+            order = self._order(result, np.arange(len(records)), query, None)
+            records = [records[i] for i in order.tolist()]
+        start = query.offset or 0
+        return records[start:start + query.limit] if query.limit is not None else records[start:]
+
+    def execute(self, query: Query) -> List[Dict[str, Any]]:
+        """Run a parsed query and return its records (or groups, for aggregate queries)."""
+        if query.is_aggregate:
+            return self.aggregate(query)
+        table, rows = self.select(query)
+        return self.records(table, query.fields, rows)
+
+    def records(self, table: Table, fields: Tuple[str, ...], rows: np.ndarray) -> List[Dict[str, Any]]:
+        """The given rows of a table as records of the given fields, in row order."""
+        columns = {name: self._values(table, name, rows) for name in fields}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    def execute_soql(self, soql: str) -> List[Dict[str, Any]]:
+        return self.execute(parse(soql))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """How many queries used an index or scanned the whole table, and how joins were built."""
+        return {
+            "index_scans": self.index_scans,
+            "full_scans": self.full_scans,
+            "joins": dict(self.joins),
+            "indexes": {
+                name: [f"{index.kind}({index.field})" for index in table.indexes.values()]
+                for name, table in self.tables.items()
+            }
+        }
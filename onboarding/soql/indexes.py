@@ -0,0 +1,145 @@
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+# Set bits per byte value, for counting rows in a bitmap
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+# Columns with more distinct values than this get a hash index by default
+BITMAP_MAX_VALUES = 64
+
+class RowSet:
+    """Rows found through indexes, as a packed bitmap or as sorted row numbers.
+
+    Bitmaps combine with AND/OR a byte at a time; row numbers (from hash
+    lookups, typically few) are tested against bitmaps bit by bit instead
+    of being expanded to a full mask.
+    """
+
+    def __init__(self, size: int, bits: Optional[np.ndarray] = None, rows: Optional[np.ndarray] = None):
+        self.size = size
+        self.bits = bits
+        self._rows = rows
+
+    def rows(self) -> np.ndarray:
+        if self._rows is None:
+            self._rows = np.flatnonzero(np.unpackbits(self.bits, count=self.size))
+        return self._rows
+
+    def _to_bits(self) -> np.ndarray:
+        if self.bits is None:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self._rows] = True
+            self.bits = np.packbits(mask)
+        return self.bits
+
+    def _test(self, rows: np.ndarray) -> np.ndarray:
+        """Which of the given row numbers are set in this set's bitmap."""
+        return ((self.bits[rows >> 3] >> (7 - (rows & 7))) & 1).astype(bool)
+
+    def __and__(self, other: "RowSet") -> "RowSet":
+        if self.bits is not None and other.bits is not None:
+            return RowSet(self.size, bits=self.bits & other.bits)
+        if self.bits is not None:
+            return RowSet(self.size, rows=other._rows[self._test(other._rows)])
+        if other.bits is not None:
+            return RowSet(self.size, rows=self._rows[other._test(self._rows)])
+        return RowSet(self.size, rows=np.intersect1d(self._rows, other._rows, assume_unique=True))
+
+    def __or__(self, other: "RowSet") -> "RowSet":
+        if self.bits is None and other.bits is None:
+            return RowSet(self.size, rows=np.union1d(self._rows, other._rows))
+        return RowSet(self.size, bits=self._to_bits() | other._to_bits())
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return len(self._rows)
+        return int(POPCOUNT[self.bits].sum())
+
+class _Index:
+    """Rows per value of a string or boolean column.
+
+    ``codes`` numbers the column's values (-1 for null) and ``keys`` maps
+    a value to its number; ``counts`` holds the rows per number, which the
+    planner uses as row estimates.
+    """
+    kind = ""
+
+    def __init__(self, field: str, column):
+        if column.kind == "string":
+            self.codes = column.data
+            self.keys: Dict[Any, int] = column.codes_by_value
+            size = len(column.categories)
+        elif column.kind == "boolean":
+            self.codes = column.data
+            self.keys = {0: 0, 1: 1}
+            size = 2
+        else:
+            raise ValueError(f"Cannot index {column.kind} field {field}; only string and boolean fields")
+        self.field = field
+        self.column = column
+        self.size = len(column)
+        self.counts = np.bincount(self.codes + 1, minlength=size + 1)[1:]
+
+    def _code(self, value: Any) -> Optional[int]:
+        return self.keys.get(value)
+
+    def estimate(self, values: Iterable[Any]) -> int:
+        """Rows holding any of the values, without touching the rows."""
+        codes = {self._code(value) for value in values} - {None}
+        return int(sum(self.counts[code] for code in codes))
+
+    def lookup(self, values: Iterable[Any]) -> RowSet:
+        raise NotImplementedError
+
+class BitmapIndex(_Index):
+    """One packed bitmap per value, for low-cardinality fields like StageName or IsClosed."""
+    kind = "bitmap"
+
+    def __init__(self, field: str, column):
+        super().__init__(field, column)
+        self.bitmaps = {
+            code: np.packbits(self.codes == code)
+            for code in np.flatnonzero(self.counts).tolist()
+        }
+        self.empty = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def lookup(self, values: Iterable[Any]) -> RowSet:
+        bits = self.empty
+        for code in {self._code(value) for value in values} - {None}:
+            bits = bits | self.bitmaps.get(code, self.empty)
+        return RowSet(self.size, bits=bits)
+
+class HashIndex(_Index):
+    """Row numbers grouped by value, for high-cardinality fields like AccountId.
+
+    The value-to-number lookup is a hash table; the rows of each number
+    are a slice of one array sorted by number (CSR layout), so the index
+    costs two integer arrays rather than one array per value.
+    """
+    kind = "hash"
+
+    def __init__(self, field: str, column):
+        super().__init__(field, column)
+        self.order = np.argsort(self.codes, kind="stable")
+        # The null rows (code -1) sort first; offsets index the non-null ones
+        self.offsets = np.concatenate(([0], np.cumsum(self.counts))) + (self.size - int(self.counts.sum()))
+
+    def lookup(self, values: Iterable[Any]) -> RowSet:
+        codes = sorted({self._code(value) for value in values} - {None})
+        parts = [self.order[self.offsets[code]:self.offsets[code + 1]] for code in codes]
+        rows = np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+        if len(parts) > 1:
+            rows.sort()
+        return RowSet(self.size, rows=rows)
+
+def create_index(field: str, column, kind: Optional[str] = None) -> _Index:
+    """Index a column: bitmap for few distinct values, hash otherwise, unless ``kind`` says."""
+    if kind is None:
+        distinct = 2 if column.kind == "boolean" else len(column.categories if column.categories is not None else [])
+        kind = "bitmap" if distinct <= BITMAP_MAX_VALUES else "hash"
+    if kind == "bitmap":
+        return BitmapIndex(field, column)
+    if kind == "hash":
+        return HashIndex(field, column)
+    raise ValueError(f"Unknown index kind {kind}; use bitmap or hash")
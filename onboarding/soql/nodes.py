@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple, Union
+
+# SOQL date literals; the "_N_" ones take a count, e.g. LAST_N_DAYS:365
+DATE_LITERALS = {
+    "TODAY", "YESTERDAY", "TOMORROW",
+    "THIS_WEEK", "LAST_WEEK", "NEXT_WEEK",
+    "THIS_MONTH", "LAST_MONTH", "NEXT_MONTH",
+    "THIS_QUARTER", "LAST_QUARTER", "NEXT_QUARTER",
+    "THIS_YEAR", "LAST_YEAR", "NEXT_YEAR",
+    "LAST_90_DAYS", "NEXT_90_DAYS",
+}
+DATE_N_LITERALS = {"LAST_N_DAYS", "NEXT_N_DAYS", "LAST_N_WEEKS", "NEXT_N_WEEKS", "LAST_N_MONTHS", "NEXT_N_MONTHS"}
+
+AGGREGATE_FUNCTIONS = {"COUNT", "COUNT_DISTINCT", "SUM", "AVG", "MIN", "MAX"}
+
+# Parent relationships whose object isn't named like the relationship;
+# any other "<Relationship>.<Field>" goes through <Relationship>Id to the
+# <Relationship> object, e.g. Account.Name through AccountId
+RELATIONSHIP_OBJECTS = {"CreatedBy": "User", "LastModifiedBy": "User", "Owner": "User"}
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+@dataclass(frozen=True)
+class Literal:
+    """A constant: kind is "string", "number", "boolean", "null", "date" or "datetime"."""
+    value: Any
+    kind: str
+
+    def to_soql(self) -> str:
+        if self.kind == "string":
+            return _quote(self.value)
+        if self.kind == "boolean":
+            return "true" if self.value else "false"
+        if self.kind == "null":
+            return "null"
+        return str(self.value)
+
+@dataclass(frozen=True)
+class DateLiteral:
+    """A relative date such as TODAY or LAST_N_DAYS:365."""
+    name: str
+    n: Optional[int] = None
+
+    def to_soql(self) -> str:
+        return self.name if self.n is None else f"{self.name}:{self.n}"
+
+Value = Union[Literal, DateLiteral]
+
+@dataclass(frozen=True)
+class Aggregate:
+    """An aggregate in the SELECT list; field is None for COUNT()."""
+    function: str
+    field: Optional[str] = None
+    alias: Optional[str] = None
+
+    def to_soql(self) -> str:
+        soql = f"{self.function}({self.field or ''})"
+        return f"{soql} {self.alias}" if self.alias else soql
+
+@dataclass(frozen=True)
+class Comparison:
+    """field op value, where op is =, !=, <, <=, >, >= or LIKE."""
+    field: str
+    op: str
+    value: Value
+
+    def to_soql(self) -> str:
+        return f"{self.field} {self.op} {self.value.to_soql()}"
+
+@dataclass(frozen=True)
+class InList:
+    field: str
+    values: Tuple[Value, ...]
+    negated: bool = False
+
+    def to_soql(self) -> str:
+        values = ", ".join(value.to_soql() for value in self.values)
+        return f"{self.field} {'NOT IN' if self.negated else 'IN'} ({values})"
+
+@dataclass(frozen=True)
+class InSubquery:
+    """Semi-join: field IN (SELECT one_field FROM ...)."""
+    field: str
+    query: "Query"
+    negated: bool = False
+
+    def to_soql(self) -> str:
+        return f"{self.field} {'NOT IN' if self.negated else 'IN'} ({self.query.to_soql()})"
+
+@dataclass(frozen=True)
+class And:
+    operands: Tuple["Condition", ...]
+
+    def to_soql(self) -> str:
+        return " AND ".join(_wrap(operand, Or) for operand in self.operands)
+
+@dataclass(frozen=True)
+class Or:
+    operands: Tuple["Condition", ...]
+
+    def to_soql(self) -> str:
+        return " OR ".join(_wrap(operand, And) for operand in self.operands)
+
+@dataclass(frozen=True)
+class Not:
+    operand: "Condition"
+
+    def to_soql(self) -> str:
+        return f"NOT {_wrap(self.operand, (And, Or))}"
+
+Condition = Union[Comparison, InList, InSubquery, And, Or, Not]
+
+def _wrap(condition: "Condition", parenthesize) -> str:
+    soql = condition.to_soql()
+    return f"({soql})" if isinstance(condition, parenthesize) else soql
+
+@dataclass(frozen=True)
+class OrderBy:
+    field: str
+    descending: bool = False
+    nulls_first: Optional[bool] = None
+
+    def to_soql(self) -> str:
+        soql = f"{self.field} {'DESC' if self.descending else 'ASC'}"
+        if self.nulls_first is not None:
+            soql += " NULLS FIRST" if self.nulls_first else " NULLS LAST"
+        return soql
+
+@dataclass(frozen=True)
+class Query:
+    object_name: str
+    fields: Tuple[Union[str, Aggregate], ...]
+    where: Optional[Condition] = None
+    group_by: Tuple[str, ...] = ()
+    order_by: Tuple[OrderBy, ...] = ()
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+
+    @property
+    def is_aggregate(self) -> bool:
+        return bool(self.group_by) or any(isinstance(f, Aggregate) for f in self.fields)
+
+    def to_soql(self) -> str:
+        """Render the query in one canonical form."""
+        fields = ", ".join(f if isinstance(f, str) else f.to_soql() for f in self.fields)
+        soql = f"SELECT {fields} FROM {self.object_name}"
+        if self.where is not None:
+            soql += f" WHERE {self.where.to_soql()}"
+        if self.group_by:
+            soql += f" GROUP BY {', '.join(self.group_by)}"
+        if self.order_by:
+            soql += f" ORDER BY {', '.join(item.to_soql() for item in self.order_by)}"
+        if self.limit is not None:
+            soql += f" LIMIT {self.limit}"
+        if self.offset is not None:
+            soql += f" OFFSET {self.offset}"
+        return soql
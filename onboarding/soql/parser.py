@@ -0,0 +1,315 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from .nodes import (
+    AGGREGATE_FUNCTIONS,
+    DATE_LITERALS,
+    DATE_N_LITERALS,
+    Aggregate,
+    And,
+    Comparison,
+    Condition,
+    DateLiteral,
+    InList,
+    InSubquery,
+    Literal,
+    Not,
+    Or,
+    OrderBy,
+    Query,
+    Value,
+)
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<string>'(?:[^'\\]|\\.)*')
+  | (?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2}))
+  | (?P<date>\d{4}-\d{2}-\d{2})
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<op><=|>=|!=|<>|=|<|>)
+  | (?P<punct>[(),:])
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+""", re.VERBOSE)
+
+KEYWORDS = {
+    "SELECT", "FROM", "WHERE", "AND", "OR", "NOT", "IN", "LIKE", "GROUP", "ORDER", "BY",
+    "ASC", "DESC", "NULLS", "FIRST", "LAST", "LIMIT", "OFFSET", "TRUE", "FALSE", "NULL", "HAVING",
+}
+
+FENCE_PATTERN = re.compile(r"```(?:\w+)?\s*(.*?)```", re.DOTALL)
+SELECT_PATTERN = re.compile(r"\bSELECT\b", re.IGNORECASE)
+
+class SOQLError(ValueError):
+    """A query that cannot be run, with one structured entry per problem.
+
+    Each error is a dict with "kind" ("syntax", "schema", or "unsupported"
+    from the engine and "cursor" for unknown or expired query cursors),
+    "message" and, when known, "position" in the query text and a
+    "suggestion".
+    """
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        super().__init__("; ".join(error["message"] for error in errors))
+
+def syntax_error(message: str, position: Optional[int], suggestion: str = None) -> SOQLError:
+    return SOQLError([{"kind": "syntax", "message": message, "position": position, "suggestion": suggestion}])
+
+def extract_soql(text: str) -> str:
+    """Pull the query out of an LLM response: markdown fences, prose before SELECT, a trailing ";"."""
+    fenced = FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1)
+    select = SELECT_PATTERN.search(text)
+    if select:
+        text = text[select.start():]
+    return text.strip().rstrip(";").strip()
+
+def tokenize(text: str) -> List[Tuple[str, str, int]]:
+    """Split a query into (kind, text, position) tokens; names that are keywords get kind "keyword"."""
+    tokens = []
+    position = 0
+    while position < len(text):
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise syntax_error(f"Unexpected character {text[position]!r} at position {position}", position)
+        kind = match.lastgroup
+        if kind != "ws":
+            value = match.group()
+            if kind == "name" and value.upper() in KEYWORDS:
+                kind, value = "keyword", value.upper()
+            tokens.append((kind, value, position))
+        position = match.end()
+    tokens.append(("eof", "", len(text)))
+    return tokens
+
+class Parser:
+    """Recursive-descent parser for the SELECT subset of SOQL."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.index = 0
+
+    # Token helpers
+
+    def peek(self, offset: int = 0) -> Tuple[str, str, int]:
+        return self.tokens[min(self.index + offset, len(self.tokens) - 1)]
+
+    def next(self) -> Tuple[str, str, int]:
+        token = self.tokens[self.index]
+        self.index += 1
+        return token
+
+    def at_keyword(self, *keywords: str) -> bool:
+        kind, value, _ = self.peek()
+        return kind == "keyword" and value in keywords
+
+    def accept_keyword(self, keyword: str) -> bool:
+        if self.at_keyword(keyword):
+            self.index += 1
+            return True
+        return False
+
+    def expect_keyword(self, keyword: str) -> None:
+        if not self.accept_keyword(keyword):
+            self.fail(f"Expected {keyword}")
+
+    def expect_punct(self, punct: str) -> None:
+        kind, value, _ = self.peek()
+        if kind != "punct" or value != punct:
+            self.fail(f"Expected {punct!r}")
+        self.index += 1
+
+    def accept_punct(self, punct: str) -> bool:
+        kind, value, _ = self.peek()
+        if kind == "punct" and value == punct:
+            self.index += 1
+            return True
+        return False
+
+    def fail(self, message: str, suggestion: str = None):
+        kind, value, position = self.peek()
+        found = "end of query" if kind == "eof" else repr(value)
+        raise syntax_error(f"{message} at position {position}, found {found}", position, suggestion)
+
+    def expect_name(self, what: str) -> str:
+        kind, value, _ = self.peek()
+        if kind != "name":
+            self.fail(f"Expected {what}")
+        self.index += 1
+        return value
+
+    def expect_integer(self, what: str) -> int:
+        kind, value, _ = self.peek()
+        if kind != "number" or not value.isdigit():
+            self.fail(f"Expected {what} as a non-negative integer")
+        self.index += 1
+        return int(value)
+
+    # Grammar
+
+    def parse(self) -> Query:
+        query = self.parse_query()
+        if self.peek()[0] != "eof":
+            self.fail("Unexpected text after the query", suggestion="Return only the SOQL query")
+        return query
+
+    def parse_query(self) -> Query:
+        self.expect_keyword("SELECT")
+        fields = [self.parse_select_item()]
+        while self.accept_punct(","):
+            fields.append(self.parse_select_item())
+
+        self.expect_keyword("FROM")
+        object_name = self.expect_name("an object name after FROM")
+
+        where = self.parse_condition() if self.accept_keyword("WHERE") else None
+
+        group_by = []
+        if self.accept_keyword("GROUP"):
+            self.expect_keyword("BY")
+            group_by.append(self.expect_name("a field after GROUP BY"))
+            while self.accept_punct(","):
+                group_by.append(self.expect_name("a field after ','"))
+        if self.at_keyword("HAVING"):
+            self.fail("HAVING is not supported")
+
+        order_by = []
+        if self.accept_keyword("ORDER"):
+            self.expect_keyword("BY")
+            order_by.append(self.parse_order_item())
+            while self.accept_punct(","):
+                order_by.append(self.parse_order_item())
+
+        limit = self.expect_integer("the LIMIT") if self.accept_keyword("LIMIT") else None
+        offset = self.expect_integer("the OFFSET") if self.accept_keyword("OFFSET") else None
+
+        return Query(
+            object_name=object_name,
+            fields=tuple(fields),
+            where=where,
+            group_by=tuple(group_by),
+            order_by=tuple(order_by),
+            limit=limit,
+            offset=offset
+        )
+
+    def parse_select_item(self):
+        kind, value, _ = self.peek()
+        if kind == "punct" and value == "(":
+            self.fail("Child relationship subqueries in the SELECT list are not supported")
+        name = self.expect_name("a field name")
+
+        if name.upper() in AGGREGATE_FUNCTIONS and self.accept_punct("("):
+            field = None
+            if self.peek()[0] == "name":
+                field = self.next()[1]
+            self.expect_punct(")")
+            if field is None and name.upper() != "COUNT":
+                self.fail(f"{name.upper()}() needs a field")
+            alias = self.next()[1] if self.peek()[0] == "name" else None
+            return Aggregate(function=name.upper(), field=field, alias=alias)
+        return name
+
+    def parse_order_item(self) -> OrderBy:
+        field = self.expect_name("a field after ORDER BY")
+        descending = False
+        if self.accept_keyword("DESC"):
+            descending = True
+        else:
+            self.accept_keyword("ASC")
+        nulls_first = None
+        if self.accept_keyword("NULLS"):
+            if self.accept_keyword("FIRST"):
+                nulls_first = True
+            elif self.accept_keyword("LAST"):
+                nulls_first = False
+            else:
+                self.fail("Expected FIRST or LAST after NULLS")
+        return OrderBy(field=field, descending=descending, nulls_first=nulls_first)
+
+    def parse_condition(self) -> Condition:
+        operands = [self.parse_and()]
+        while self.accept_keyword("OR"):
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else Or(tuple(operands))
+
+    def parse_and(self) -> Condition:
+        operands = [self.parse_not()]
+        while self.accept_keyword("AND"):
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else And(tuple(operands))
+
+    def parse_not(self) -> Condition:
+        if self.accept_keyword("NOT"):
+            return Not(self.parse_not())
+        if self.accept_punct("("):
+            condition = self.parse_condition()
+            self.expect_punct(")")
+            return condition
+        return self.parse_predicate()
+
+    def parse_predicate(self) -> Condition:
+        field = self.expect_name("a field name in the condition")
+
+        negated = self.accept_keyword("NOT")
+        if self.accept_keyword("IN"):
+            self.expect_punct("(")
+            if self.at_keyword("SELECT"):
+                query = self.parse_query()
+                self.expect_punct(")")
+                return InSubquery(field=field, query=query, negated=negated)
+            values = [self.parse_value()]
+            while self.accept_punct(","):
+                values.append(self.parse_value())
+            self.expect_punct(")")
+            return InList(field=field, values=tuple(values), negated=negated)
+        if self.accept_keyword("LIKE"):
+            value = self.parse_value()
+            if not (isinstance(value, Literal) and value.kind == "string"):
+                self.fail("LIKE needs a string pattern")
+            comparison = Comparison(field=field, op="LIKE", value=value)
+            return Not(comparison) if negated else comparison
+        if negated:
+            self.fail("Expected IN or LIKE after NOT")
+
+        kind, op, _ = self.peek()
+        if kind != "op":
+            self.fail(f"Expected a comparison operator after {field}")
+        self.index += 1
+        return Comparison(field=field, op="!=" if op == "<>" else op, value=self.parse_value())
+
+    def parse_value(self) -> Value:
+        kind, value, _ = self.peek()
+        if kind == "string":
+            self.index += 1
+            return Literal(re.sub(r"\\(.)", r"\1", value[1:-1]), "string")
+        if kind == "number":
+            self.index += 1
+            return Literal(float(value) if "." in value else int(value), "number")
+        if kind in ("date", "datetime"):
+            self.index += 1
+            return Literal(value, kind)
+        if kind == "keyword" and value in ("TRUE", "FALSE"):
+            self.index += 1
+            return Literal(value == "TRUE", "boolean")
+        if kind == "keyword" and value == "NULL":
+            self.index += 1
+            return Literal(None, "null")
+        if kind == "name" and value.upper() in DATE_N_LITERALS:
+            self.index += 1
+            self.expect_punct(":")
+            return DateLiteral(value.upper(), self.expect_integer(f"the count of {value.upper()}"))
+        if kind == "name" and value.upper() in DATE_LITERALS:
+            self.index += 1
+            return DateLiteral(value.upper())
+        self.fail("Expected a value", suggestion="Quote string values, e.g. 'Closed Won'")
+
+def parse(text: str) -> Query:
+    """Parse a SOQL SELECT query.
+
+    Raises:
+        SOQLError: On the first syntax error
+    """
+    return Parser(text).parse()
@@ -0,0 +1,194 @@
+import dataclasses
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional, Set
+
+from .nodes import RELATIONSHIP_OBJECTS, And, Comparison, Condition, InList, InSubquery, Not, Or, Query
+
+# Written by the query_builder_with_data agent (onboarding_agent/write_log.py):
+# one row per object, its version bumped by every UPDATE, INSERT or DELETE
+WRITE_LOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS object_writes (
+    object TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    written_at REAL NOT NULL
+);
+"""
+
+def _canonical_condition(condition: Condition) -> Condition:
+    """The condition with AND and OR operands in one order, so "a AND b" and "b AND a" match."""
+    if isinstance(condition, (And, Or)):
+        operands = sorted((_canonical_condition(operand) for operand in condition.operands), key=lambda c: c.to_soql())
+        return type(condition)(tuple(operands))
+    if isinstance(condition, Not):
+        return Not(_canonical_condition(condition.operand))
+    if isinstance(condition, InSubquery):
+        return dataclasses.replace(condition, query=canonical_query(condition.query))
+    return condition
+
+def canonical_query(query: Query) -> Query:
+    """The query with the parts whose order does not change its result sorted.
+
+    Selected fields are sorted unless the query aggregates, since aggregate
+    results are named by position (expr0, expr1, ...).
+    """
+    fields = query.fields if query.is_aggregate else tuple(sorted(set(query.fields)))
+    where = _canonical_condition(query.where) if query.where is not None else None
+    return dataclasses.replace(query, fields=fields, where=where)
+
+def _object_of(object_name: str, field: str) -> str:
+    relationship, dot, _ = field.partition(".")
+    return RELATIONSHIP_OBJECTS.get(relationship, relationship) if dot else object_name
+
+def query_objects(query: Query) -> FrozenSet[str]:
+    """Lowercase names of every object a query reads: its own, parents it reaches and subquery objects."""
+    objects = {query.object_name}
+    fields = [field for field in query.fields if isinstance(field, str)]
+    fields += [field.field for field in query.fields if not isinstance(field, str) and field.field]
+    fields += [*query.group_by, *(item.field for item in query.order_by)]
+
+    def walk(condition: Condition) -> None:
+        if isinstance(condition, (And, Or)):
+            for operand in condition.operands:
+                walk(operand)
+        elif isinstance(condition, Not):
+            walk(condition.operand)
+        elif isinstance(condition, InSubquery):
+            fields.append(condition.field)
+            objects.update(query_objects(condition.query))
+        elif isinstance(condition, (Comparison, InList)):
+            fields.append(condition.field)
+
+    if query.where is not None:
+        walk(query.where)
+    objects.update(_object_of(query.object_name, field) for field in fields)
+    return frozenset(name.lower() for name in objects)
+
+@dataclass
+class _Entry:
+    value: Any
+    objects: FrozenSet[str]
+    expires_at: float
+    versions: Dict[str, int]
+
+class ResultCache:
+    """Results of recently run queries, for previews that are opened again and again.
+
+    Entries are keyed on the canonical SOQL of the parsed query, so
+    whitespace, keyword case and field order variants share one entry. An
+    entry expires ``ttl_seconds`` after it was stored, the least recently
+    used one is dropped when more than ``max_entries`` are held, and every
+    entry reading an object is dropped when that object is written:
+    through ``invalidate`` in this process, or through the write log the
+    query_builder_with_data agent records its UPDATE, INSERT and DELETE
+    statements in.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 512,
+        write_log: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            ttl_seconds: How long a result is served after it was run
+            max_entries: Results kept at most; the least recently used goes first
+            write_log: SQLite file of object write versions; None only sees
+                writes reported through ``invalidate``
+            clock: Time source, in seconds
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.write_log = write_log
+        self.clock = clock
+        self.entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+        self.invalidated = 0
+
+        if self.write_log:
+            conn = sqlite3.connect(self.write_log)
+            try:
+                conn.executescript(WRITE_LOG_SCHEMA)
+                conn.commit()
+            finally:
+                conn.close()
+
+    @staticmethod
+    def key(query: Query) -> str:
+        return canonical_query(query).to_soql()
+
+    def _write_versions(self) -> Dict[str, int]:
+        if not self.write_log:
+            return {}
+        conn = sqlite3.connect(self.write_log)
+        try:
+            return {name.lower(): version for name, version in conn.execute("SELECT object, version FROM object_writes")}
+        finally:
+            conn.close()
+
+    def get_or_run(self, query: Query, run: Callable[[], Any]) -> Any:
+        """The cached result of a query, or the result of ``run`` stored for next time.
+
+        Write versions are read before ``run``, so a write that lands while
+        the query runs makes the stored result stale rather than current.
+        Treat the result as read-only; later lookups share it.
+        """
+        key = self.key(query)
+        versions = self._write_versions()
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires_at <= self.clock():
+            del self.entries[key]
+            self.expired += 1
+            entry = None
+        if entry is not None and any(versions.get(name, 0) != entry.versions.get(name, 0) for name in entry.objects):
+            del self.entries[key]
+            self.invalidated += 1
+            entry = None
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+        self.misses += 1
+        value = run()
+        objects = query_objects(query)
+        self.entries[key] = _Entry(
+            value=value,
+            objects=objects,
+            expires_at=self.clock() + self.ttl_seconds,
+            versions={name: versions[name] for name in objects if name in versions}
+        )
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evicted += 1
+        return value
+
+    def invalidate(self, *object_names: str) -> int:
+        """Drop every result reading one of the objects; returns how many were dropped."""
+        names: Set[str] = {name.lower() for name in object_names}
+        stale = [key for key, entry in self.entries.items() if entry.objects & names]
+        for key in stale:
+            del self.entries[key]
+        self.invalidated += len(stale)
+        return len(stale)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit rate and results dropped by TTL, by size and by writes."""
+        lookups = self.hits + self.misses
+        return {
+            "lookups": lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "invalidated": self.invalidated,
+            "entries": len(self.entries)
+        }
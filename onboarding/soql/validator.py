@@ -0,0 +1,151 @@
+import difflib
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .nodes import (
+    RELATIONSHIP_OBJECTS,
+    Aggregate,
+    And,
+    Condition,
+    InSubquery,
+    Not,
+    Or,
+    Query,
+)
+from .parser import SOQLError, extract_soql, parse
+
+def _schema_error(message: str, suggestion: Optional[str] = None) -> Dict[str, Any]:
+    return {"kind": "schema", "message": message, "position": None, "suggestion": suggestion}
+
+class _Resolver:
+    """Resolve object and field names against the schema case-insensitively, collecting errors."""
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.objects = {name.lower(): name for name in schema}
+        self.errors: List[Dict[str, Any]] = []
+
+    def object(self, name: str) -> Optional[str]:
+        resolved = self.objects.get(name.lower())
+        if resolved is None:
+            close = difflib.get_close_matches(name, list(self.schema), n=1)
+            self.errors.append(_schema_error(
+                f"Unknown object {name}",
+                f"Use {close[0]}" if close else f"Use one of {', '.join(self.schema)}"
+            ))
+        return resolved
+
+    def _parent_field(self, object_name: str, fields: List[str], name: str) -> Optional[str]:
+        """Resolve "<Relationship>.<Field>" through the lookup field to the parent object's fields."""
+        relationship, _, rest = name.partition(".")
+        lookup = {field.lower(): field for field in fields}.get(f"{relationship}id".lower())
+        if lookup is None:
+            return None
+        relationship = lookup[:-2]
+        parent = self.objects.get(RELATIONSHIP_OBJECTS.get(relationship, relationship).lower())
+        if parent is None:
+            return None
+        parent_fields = self.schema[parent].get("standard_fields", [])
+        resolved = {field.lower(): field for field in parent_fields}.get(rest.lower())
+        if resolved is None and "." in rest:
+            resolved = self._parent_field(parent, parent_fields, rest)
+        return resolved and f"{relationship}.{resolved}"
+
+    def field(self, object_name: Optional[str], name: str) -> str:
+        if object_name is None:
+            return name
+        fields = self.schema[object_name].get("standard_fields", [])
+        resolved = {field.lower(): field for field in fields}.get(name.lower())
+        if resolved is None and "." in name:
+            resolved = self._parent_field(object_name, fields, name)
+        if resolved is None:
+            close = difflib.get_close_matches(name, fields, n=1)
+            self.errors.append(_schema_error(
+                f"Unknown field {name} on {object_name}",
+                f"Use {close[0]}" if close else f"Use one of {', '.join(fields)}"
+            ))
+            return name
+        return resolved
+
+    def condition(self, object_name: Optional[str], condition: Condition) -> Condition:
+        if isinstance(condition, (And, Or)):
+            return replace(condition, operands=tuple(self.condition(object_name, c) for c in condition.operands))
+        if isinstance(condition, Not):
+            return replace(condition, operand=self.condition(object_name, condition.operand))
+        if isinstance(condition, InSubquery):
+            subquery = self.query(condition.query)
+            if len(subquery.fields) != 1 or not isinstance(subquery.fields[0], str):
+                self.errors.append(_schema_error(
+                    f"The subquery of {condition.field} IN (...) must select exactly one field",
+                    f"Use e.g. SELECT AccountId FROM {subquery.object_name}"
+                ))
+            return replace(condition, field=self.field(object_name, condition.field), query=subquery)
+        return replace(condition, field=self.field(object_name, condition.field))
+
+    def query(self, query: Query) -> Query:
+        object_name = self.object(query.object_name)
+
+        fields = []
+        for item in query.fields:
+            if isinstance(item, Aggregate):
+                fields.append(replace(item, field=item.field and self.field(object_name, item.field)))
+            else:
+                fields.append(self.field(object_name, item))
+        group_by = tuple(self.field(object_name, field) for field in query.group_by)
+
+        # Grouped queries may only select grouped fields next to aggregates
+        if query.is_aggregate:
+            for item in fields:
+                if isinstance(item, str) and item not in group_by:
+                    self.errors.append(_schema_error(
+                        f"{item} must be aggregated or listed in GROUP BY",
+                        f"Add GROUP BY {item}"
+                    ))
+
+        # ORDER BY may also name an aggregate alias
+        aliases = {item.alias.lower(): item.alias for item in fields if isinstance(item, Aggregate) and item.alias}
+        order_by = tuple(
+            replace(item, field=aliases.get(item.field.lower()) or self.field(object_name, item.field))
+            for item in query.order_by
+        )
+
+        return replace(
+            query,
+            object_name=object_name or query.object_name,
+            fields=tuple(fields),
+            where=query.where and self.condition(object_name, query.where),
+            group_by=group_by,
+            order_by=order_by
+        )
+
+def validate(query: Query, schema: Dict[str, Any]) -> Tuple[Query, List[Dict[str, Any]]]:
+    """Check a parsed query against the schema.
+
+    Returns:
+        Tuple of (query with names in schema casing, list of schema errors)
+    """
+    resolver = _Resolver(schema)
+    resolved = resolver.query(query)
+    return resolved, resolver.errors
+
+def check(text: str, schema: Dict[str, Any]) -> Query:
+    """Extract, parse and validate a query from LLM output.
+
+    Raises:
+        SOQLError: With every schema error, or the first syntax error
+    """
+    query, errors = validate(parse(extract_soql(text)), schema)
+    if errors:
+        raise SOQLError(errors)
+    return query
+
+def repair_prompt(soql: str, errors: List[Dict[str, Any]]) -> str:
+    """Ask the LLM to fix exactly the listed problems of a query."""
+    problems = "\n".join(
+        f"- {error['message']}" + (f" ({error['suggestion']})" if error.get("suggestion") else "")
+        for error in errors
+    )
+    return (
+        f"This SOQL query is invalid:\n{soql}\n\nProblems:\n{problems}\n\n"
+        "Fix only these problems and return only the corrected SOQL query, without markdown."
+    )
@@ -0,0 +1,217 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Other words users say for each object
+OBJECT_SYNONYMS = {
+    "Opportunity": ["opportunity", "deal", "pipeline"],
+    "Account": ["account", "customer", "company", "organization"],
+    "Contact": ["contact", "person", "people", "stakeholder"],
+}
+
+# Words that carry no query meaning and don't count against the confidence
+STOPWORDS = {
+    "a", "all", "an", "and", "any", "are", "by", "can", "do", "each", "every", "find", "for",
+    "from", "get", "give", "have", "in", "is", "it", "just", "list", "me", "my", "of", "on",
+    "only", "our", "please", "query", "record", "return", "see", "select", "show", "that",
+    "the", "their", "them", "these", "those", "to", "us", "want", "we", "what", "where",
+    "which", "whose", "with", "you", "your",
+}
+
+# Words the query cannot express: negations, orderings and limits. A
+# description with one of them left unexplained goes to the LLM, however
+# much of the rest matched
+UNSUPPORTED_WORDS = {
+    "not", "no", "non", "nor", "never", "without", "except", "excluding", "exclude", "other", "than",
+    "sort", "sorted", "sorting", "order", "ordered", "rank", "ranked", "ascending", "descending", "asc", "desc",
+    "top", "bottom", "first", "last", "latest", "newest", "oldest", "earliest", "recent",
+    "highest", "lowest", "largest", "smallest", "biggest", "most", "least", "fewest", "limit",
+}
+
+# Words that end an unquoted comparison value: "type is Customer - Direct and ..."
+VALUE_STOPS = ["and", "or", "with", "where", "whose", "which", "in", "sorted", "sort", "order", "ordered", "by", "limit"]
+_VALUE_WORD = rf"(?!(?:{'|'.join(VALUE_STOPS)})\b)[\w.-]+"
+
+COMPARISON_PATTERN = re.compile(
+    r"\b(?P<field>[a-z][a-z ]*?)\s+(?P<op>is not|is|equals|=|!=|over|above|greater than|under|below|less than)\s+"
+    rf"(?P<value>'[^']*'|\"[^\"]*\"|{_VALUE_WORD}(?:\s+{_VALUE_WORD})*)",
+    re.IGNORECASE
+)
+
+NUMBER_OR_BOOLEAN = re.compile(r"-?\d+(\.\d+)?|true|false", re.IGNORECASE)
+
+OPERATORS = {
+    "is": "=", "equals": "=", "=": "=", "is not": "!=", "!=": "!=",
+    "over": ">", "above": ">", "greater than": ">",
+    "under": "<", "below": "<", "less than": "<",
+}
+
+def _stem(word: str) -> str:
+    """Crude singular form, enough to match "opportunities" with "opportunity"."""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+def _words(text: str) -> List[str]:
+    """Stemmed lowercase words, with camel case split: "BillingCity" -> ["billing", "city"]."""
+    text = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", text)
+    return [_stem(word) for word in re.findall(r"[a-z0-9]+", text.lower())]
+
+def _field_words(field_name: str) -> List[str]:
+    """Words of a field name: "CreatedBy.Name" -> ["created", "by", "name"]."""
+    return _words(field_name.replace(".", " "))
+
+def _contains(words: List[str], phrase: List[str]) -> Optional[Tuple[int, int]]:
+    """Position (start, end) of a phrase in a word list, or None."""
+    for start in range(len(words) - len(phrase) + 1):
+        if words[start:start + len(phrase)] == phrase:
+            return start, start + len(phrase)
+    return None
+
+@dataclass
+class Synthesis:
+    """A SOQL query built from a description, with how much of the description it explains."""
+    soql: str
+    object_name: str
+    confidence: float
+    fields: List[str] = field(default_factory=list)
+    filters: List[str] = field(default_factory=list)
+
+class SOQLSynthesizer:
+    """Build SOQL from a description by matching it against the schema, without an LLM.
+
+    The description's words are matched against object names (and
+    synonyms), field names and the objects' named ``common_filters``, plus
+    simple "<field> is <value>" comparisons whose value runs up to the next
+    keyword. The confidence is the share of the description's meaningful
+    words that the query explains; callers fall back to the LLM below
+    ``threshold``. A negation, ordering or limit the query does not
+    explain, or words trailing a comparison value, rule synthesis out
+    whatever the confidence.
+    """
+
+    def __init__(self, schema: Dict[str, Any], threshold: float = 0.75):
+        """
+        Args:
+            schema: Salesforce schema with standard_fields and optional common_filters per object
+            threshold: Minimum confidence for ``synthesize`` to return a query
+        """
+        self.schema = schema
+        self.threshold = threshold
+        self.attempts = 0
+        self.synthesized = 0
+
+    def _match_object(self, words: List[str]) -> Optional[Tuple[str, Set[int]]]:
+        """The object mentioned first, so "contacts and their account id" queries Contact."""
+        best = None
+        for object_name in self.schema:
+            for name in [object_name.lower(), *OBJECT_SYNONYMS.get(object_name, [])]:
+                position = _contains(words, [_stem(name)])
+                if position and (best is None or position[0] < best[1][0]):
+                    best = (object_name, position)
+        if best is None:
+            return None
+        return best[0], set(range(*best[1]))
+
+    def analyze(self, description: str) -> Optional[Synthesis]:
+        """Build the best query for a description regardless of the threshold.
+
+        None when no object matches, or when the description asks for
+        something the query would silently drop.
+        """
+        words = _words(description)
+        matched = self._match_object(words)
+        if matched is None:
+            return None
+        object_name, explained = matched
+        spec = self.schema[object_name]
+        standard_fields = spec.get("standard_fields", [])
+
+        # "<field> is <value>" comparisons on standard fields, longest field name first;
+        # their values are taken as written, not matched against filters or fields
+        filters = []
+        values: Set[int] = set()
+        by_length = sorted(standard_fields, key=lambda f: -len(_field_words(f)))
+        for match in COMPARISON_PATTERN.finditer(description):
+            field_words = _words(match.group("field"))
+            for field_name in by_length:
+                name_words = _field_words(field_name)
+                if field_words[-len(name_words):] != name_words:
+                    continue
+                value = match.group("value").strip("'\"")
+                first, *rest = value.split() or [""]
+                if NUMBER_OR_BOOLEAN.fullmatch(first):
+                    # "amount over 50000 dollars": the unit is not something the query can say
+                    if rest:
+                        return None
+                    literal = value
+                else:
+                    literal = f"'{value}'"
+                end = len(_words(description[:match.end()]))
+                if end < len(words) and words[end] not in VALUE_STOPS and words[end] not in STOPWORDS:
+                    # Words right after a quoted value are part of a condition the query misses
+                    return None
+                filters.append(f"{field_name} {OPERATORS[match.group('op').lower()]} {literal}")
+                start = len(_words(description[:match.start("field")])) + len(field_words) - len(name_words)
+                explained |= set(range(start, end))
+                values |= set(range(len(_words(description[:match.start("value")])), end))
+                break
+
+        # Named filters, longest first so "closed won" wins over a bare "closed"
+        for filter_name, condition in sorted(
+            spec.get("common_filters", {}).items(), key=lambda item: -len(item[0])
+        ):
+            filter_words = [w for w in _words(filter_name.replace("_", " ")) if w not in _words(object_name)]
+            position = _contains(words, filter_words)
+            if position and not explained & set(range(*position)):
+                filters.append(condition)
+                explained |= set(range(*position))
+
+        # Fields the description names, always with Id and Name
+        fields = [f for f in ("Id", "Name") if f in standard_fields]
+        for field_name in standard_fields:
+            position = _contains(words, _field_words(field_name))
+            if position and not values & set(range(*position)):
+                explained |= set(range(*position))
+                if field_name not in fields:
+                    fields.append(field_name)
+
+        unexplained = [word for i, word in enumerate(words) if i not in explained]
+        # A number nobody explained ("in 2024", "top 10") is a condition the query would drop
+        if any(word in UNSUPPORTED_WORDS or any(c.isdigit() for c in word) for word in unexplained):
+            return None
+
+        meaningful = [i for i, word in enumerate(words) if word not in STOPWORDS]
+        confidence = (
+            sum(1 for i in meaningful if i in explained) / len(meaningful)
+            if meaningful else 0.0
+        )
+
+        soql = f"SELECT {', '.join(fields)} FROM {object_name}"
+        if filters:
+            soql += f" WHERE {' AND '.join(filters)}"
+        return Synthesis(
+            soql=soql,
+            object_name=object_name,
+            confidence=round(confidence, 3),
+            fields=fields,
+            filters=filters
+        )
+
+    def synthesize(self, description: str) -> Optional[Synthesis]:
+        """Build a query for a description, or None if the confidence is below the threshold."""
+        self.attempts += 1
+        synthesis = self.analyze(description)
+        if synthesis is None or synthesis.confidence < self.threshold:
+            return None
+        self.synthesized += 1
+        return synthesis
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "synthesized": self.synthesized,
+            "coverage": self.synthesized / self.attempts if self.attempts else 0.0
+        }
@@ -1,16 +1,35 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Annotated, Dict, List, Any, Optional
 from pydantic import BaseModel, Field
-from langchain_core.messages import (
-    BaseMessage,
-    HumanMessage,
-    AIMessage,
-    SystemMessage,
-    ToolMessage
-)
+from langchain_core.messages import AnyMessage
+
+def merge_dicts(left: Optional[Dict], right: Optional[Dict]) -> Dict:
+    """Reducer merging the per-key results of parallel fan-out branches."""
+    return {**(left or {}), **(right or {})}
+
+class RunUsage(BaseModel):
+    """Resources used by an onboarding run, checked against its budget."""
+    hops: int = 0
+    llm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    started_at: Optional[float] = None
 
 class OnboardingState(BaseModel):
-    messages: List[Union[HumanMessage, AIMessage, SystemMessage, ToolMessage]] = Field(default_factory=list)
+    # Discriminated on the message type; a plain Union runs AIMessage's validators on ToolMessages
+    messages: List[AnyMessage] = Field(default_factory=list)
     steps: List[Dict[str, Any]] = Field(default_factory=list)
     questions: List[Dict[str, Any]] = Field(default_factory=list)
     current_step: Optional[str] = Field(default=None)
-    query_results: Optional[Dict[str, Any]] = Field(default=None)
\ No newline at end of file
+    # Workspace whose steps and questions the tools serve; None is the default catalog
+    workspace_id: Optional[str] = Field(default=None)
+    query_results: Optional[Dict[str, Any]] = Field(default=None)
+    last_node: Optional[str] = Field(default=None)
+    usage: RunUsage = Field(default_factory=RunUsage)
+    budget_exhausted: Optional[str] = Field(default=None)
+    run_summary: Optional[Dict[str, Any]] = Field(default=None)
+    # Fan-out mode: results of parallel branches, keyed by step id / question id
+    questions_by_step: Annotated[Dict[str, List[Dict[str, Any]]], merge_dicts] = Field(default_factory=dict)
+    query_results_by_question: Annotated[Dict[str, Dict[str, Any]], merge_dicts] = Field(default_factory=dict)
+    # LLM calls and tokens each fan-out branch spent building its query, added to usage on merge
+    query_usage_by_question: Annotated[Dict[str, RunUsage], merge_dicts] = Field(default_factory=dict)
+    workspace_ready: bool = Field(default=False)
\ No newline at end of file
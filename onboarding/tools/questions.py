@@ -3,38 +3,16 @@ from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 import logging
 from datetime import datetime
-from copilotkit.langchain import copilotkit_emit_state
-from langchain_core.runnables import RunnableConfig
 import uuid
 
+from catalog import load_catalog
+from config import Config
+from emitter import state_emitter
 
-questions = [
-    # Account Identification Questions
-    {
-        "id": "question_1",
-        "name": "How do you identify your customer accounts?",
-        "description": "This helps Boomerang understand how to determine which accounts in your CRM represent actual customers versus prospects, partners, or other entities.",
-        "is_answered": False,
-        "step": {"id": "step_1"},
-        "preview": {
-            "enabled": True,
-            "data_type": "text",
-            "placeholder": "Enter company name"
-        }
-    },
-    {
-        "id": "question_2",
-        "name": "Where do you capture the buying roles of the contacts (Decision Maker, Influencer, etc.)",
-        "description": "This helps Boomerang understand the roles and responsibilities of the contacts in the buying process.",
-        "is_answered": False,
-        "step": {"id": "step_2"},
-        "preview": {
-            "enabled": True,
-            "data_type": "select",
-            "options": ["Technology", "Healthcare", "Finance", "Manufacturing", "Retail", "Other"]
-        }
-    },
-]
+cfg = Config()
+
+# Questions of every workspace, indexed by id and by step and reloaded when the catalog changes
+catalog = load_catalog(cfg.CATALOG, cfg.CATALOG_RELOAD_INTERVAL)
 
 class GetQuestionsInput(BaseModel):
     count: Optional[int] = Field(default=None, description="Number of questions to return")
@@ -45,13 +23,14 @@ class GetQuestionsInput(BaseModel):
     args_schema=GetQuestionsInput,
     description="Return a list of onboarding questions. Can optionally limit by count. If no count is provided, all questions will be returned."
 )
+@state_emitter.coalesce
 async def getQuestions(count: Optional[int] = None, state: Optional[Dict] = None) -> List[Dict[str, Any]]:
     """
     Returns a list of all questions with their details.
 
     Returns:
         List[Dict[str, Any]]: List of question details including id, name, description,
-                             is_answered, step_id, and preview configuration
+                             is_answered, step, and preview configuration
     """
     try:
         if state is None:
@@ -59,20 +38,19 @@ async def getQuestions(count: Optional[int] = None, state: Optional[Dict] = None
 
         logging.info(f"Getting questions with count: {count}")
 
-        config = RunnableConfig()
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         if count is not None:
             if count < 0:
                 raise ValueError("Count cannot be negative")
-            result = questions[:count]
+            result = catalog.questions(state.get("workspace_id"))[:count]
         else:
-            result = questions
+            result = catalog.questions(state.get("workspace_id"))
 
         state["questions"] = result
         state["timestamp"] = datetime.now().isoformat()
 
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         return {
             "type": "tool",
@@ -94,6 +72,7 @@ class GetQuestionsByStepInput(BaseModel):
     args_schema=GetQuestionsByStepInput,
     description="Return a list of questions for a specific step ID."
 )
+@state_emitter.coalesce
 async def getQuestionsByStep(stepId: str, state: Optional[Dict] = None) -> List[Dict[str, Any]]:
     """
     Returns a list of questions for a specific step.
@@ -110,20 +89,19 @@ async def getQuestionsByStep(stepId: str, state: Optional[Dict] = None) -> List[
 
         logging.info(f"Getting questions for step ID: {stepId}")
 
-        config = RunnableConfig()
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         if not stepId:
             raise ValueError("Step ID cannot be empty")
 
-        result = [q for q in questions if q["step_id"] == stepId]
+        result = catalog.questions_by_step(stepId, state.get("workspace_id"))
         if not result:
             logging.warning(f"No questions found for step ID: {stepId}")
 
         state["questions"] = result
         state["timestamp"] = datetime.now().isoformat()
 
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         return {
             "type": "tool",
@@ -145,6 +123,7 @@ class GetQuestionByIdInput(BaseModel):
     args_schema=GetQuestionByIdInput,
     description="Return a specific question by its ID."
 )
+@state_emitter.coalesce
 async def getQuestionById(questionId: str, state: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Returns a specific question by its ID.
@@ -161,20 +140,19 @@ async def getQuestionById(questionId: str, state: Optional[Dict] = None) -> Dict
 
         logging.info(f"Getting question with ID: {questionId}")
 
-        config = RunnableConfig()
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         if not questionId:
             raise ValueError("Question ID cannot be empty")
 
-        result = next((q for q in questions if q["id"] == questionId), {})
+        result = catalog.question(questionId, state.get("workspace_id")) or {}
         if not result:
             logging.warning(f"No question found with ID: {questionId}")
 
         state["question"] = result
         state["timestamp"] = datetime.now().isoformat()
 
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         return {
             "type": "tool",
@@ -3,47 +3,16 @@ from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 import logging
 from datetime import datetime
-from copilotkit.langchain import copilotkit_emit_state
-from langchain_core.runnables import RunnableConfig
 import uuid
 
-steps = [
-    {
-        "id": "step_1",
-        "name": "Account Identification",
-        "description": "Identify and verify the target account for onboarding",
-        "is_completed": False,
-        "order": 1
-    },
-    {
-        "id": "step_2",
-        "name": "Buying Roles",
-        "description": "Identify key decision makers and their roles in the buying process",
-        "is_completed": False,
-        "order": 2
-    },
-    {
-        "id": "step_3",
-        "name": "Role Mapping",
-        "description": "Map identified roles to their responsibilities and influence",
-        "is_completed": False,
-        "order": 3
-    },
-    {
-        "id": "step_4",
-        "name": "Value Messaging",
-        "description": "Develop and align value propositions for different stakeholders",
-        "is_completed": False,
-        "order": 4
-    },
-    {
-        "id": "step_5",
-        "name": "Summary",
-        "description": "Review and summarize the onboarding process and next steps",
-        "is_completed": False,
-        "order": 5
-    }
-]
+from catalog import load_catalog
+from config import Config
+from emitter import state_emitter
+
+cfg = Config()
+
+# Steps of every workspace, indexed by id and reloaded when the catalog changes
+catalog = load_catalog(cfg.CATALOG, cfg.CATALOG_RELOAD_INTERVAL)
 
 class GetStepsInput(BaseModel):
     count: Optional[int] = Field(default=None, description="Number of steps to return")
@@ -54,6 +23,7 @@ class GetStepsInput(BaseModel):
     args_schema=GetStepsInput,
     description="Return a list of onboarding steps. Can optionally limit by count. If no count is provided, all steps will be returned."
 )
+@state_emitter.coalesce
 async def getSteps(count: Optional[int] = None, state: Optional[Dict] = None) -> List[Dict[str, Any]]:
     """
     Returns a list of all steps with their details.
@@ -68,20 +38,19 @@ async def getSteps(count: Optional[int] = None, state: Optional[Dict] = None) ->
 
         logging.info(f"Getting steps with count: {count}")
 
-        config = RunnableConfig()
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         if count is not None:
             if count < 0:
                 raise ValueError("Count cannot be negative")
-            result = steps[:count]
+            result = catalog.steps(state.get("workspace_id"))[:count]
         else:
-            result = steps
+            result = catalog.steps(state.get("workspace_id"))
 
         state["steps"] = result
         state["timestamp"] = datetime.now().isoformat()
 
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         return result
     except Exception as e:
@@ -97,6 +66,7 @@ class GetStepByIdInput(BaseModel):
     args_schema=GetStepByIdInput,
     description="Return a specific step by its ID."
 )
+@state_emitter.coalesce
 async def getStepById(stepId: str, state: Optional[Dict] = None) -> Dict[str, Any]:
     """
     Returns a specific step by its ID.
@@ -113,20 +83,19 @@ async def getStepById(stepId: str, state: Optional[Dict] = None) -> Dict[str, An
 
         logging.info(f"Getting step with ID: {stepId}")
 
-        config = RunnableConfig()
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         if not stepId:
             raise ValueError("Step ID cannot be empty")
 
-        result = next((step for step in steps if step["id"] == stepId), {})
+        result = catalog.step(stepId, state.get("workspace_id")) or {}
         if not result:
             logging.warning(f"No step found with ID: {stepId}")
 
         state["step"] = result
         state["timestamp"] = datetime.now().isoformat()
 
-        await copilotkit_emit_state(config, state)
+        await state_emitter.emit(state)
 
         return result
     except Exception as e:
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS soql_translations (
+    description_key TEXT NOT NULL,
+    schema_hash TEXT NOT NULL,
+    description TEXT NOT NULL,
+    soql TEXT NOT NULL,
+    llm_seconds REAL NOT NULL,
+    created_at REAL NOT NULL,
+    hit_count INTEGER DEFAULT 0,
+    PRIMARY KEY (description_key, schema_hash)
+);
+"""
+
+def normalize_description(description: str) -> str:
+    """Normalize a query description so case, spacing and trailing punctuation don't matter."""
+    return " ".join(description.lower().split()).rstrip(" .?!")
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Stable hash of a Salesforce schema dict."""
+    return hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()[:16]
+
+class TranslationCache:
+    """Two-tier cache of natural language to SOQL translations.
+
+    Lookups go to an in-memory LRU first, then to SQLite, so translations
+    survive restarts. Entries are keyed on the normalized description and
+    the schema hash; entries of any other schema are deleted when the cache
+    is opened, and never match afterwards.
+    """
+
+    def __init__(self, path: Optional[str], schema: Dict[str, Any], max_memory_entries: int = 1024):
+        """
+        Args:
+            path: SQLite database file; None keeps only the in-memory tier
+            schema: Schema the translations were generated against
+            max_memory_entries: Size of the in-memory tier
+        """
+        self.path = path
+        self.schema_hash = schema_hash(schema)
+        self.max_memory_entries = max_memory_entries
+        self.memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.memory_hits = 0
+        self.sqlite_hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+
+        if self.path:
+            conn = self._get_connection()
+            try:
+                conn.executescript(SCHEMA)
+                conn.execute("DELETE FROM soql_translations WHERE schema_hash != ?", (self.schema_hash,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _get_connection(self):
+        return sqlite3.connect(self.path)
+
+    @staticmethod
+    def _key(description: str) -> str:
+        return hashlib.sha256(normalize_description(description).encode()).hexdigest()
+
+    def _remember(self, key: str, entry: Tuple[str, float]) -> None:
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, description: str) -> Optional[str]:
+        """Get the cached SOQL for a description, or None."""
+        key = self._key(description)
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+            self.memory_hits += 1
+        elif self.path:
+            conn = self._get_connection()
+            try:
+                row = conn.execute("""
+                    SELECT soql, llm_seconds FROM soql_translations
+                    WHERE description_key = ? AND schema_hash = ?
+                """, (key, self.schema_hash)).fetchone()
+                if row:
+                    conn.execute("""
+                        UPDATE soql_translations SET hit_count = hit_count + 1
+                        WHERE description_key = ? AND schema_hash = ?
+                    """, (key, self.schema_hash))
+                    conn.commit()
+            finally:
+                conn.close()
+            if row:
+                entry = (row[0], row[1])
+                self._remember(key, entry)
+                self.sqlite_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # Each hit saves the LLM call that produced the entry
+        self.seconds_saved += entry[1]
+        return entry[0]
+
+    def put(self, description: str, soql: str, llm_seconds: float) -> None:
+        """Cache a translation along with how long the LLM took to produce it."""
+        key = self._key(description)
+        self._remember(key, (soql, llm_seconds))
+        if not self.path:
+            return
+
+        conn = self._get_connection()
+        try:
+            conn.execute("""
+                INSERT OR REPLACE INTO soql_translations
+                (description_key, schema_hash, description, soql, llm_seconds, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (key, self.schema_hash, normalize_description(description), soql, llm_seconds, time.time()))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def invalidate(self, schema: Optional[Dict[str, Any]] = None) -> None:
+        """Drop every translation, switching to a new schema if one is given."""
+        if schema is not None:
+            self.schema_hash = schema_hash(schema)
+        self.memory.clear()
+        if self.path:
+            conn = self._get_connection()
+            try:
+                conn.execute("DELETE FROM soql_translations")
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Hit rate per tier and LLM time saved by hits."""
+        hits = self.memory_hits + self.sqlite_hits
+        lookups = hits + self.misses
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "sqlite_hits": self.sqlite_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "llm_seconds_saved": round(self.seconds_saved, 3),
+            "memory_entries": len(self.memory)
+        }
@@ -0,0 +1,15 @@
+import functools
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Records per object the sub-agents preview; ONBOARDING_AGENT_RECORDS may
+# name another file of the same shape ({"Account": [...], ...})
+RECORDS_FILE = Path(__file__).parent / "data" / "workspace_records.json"
+
+@functools.lru_cache(maxsize=None)
+def load_records(path: str = "") -> Dict[str, List[Dict[str, Any]]]:
+    """Records per object, read from disk once per process and shared; treat them as read-only."""
+    with open(path or os.getenv("ONBOARDING_AGENT_RECORDS") or RECORDS_FILE) as f:
+        return json.load(f)
@@ -0,0 +1,110 @@
+import functools
+import json
+import math
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Entity catalog the query builder prompt describes: one entry per object with
+# its fields, their types, descriptions, aliases and a "preferred" flag
+ENTITIES_FILE = Path(__file__).parent / "data" / "entities.json"
+
+# The same word splitting as onboarding/soql_synth.py. The two agents ship as
+# separate packages and cannot import each other, so each keeps its own copy.
+def _stem(word: str) -> str:
+    """Crude singular form, enough to match "opportunities" with "opportunity"."""
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+def _words(text: str) -> List[str]:
+    """Stemmed lowercase words, with camel case split: "CloseDates" -> ["close", "date"]."""
+    text = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", text)
+    return [_stem(word) for word in re.findall(r"[a-z0-9]+", text.lower())]
+
+class SchemaRegistry:
+    """Index of the entity catalog's objects, fields and aliases, for pruning the prompt.
+
+    ``relevant`` scores entities like the onboarding query builder's
+    registry does. Naming an entity or one of its aliases scores 3. Naming
+    a field scores by how rare its words are across entities, so names
+    every entity has, such as "name" or "id", score nothing. Entities
+    scoring at least 0.5 are kept, best first, with their preferred fields
+    plus any other field named. Nothing matching keeps the whole catalog.
+    """
+
+    def __init__(self, entities: List[Dict[str, Any]], max_entities: int = 3):
+        self.entities = entities
+        self.max_entities = max_entities
+        self._entities_with_word: Dict[str, set] = defaultdict(set)
+        for position, entity in enumerate(entities):
+            for field in entity.get("fields", []):
+                for word in _words(field["name"]):
+                    self._entities_with_word[word].add(position)
+
+        # word -> (phrase, entity index, field name or None, weight)
+        self.terms: Dict[str, List[tuple]] = defaultdict(list)
+        for position, entity in enumerate(entities):
+            for name in [entity["entity"], *entity.get("aliases", [])]:
+                self._add(_words(name), position, None, 3.0)
+            for field in entity.get("fields", []):
+                for name in [field["name"], *field.get("aliases", [])]:
+                    words = _words(name)
+                    self._add(words, position, field["name"], self._rarity(words))
+
+    def _rarity(self, words: List[str]) -> float:
+        """Inverse document frequency of the rarest word over entities, scaled to 0..1."""
+        def idf(word: str) -> float:
+            entities = len(self._entities_with_word.get(word, ()))
+            if entities == 0 or len(self.entities) < 2:
+                return 1.0
+            return math.log(len(self.entities) / entities) / math.log(len(self.entities))
+        return max((idf(word) for word in words), default=1.0)
+
+    def _add(self, words: List[str], position: int, field_name: Optional[str], weight: float) -> None:
+        entries = self.terms[words[0]] if words else None
+        # An entity name and its alias may stem to the same term; count it once
+        if words and not any(entry[:3] == (tuple(words), position, field_name) for entry in entries):
+            entries.append((tuple(words), position, field_name, weight))
+
+    def relevant(self, text: str) -> List[Dict[str, Any]]:
+        """The entities, with pruned field lists, a request is about."""
+        words = _words(text or "")
+        scores: Dict[int, float] = defaultdict(float)
+        named: Dict[int, set] = defaultdict(set)
+        for start, word in enumerate(words):
+            for phrase, position, field_name, weight in self.terms.get(word, ()):
+                if tuple(words[start:start + len(phrase)]) == phrase:
+                    scores[position] += weight
+                    if field_name:
+                        named[position].add(field_name)
+        ranked = sorted(
+            (position for position, score in scores.items() if score >= 0.5),
+            key=lambda position: -scores[position]
+        )[:self.max_entities]
+        if not ranked:
+            return self.entities
+        return [
+            {
+                **self.entities[position],
+                "fields": [
+                    field for field in self.entities[position].get("fields", [])
+                    if field.get("preferred") or field["name"] in named[position]
+                ]
+            }
+            for position in sorted(ranked)
+        ]
+
+@functools.lru_cache(maxsize=None)
+def load_registry(path: str = "") -> SchemaRegistry:
+    """The registry of an entities file (ONBOARDING_AGENT_ENTITIES or the bundled one), built once."""
+    with open(path or os.getenv("ONBOARDING_AGENT_ENTITIES") or ENTITIES_FILE) as f:
+        return SchemaRegistry(json.load(f))
+
+def entity_catalog(entities: List[Dict[str, Any]]) -> str:
+    """The entities as the JSON blocks the query builder instruction lists."""
+    return "\n".join(json.dumps(entity, indent=2) for entity in entities)
@@ -0,0 +1,61 @@
+import os
+import re
+import sqlite3
+import time
+from typing import List
+
+# SQLite file the onboarding query result cache reads (ONBOARDING_WRITE_LOG
+# there too): one row per object, its version bumped by every write, so the
+# cached results of written objects are run again. Empty records nothing;
+# onboarding then caches no results either.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS object_writes (
+    object TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    written_at REAL NOT NULL
+);
+"""
+
+_IDENTIFIER = r"`?(?:\w+`?\.`?)?(\w+)`?"
+_INSERT = re.compile(r"^\s*(?:INSERT|REPLACE)\s+(?:LOW_PRIORITY\s+|DELAYED\s+|HIGH_PRIORITY\s+|IGNORE\s+)*(?:INTO\s+)?" + _IDENTIFIER, re.I)
+_UPDATE = re.compile(r"^\s*UPDATE\s+(?:LOW_PRIORITY\s+|IGNORE\s+)*(.*?)\s+SET\s", re.I | re.S)
+_DELETE = re.compile(r"^\s*DELETE\s+(?:LOW_PRIORITY\s+|QUICK\s+|IGNORE\s+)*(?:.*?\s)?FROM\s+(.*?)(?:\s+(?:WHERE|ORDER\s+BY|LIMIT)\s|;|$)", re.I | re.S)
+# A table reference starts the statement's table list or follows a comma, JOIN or USING
+_TABLE_REFERENCE = re.compile(r"(?:^|,|\bJOIN\b|\bUSING\b)\s*" + _IDENTIFIER, re.I)
+
+def written_objects(statement: str) -> List[str]:
+    """Tables an UPDATE, INSERT or DELETE statement may write, in order; empty for reads.
+
+    Multi-table UPDATE and DELETE statements count every table they join,
+    which may include tables they only read.
+    """
+    objects: List[str] = []
+    for part in statement.split(";"):
+        insert = _INSERT.match(part)
+        tables = _UPDATE.match(part) or _DELETE.match(part)
+        if insert:
+            names = [insert.group(1)]
+        elif tables:
+            names = _TABLE_REFERENCE.findall(tables.group(1))
+        else:
+            continue
+        objects += [name for name in names if name not in objects]
+    return objects
+
+def record_write(statement: str, path: str = "") -> List[str]:
+    """Bump the write version of the tables a statement writes; returns them."""
+    objects = written_objects(statement)
+    path = path or os.getenv("ONBOARDING_WRITE_LOG", "")
+    if not objects or not path:
+        return objects
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany("""
+            INSERT INTO object_writes (object, version, written_at) VALUES (?, 1, ?)
+            ON CONFLICT(object) DO UPDATE SET version = version + 1, written_at = excluded.written_at
+        """, [(name.lower(), time.time()) for name in objects])
+        conn.commit()
+    finally:
+        conn.close()
+    return objects